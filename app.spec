@@ -28,7 +28,8 @@ a = Analysis(['scripts\\app.py'],
              datas=[(eel_js, 'eel'), ('web', 'web'), ('src/rf2settings/default_presets', 'default_presets'),
                     ('build/version.txt', '.'), ('license.txt', '.'), ('data', 'data'),
                     ('bin/PresentMon-1.9.2-x64.exe', 'bin'), ],
-             hiddenimports=['bottle_websocket', 'ssl', '_ssl'],
+             # -- pygame and numpy are only imported lazily by name, see utils.lazy_import
+             hiddenimports=['bottle_websocket', 'ssl', '_ssl', 'pygame', 'numpy'],
              hookspath=['hooks'],
              runtime_hooks=[],
              excludes=excluded_modules,
@@ -5,6 +5,11 @@ import time
 import webbrowser
 from pathlib import Path
 
+from rf2settings.import_profile import ImportProfiler
+
+# -- Profile the imports of the start-up path
+IMPORT_PROFILER = ImportProfiler().start()
+
 import eel
 import gevent
 
@@ -12,14 +17,18 @@ from rf2settings import eel_mod
 from rf2settings.app import expose_app_methods
 from rf2settings.app.app_main import CLOSE_EVENT, close_callback, restore_backup
 from rf2settings.app_settings import AppSettings
-from rf2settings.gamecontroller import controller_greenlet, controller_event_loop
+from rf2settings.gamecontroller import controller_greenlet, controller_event_loop, ControllerEvents
 from rf2settings.headlights import headlights_greenlet
-from rf2settings.log import setup_logging
+from rf2settings.log import setup_logging, stop_logging
+from rf2settings.rf2events import RfactorLiveEvent, RfactorStatusEvent, BenchmarkProgressEvent
+from rf2settings.rf2events import RfactorYouTubeEvent, RfactorYouTubeErrorEvent, RfactorYouTubeLiveEvent
 from rf2settings.rf2greenlet import rfactor_greenlet, rfactor_event_loop
 from rf2settings.chat.ytgreenlet import youtube_eventloop, youtube_greenlet
 from rf2settings.runasadmin import run_as_admin
 from rf2settings.utils import AppExceptionHook
-from rf2settings.globals import FROZEN, get_current_modules_dir, get_data_dir
+from rf2settings.globals import FROZEN, get_current_modules_dir, get_data_dir, get_log_dir
+from rf2settings.wakeup import WakeUp, log_wakeup_stats
+from rf2settings.write_behind import flush_all
 
 os.chdir(get_current_modules_dir())
 
@@ -29,7 +38,13 @@ expose_app_methods()
 # -- Setup logging
 setup_logging()
 
+# -- Report import times
+IMPORT_PROFILER.stop()
+IMPORT_PROFILER.save(Path(get_log_dir()))
+
 START_TIME = 0.0
+# -- Forward state to the frontend at least every heartbeat seconds
+HEARTBEAT = 1.0
 
 
 def in_restore_mode() -> bool:
@@ -87,13 +102,20 @@ def _main_app_loop():
     # -- YouTUbe Greenlet
     yg = gevent.spawn(youtube_greenlet)
 
+    # -- Wake up for every event that needs to be forwarded to the frontend
+    wakeup = WakeUp('main', CLOSE_EVENT, ControllerEvents.event, ControllerEvents.add_removed_event,
+                    RfactorLiveEvent.event, RfactorStatusEvent.event, BenchmarkProgressEvent.event,
+                    RfactorYouTubeEvent.event, RfactorYouTubeErrorEvent.event, RfactorYouTubeLiveEvent.event,
+                    AppExceptionHook.event)
+
     # -- Run until window/tab closed
     logging.debug('Entering Event Loop')
     while not CLOSE_EVENT.is_set():
+        heartbeat = not wakeup.wait(HEARTBEAT)
         # Game controller event loop
-        controller_event_loop()
+        controller_event_loop(timeout=0)
         # rFactor 2 event loop
-        rfactor_event_loop()
+        rfactor_event_loop(heartbeat)
         # YouTube live chat event loop
         youtube_eventloop()
         # Capture exception events
@@ -102,6 +124,7 @@ def _main_app_loop():
     # -- Shutdown Greenlets
     logging.debug('Shutting down Greenlets.')
     gevent.joinall((cg, hg, rg, yg), timeout=15.0, raise_error=True)
+    log_wakeup_stats()
 
 
 def start_eel(npm_serve=True):
@@ -160,9 +183,13 @@ if __name__ == '__main__':
     if not in_restore_mode():
         start_eel(prepare_app_start())
 
+    # -- Write pending settings changes
+    flush_all(log_stats=True)
+
     # -- Shutdown logging
     logging.info('\n\n\n')
     logging.info('#######################################################')
     logging.info('################ APP SHUTDOWN               ###########')
     logging.info('#######################################################\n\n\n')
+    stop_logging()
     logging.shutdown()
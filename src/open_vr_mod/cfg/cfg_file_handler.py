@@ -1,7 +1,9 @@
 import json
 from pathlib import Path
+from typing import TYPE_CHECKING
 
-from ruamel.yaml import YAML, CommentedMap
+if TYPE_CHECKING:
+    from ruamel.yaml import CommentedMap
 
 
 class ModCfgJsonHandler:
@@ -86,16 +88,24 @@ class ModCfgJsonHandler:
 
 
 class ModCfgYamlHandler:
-    yaml = YAML()
+    # -- ruamel.yaml is imported on first use, it is not needed to start the app
+    yaml = None
 
     @classmethod
-    def load_file(cls, file: Path) -> CommentedMap:
+    def _yaml(cls):
+        if cls.yaml is None:
+            from ruamel.yaml import YAML
+            cls.yaml = YAML()
+        return cls.yaml
+
+    @classmethod
+    def load_file(cls, file: Path) -> 'CommentedMap':
         with open(file, 'r') as f:
-            data = cls.yaml.load(f)
+            data = cls._yaml().load(f)
         return data
 
     @classmethod
-    def _prepare_yaml_data(cls, settings, file, write) -> CommentedMap:
+    def _prepare_yaml_data(cls, settings, file, write) -> 'CommentedMap':
         """ Prepare data to be written or update a settings object from read data.
 
         :param open_vr_mod.cfg.base_mod_cfg.BaseModSettings settings:
@@ -103,6 +113,7 @@ class ModCfgYamlHandler:
         :param bool write:
         :return:
         """
+        from ruamel.yaml import CommentedMap
         data = CommentedMap()
 
         # -- Update from existing file
@@ -120,10 +131,10 @@ class ModCfgYamlHandler:
         :param Path target_file:
         """
         data = cls._prepare_yaml_data(settings, target_file, True)
-        cls.yaml.dump(data, target_file)
+        cls._yaml().dump(data, target_file)
 
     @classmethod
-    def read_cfg(cls, settings, cfg_file) -> CommentedMap:
+    def read_cfg(cls, settings, cfg_file) -> 'CommentedMap':
         """ Read a cfg file and update settings object.
 
         :param open_vr_mod.cfg.base_mod_cfg.BaseModSettings settings:
@@ -132,7 +143,7 @@ class ModCfgYamlHandler:
         return cls._prepare_yaml_data(settings, cfg_file, False)
 
     @classmethod
-    def update_data(cls, data, settings, write) -> CommentedMap:
+    def update_data(cls, data, settings, write) -> 'CommentedMap':
         """ Update data from settings object or update settings object from data.
 
         :param CommentedMap data: data to be updated or read from
@@ -186,8 +197,8 @@ class ModCfgYamlHandler:
         match type(value).__name__:
             # -- construct Float
             case 'float':
-                node = cls.yaml.representer.represent_data(value)
-                data[key] = cls.yaml.constructor.construct_object(node)
+                node = cls._yaml().representer.represent_data(value)
+                data[key] = cls._yaml().constructor.construct_object(node)
             # -- update CommentedSeq
             case 'list' if isinstance(data[key], list):
                 for idx, item in enumerate(value):
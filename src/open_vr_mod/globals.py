@@ -103,6 +103,21 @@ if not PYTEST:
 else:
     CUSTOM_APPS_STORE_FILE_NAME = '_apps_tests.json'
 
+if not PYTEST:
+    FILE_HASH_STORE_FILE_NAME = 'file_hashes.json'
+else:
+    FILE_HASH_STORE_FILE_NAME = 'file_hashes_tests.json'
+
+if not PYTEST:
+    STEAM_CATALOG_FILE_NAME = 'steam_catalog.json'
+else:
+    STEAM_CATALOG_FILE_NAME = 'steam_catalog_tests.json'
+
+if not PYTEST:
+    DIR_WALK_STORE_FILE_NAME = 'dir_walk.json'
+else:
+    DIR_WALK_STORE_FILE_NAME = 'dir_walk_tests.json'
+
 
 def check_and_create_dir(directory: Union[str, Path]) -> str:
     if not os.path.exists(directory):
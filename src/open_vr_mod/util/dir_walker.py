@@ -0,0 +1,189 @@
+"""
+    Bounded os.scandir directory walker used to locate OpenVR dlls and executables of apps.
+
+    Every visited directory is stored with its modification time, sub directories and
+    matching file names. Adding, removing or renaming an entry updates the mtime of its
+    parent directory, so directories with an unchanged mtime are not listed again on
+    re-scans. An unchanged app tree costs one stat per directory instead of a listing of
+    every asset file. The directory store is persisted in the settings dir.
+"""
+import fnmatch
+import json
+import logging
+import os
+import re
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+from open_vr_mod.globals import get_settings_dir, DIR_WALK_STORE_FILE_NAME, OPEN_VR_DLL, EXE_NAME
+from open_vr_mod.util.utils import atomic_write_text
+
+
+class WalkStats:
+    def __init__(self):
+        self.dirs_listed = 0        # Directories read with scandir
+        self.dirs_reused = 0        # Directories with an unchanged mtime served from the store
+        self.entries = 0            # Directory entries inspected while listing
+        self.dirs_pruned = 0        # Directories skipped by name
+        self.depth_limited = 0      # Directories skipped because of the depth limit
+        self.errors = 0
+        self.seconds = 0.0
+
+    def add(self, other: 'WalkStats'):
+        for k, v in other.__dict__.items():
+            setattr(self, k, getattr(self, k) + v)
+
+    def __str__(self):
+        return (f'{self.seconds:.3f}s listed {self.dirs_listed} dirs with {self.entries} entries, '
+                f'reused {self.dirs_reused}, pruned {self.dirs_pruned}, depth limited {self.depth_limited}, '
+                f'errors {self.errors}')
+
+
+class DirWalker:
+    """ Find files matching the patterns below app directories. """
+    patterns = (OPEN_VR_DLL, EXE_NAME)
+    max_depth = 12
+    # -- Directory names, lower case, that never contain app binaries
+    prune_dir_names = {'.git', '.svn', '__pycache__', '$recycle.bin', 'shadercache', 'screenshots', 'crashdumps'}
+    # Set while scanning many apps, eg. by the ManifestWorker, to save once when done
+    defer_save = False
+
+    # -- {root: {relative dir: [mtime_ns, [sub dir names], [matching file names]]}}
+    _trees: Dict[str, Dict[str, list]] = dict()
+    # -- Statistics of every root walked since the last reset_stats
+    stats: Dict[str, WalkStats] = dict()
+    _lock = threading.Lock()
+    _save_lock = threading.Lock()
+    _loaded = False
+    _modified = False
+
+    @classmethod
+    def _config(cls) -> list:
+        """ Stored trees are only valid for the settings they were walked with """
+        return [list(cls.patterns), cls.max_depth, sorted(cls.prune_dir_names)]
+
+    @classmethod
+    def _store_file(cls) -> Path:
+        return get_settings_dir() / DIR_WALK_STORE_FILE_NAME
+
+    @classmethod
+    def load(cls):
+        cls._loaded = True
+        file = cls._store_file()
+        if not file.exists():
+            return
+        try:
+            with open(file, 'r', encoding='utf-8') as f:
+                data = json.loads(f.read())
+        except Exception as e:
+            logging.error('Could not read directory walk store: %s', e)
+            return
+
+        if data.get('config') == cls._config():
+            cls._trees = data.get('trees', dict())
+
+    @classmethod
+    def save(cls):
+        with cls._save_lock:
+            with cls._lock:
+                if not cls._modified:
+                    return
+                data, cls._modified = json.dumps({'config': cls._config(), 'trees': cls._trees}), False
+
+            try:
+                atomic_write_text(cls._store_file(), data)
+            except Exception as e:
+                logging.error('Could not save directory walk store: %s', e)
+
+    @classmethod
+    def reset_stats(cls):
+        with cls._lock:
+            cls.stats = dict()
+
+    @classmethod
+    def total_stats(cls) -> WalkStats:
+        total = WalkStats()
+        for stats in list(cls.stats.values()):
+            total.add(stats)
+        return total
+
+    @classmethod
+    def _matcher(cls):
+        """ One case-insensitive regex for all patterns """
+        return re.compile('|'.join(fnmatch.translate(p) for p in cls.patterns), re.IGNORECASE).match
+
+    @classmethod
+    def _list_dir(cls, path: str, depth: int, stats: WalkStats) -> Tuple[List[str], List[str]]:
+        sub_dirs, files, match = list(), list(), cls._matcher()
+        with os.scandir(path) as it:
+            for entry in it:
+                stats.entries += 1
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        if entry.name.lower() in cls.prune_dir_names:
+                            stats.dirs_pruned += 1
+                        elif depth >= cls.max_depth:
+                            stats.depth_limited += 1
+                        else:
+                            sub_dirs.append(entry.name)
+                    elif match(entry.name):
+                        files.append(entry.name)
+                except OSError:
+                    stats.errors += 1
+        stats.dirs_listed += 1
+        return sub_dirs, files
+
+    @classmethod
+    def find(cls, base_path: Path) -> Dict[str, List[Path]]:
+        """ Walk base_path and return the matching files per pattern """
+        root = Path(base_path).as_posix()
+        stats, start = WalkStats(), time.perf_counter()
+
+        with cls._lock:
+            if not cls._loaded:
+                cls.load()
+            tree = cls._trees.get(root, dict())
+
+        new_tree, found, changed = dict(), list(), False
+        stack = [('', 0)]
+        while stack:
+            rel_dir, depth = stack.pop()
+            abs_dir = os.path.join(root, rel_dir)
+            try:
+                mtime = os.stat(abs_dir).st_mtime_ns
+                cached = tree.get(rel_dir)
+                if cached and cached[0] == mtime:
+                    sub_dirs, files = cached[1], cached[2]
+                    stats.dirs_reused += 1
+                else:
+                    sub_dirs, files = cls._list_dir(abs_dir, depth, stats)
+                    changed = True
+            except OSError as e:
+                logging.debug('Could not read directory %s: %s', abs_dir, e)
+                stats.errors += 1
+                continue
+
+            new_tree[rel_dir] = [mtime, sub_dirs, files]
+            found.extend(f'{rel_dir}/{name}' if rel_dir else name for name in files)
+            stack.extend((f'{rel_dir}/{name}' if rel_dir else name, depth + 1) for name in reversed(sub_dirs))
+
+        changed = changed or len(new_tree) != len(tree)
+        stats.seconds = time.perf_counter() - start
+        with cls._lock:
+            cls.stats[root] = stats
+            if changed:
+                cls._trees[root] = new_tree
+                cls._modified = True
+
+        if changed and not cls.defer_save:
+            cls.save()
+
+        result = {p: list() for p in cls.patterns}
+        for rel_file in found:
+            name = rel_file.rsplit('/', 1)[-1].lower()
+            for pattern in cls.patterns:
+                if fnmatch.fnmatchcase(name, pattern.lower()):
+                    result[pattern].append(Path(root) / rel_file)
+        return result
@@ -11,6 +11,8 @@ import gevent
 from open_vr_mod.globals import OPEN_VR_DLL, EXE_NAME
 from open_vr_mod.mod import get_available_mods
 from open_vr_mod.events import progress_update
+from open_vr_mod.util.dir_walker import DirWalker
+from open_vr_mod.util.utils import FileHashCache
 
 
 def run_update_steam_apps(steam_apps: dict) -> dict:
@@ -54,38 +56,57 @@ class ManifestWorker:
         progress = 0
         progress_update(f'{progress} / {len(steam_apps.keys())}')
 
-        with concurrent.futures.ThreadPoolExecutor(max_workers=cls.max_workers) as executor:
-            future_info = {
-                executor.submit(cls.worker, manifest_ls): manifest_ls for manifest_ls in manifest_ls_chunks
-            }
-
-            for future in concurrent.futures.as_completed(future_info):
-                manifest_chunk = future_info[future]
-                try:
-                    manifest_ls = future.result()
-                except Exception as exc:
-                    if len(manifest_chunk):
-                        logging.error('Chunk %s generated an exception: %s', manifest_chunk[0].get('name'), exc)
+        # -- Persist DLL hashes and walked directories once after the scan instead of after every app
+        FileHashCache.defer_save = True
+        DirWalker.defer_save = True
+        DirWalker.reset_stats()
+
+        try:
+            with concurrent.futures.ThreadPoolExecutor(max_workers=cls.max_workers) as executor:
+                future_info = {
+                    executor.submit(cls.worker, manifest_ls): manifest_ls for manifest_ls in manifest_ls_chunks
+                }
+
+                for future in concurrent.futures.as_completed(future_info):
+                    manifest_chunk = future_info[future]
+                    try:
+                        manifest_ls = future.result()
+                    except Exception as exc:
+                        if len(manifest_chunk):
+                            logging.error('Chunk %s generated an exception: %s',
+                                          manifest_chunk[0].get('name'), exc)
+                        else:
+                            logging.error('Worker generated an exception: %s', exc)
                     else:
-                        logging.error('Worker generated an exception: %s', exc)
-                else:
-                    if not manifest_ls:
-                        continue
-
-                    # -- Update SteamApp entries
-                    for manifest in manifest_ls:
-                        steam_apps[manifest.get('appid')] = manifest
-
-                    # -- Update Progress
-                    progress += len(manifest_ls)
-                    manifest = manifest_ls[-1:][0]
-                    progress_update(f'{manifest.get("path", " ")[0:2]} {progress} / {len(steam_apps.keys())}')
+                        if not manifest_ls:
+                            continue
+
+                        # -- Update SteamApp entries
+                        for manifest in manifest_ls:
+                            steam_apps[manifest.get('appid')] = manifest
+
+                        # -- Update Progress
+                        progress += len(manifest_ls)
+                        manifest = manifest_ls[-1:][0]
+                        progress_update(f'{manifest.get("path", " ")[0:2]} {progress} / {len(steam_apps.keys())}')
+        finally:
+            FileHashCache.defer_save = False
+            FileHashCache.save()
+            DirWalker.defer_save = False
+            DirWalker.save()
+        cls.log_walk_stats()
 
         if queue is not None:
             queue.put(steam_apps)
 
         return steam_apps
 
+    @staticmethod
+    def log_walk_stats(slowest: int = 5):
+        logging.debug('Walked %s app directories: %s', len(DirWalker.stats), DirWalker.total_stats())
+        for root, stats in sorted(DirWalker.stats.items(), key=lambda i: i[1].seconds, reverse=True)[:slowest]:
+            logging.debug('Walked %s: %s', root, stats)
+
     @staticmethod
     def worker(manifest_ls):
         for manifest in manifest_ls:
@@ -102,9 +123,16 @@ class ManifestWorker:
 
             progress_update(f'{manifest["path"][0:2]} {Path(manifest["path"]).stem}')
 
+            # -- Walk the app directory once for dlls and executables
+            try:
+                found = DirWalker.find(Path(manifest['path']))
+            except Exception as e:
+                logging.error('Error reading app directory for: %s %s', manifest.get('name', 'Unknown'), e)
+                continue
+
             # -- LookUp OpenVr Api location(s)
             try:
-                open_vr_dll_path_ls = ManifestWorker.find_open_vr_dll(Path(manifest['path']))
+                open_vr_dll_path_ls = found[OPEN_VR_DLL]
                 # -- Add OpenVr path info
                 manifest['openVrDllPaths'] = [p.as_posix() for p in open_vr_dll_path_ls]
                 manifest['openVrDllPathsSelected'] = [p.as_posix() for p in open_vr_dll_path_ls]
@@ -114,7 +142,7 @@ class ManifestWorker:
 
             # -- LookUp Executable location(s)
             try:
-                executable_path_ls = ManifestWorker.find_executables(Path(manifest['path']))
+                executable_path_ls = found[EXE_NAME]
                 # -- Add executables path info
                 manifest['executablePaths'] = [p.as_posix() for p in executable_path_ls]
                 manifest['executablePathsSelected'] = [p.as_posix() for p in executable_path_ls]
@@ -138,16 +166,8 @@ class ManifestWorker:
 
     @staticmethod
     def find_open_vr_dll(base_path: Path) -> List[Optional[Path]]:
-        open_vr_dll_ls: List[Optional[Path]] = list()
-        for file in base_path.glob(f'**/{OPEN_VR_DLL}'):
-            open_vr_dll_ls.append(file)
-
-        return open_vr_dll_ls
+        return DirWalker.find(base_path)[OPEN_VR_DLL]
 
     @staticmethod
     def find_executables(base_path: Path) -> List[Optional[Path]]:
-        executable_ls: List[Optional[Path]] = list()
-        for file in base_path.glob(f'**/{EXE_NAME}'):
-            executable_ls.append(file)
-
-        return executable_ls
+        return DirWalker.find(base_path)[EXE_NAME]
@@ -1,18 +1,20 @@
 import enum
 import hashlib
+import json
 import logging
 import os
 import os.path
 import re
 import subprocess as sp
+import threading
 from datetime import datetime
 from pathlib import Path, WindowsPath
-from typing import Tuple, Union, Optional
+from typing import Tuple, Union, Optional, Dict
 
 import eel
 import gevent.event
 
-from open_vr_mod.globals import get_settings_dir, APP_NAME
+from open_vr_mod.globals import get_settings_dir, APP_NAME, FILE_HASH_STORE_FILE_NAME
 
 
 def create_file_safe_name(filename: str, allow_spaces: bool = False) -> str:
@@ -270,12 +272,106 @@ def convert_unit(size_in_bytes, unit):
         return size_in_bytes
 
 
+class FileHashCache:
+    """ MD5 digests of files keyed by path, size, modification time and inode. Digests are
+        persisted in the settings dir so unchanged files are never read again, even across sessions.
+    """
+    chunk_size = 1024 * 1024
+    # Set while scanning many files, eg. by the ManifestWorker, to save once when done
+    defer_save = False
+    # -- {path: [size, mtime_ns, inode, digest]}
+    _digests: Dict[str, list] = dict()
+    _lock = threading.Lock()
+    _save_lock = threading.Lock()
+    _loaded = False
+    _modified = False
+
+    @classmethod
+    def _store_file(cls) -> Path:
+        return get_settings_dir() / FILE_HASH_STORE_FILE_NAME
+
+    @classmethod
+    def load(cls):
+        cls._loaded = True
+        file = cls._store_file()
+        if not file.exists():
+            return
+        try:
+            with open(file, 'r') as f:
+                cls._digests = json.loads(f.read())
+        except Exception as e:
+            logging.error('Could not read file hash store: %s', e)
+
+    @classmethod
+    def save(cls):
+        # -- Saves from several threads are written one after another, the last one holds all digests
+        with cls._save_lock:
+            with cls._lock:
+                if not cls._modified:
+                    return
+                data, cls._modified = json.dumps(cls._digests), False
+
+            try:
+                atomic_write_text(cls._store_file(), data)
+            except Exception as e:
+                logging.error('Could not save file hash store: %s', e)
+
+    @classmethod
+    def get_hash(cls, file: Union[str, Path]) -> str:
+        stat = os.stat(file)
+        key, identity = str(Path(file)), [stat.st_size, stat.st_mtime_ns, stat.st_ino]
+
+        with cls._lock:
+            if not cls._loaded:
+                cls.load()
+            cached = cls._digests.get(key)
+            if cached and cached[:3] == identity:
+                return cached[3]
+
+        digest = cls.hash_file(file)
+        with cls._lock:
+            cls._digests[key] = identity + [digest]
+            cls._modified = True
+
+        if not cls.defer_save:
+            cls.save()
+        return digest
+
+    @classmethod
+    def hash_file(cls, file: Union[str, Path]) -> str:
+        """ MD5 of a file read in chunks of chunk_size """
+        md5 = hashlib.md5()
+        with open(file, 'rb') as f:
+            while chunk := f.read(cls.chunk_size):
+                md5.update(chunk)
+        return md5.hexdigest()
+
+
+def atomic_write_text(file: Path, text: Union[str, bytes], encoding: Optional[str] = 'utf-8',
+                      newline: Optional[str] = None) -> int:
+    """ Write to a temporary file next to the target and replace the target with it,
+        readers never see a partially written file. Also used by rf2settings, see rf2settings.utils.
+
+        :param text: str written with encoding and newline, bytes are written as they are
+        :return: number of characters or bytes written
+    """
+    tmp_file = file.with_name(f'{file.name}.{os.getpid()}.{threading.get_ident()}.tmp')
+    try:
+        if isinstance(text, bytes):
+            with open(tmp_file, 'wb') as f:
+                written = f.write(text)
+        else:
+            with open(tmp_file, 'w', encoding=encoding, newline=newline) as f:
+                written = f.write(text)
+        os.replace(tmp_file, file)
+    finally:
+        if tmp_file.exists():
+            tmp_file.unlink()
+    return written
+
+
 def get_file_hash(file):
-    md5 = hashlib.md5()
-    with open(file, 'rb') as f:
-        buf = f.read()
-        md5.update(buf)
-    return md5.hexdigest()
+    return FileHashCache.get_hash(file)
 
 
 def get_name_id(name: str) -> str:
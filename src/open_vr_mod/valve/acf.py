@@ -21,58 +21,129 @@ LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
 OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
 SOFTWARE.
 """
-
+import re
 
 SECTION_START = '{'
 SECTION_END = '}'
 
+# Quoted strings keep their escape sequences, like the line based parser did
+_TOKEN = re.compile(r'"[^"\\]*(?:\\.[^"\\]*)*"|[{}]|//[^\n]*|[^\s{}"]+')
+
+
+class _UnquotedToken(Exception):
+    pass
+
 
-def loads(data, wrapper=dict):
+def loads(data, wrapper=dict, keys=None):
     """
     Loads ACF content into a Python object.
     :param data: An UTF-8 encoded content of an ACF file.
     :param wrapper: A wrapping object for key-value pairs.
+    :param keys: Stop reading once values for all of these keys, at any level, were read.
+                 The result then only contains the data up to the last of them.
     :return: An Ordered Dictionary with ACF data.
     """
     if not isinstance(data, str):
         raise TypeError('can only load a str as an ACF but got ' + type(data).__name__)
 
-    parsed = wrapper()
-    current_section = parsed
-    sections = []
+    if '\\"' not in data and '//' not in data:
+        try:
+            return _parse(_split_lazily(data) if keys else data.split('"'), wrapper, keys)
+        except _UnquotedToken:
+            pass
+    return _parse(_tokenize(data), wrapper, keys)
 
-    lines = (line.strip() for line in data.splitlines())
 
-    for line in lines:
-        try:
-            key, value = line.split(None, 1)
-            key = key.replace('"', '').lstrip()
-            value = value.replace('"', '').rstrip()
-        except ValueError:
-            if line == SECTION_START:
-                # Initialize the last added section.
-                current_section = _prepare_subsection(parsed, sections, wrapper)
-            elif line == SECTION_END:
-                # Remove the last section from the queue.
-                sections.pop()
-            else:
-                # Add a new section to the queue.
-                sections.append(line.replace('"', ''))
-            continue
-
-        current_section[key] = value
+def _split_lazily(data, chunk_size=64):
+    """
+    Splits ACF content at quotes chunk by chunk, for reads that stop early.
+    :param data: ACF content.
+    :param chunk_size: Number of parts to split at once, even to keep strings at odd positions.
+    :return: A generator of the parts of str.split('"').
+    """
+    while True:
+        parts = data.split('"', chunk_size)
+        if len(parts) <= chunk_size:
+            yield from parts
+            return
+        data = parts.pop()
+        yield from parts
+
+
+def _tokenize(data):
+    """
+    Splits ACF content like str.split('"') would split it without escaped quotes, comments
+    and unquoted strings.
+    :param data: ACF content.
+    :return: A list alternating between section braces and strings.
+    """
+    parts, braces = [], []
+    for token in _TOKEN.findall(data):
+        if token[0] == '"':
+            parts += (''.join(braces), token[1:-1])
+            braces = []
+        elif token == SECTION_START or token == SECTION_END:
+            braces.append(token)
+        elif not token.startswith('//'):
+            parts += (''.join(braces), token)
+            braces = []
+    parts.append(''.join(braces))
+    return parts
+
+
+def _parse(parts, wrapper, keys):
+    """
+    Builds the nested sections in a single pass.
+    :param parts: A list alternating between the text outside of quotes and quoted strings.
+    :param wrapper: A wrapping object for key-value pairs.
+    :param keys: Stop once these keys were read.
+    :return: Parsed data.
+    """
+    parsed = wrapper()
+    current_section = parsed
+    parents = []
+    key = None
+    remaining = set(keys) if keys else None
+
+    for idx, part in enumerate(parts):
+        if idx % 2:
+            if key is None:
+                key = part
+                continue
+            current_section[key] = part
+            if remaining is not None:
+                remaining.discard(key)
+                if not remaining:
+                    break
+            key = None
+        elif part and not part.isspace():
+            for char in part:
+                if char == SECTION_START:
+                    # The last key names the new section
+                    section = wrapper()
+                    current_section[key or ''] = section
+                    parents.append(current_section)
+                    current_section = section
+                    key = None
+                elif char == SECTION_END:
+                    if parents:
+                        current_section = parents.pop()
+                    key = None
+                elif not char.isspace():
+                    raise _UnquotedToken
 
     return parsed
 
 
-def load(fp, wrapper=dict):
+def load(fp, wrapper=dict, keys=None):
     """
     Loads the contents of an ACF file into a Python object.
     :param fp: A file object.
     :param wrapper: A wrapping object for key-value pairs.
+    :param keys: Stop reading after these keys, see loads.
     :return: An Ordered Dictionary with ACF data.
     """
-    return loads(fp.read(), wrapper=wrapper)
+    return loads(fp.read(), wrapper=wrapper, keys=keys)
 
 
 def dumps(obj):
@@ -121,19 +192,3 @@ def _dumps(obj, level):
             lines.append(indent + '"{}"'.format(key) + '\t\t' + '"{}"'.format(value))
 
     return lines
-
-
-def _prepare_subsection(data, sections, wrapper):
-    """
-    Creates a subsection ready to be filled.
-    :param data: Semi-parsed dictionary.
-    :param sections: A list of sections.
-    :param wrapper: A wrapping object for key-value pairs.
-    :return: A newly created subsection.
-    """
-    current = data
-    for i in sections[:-1]:
-        current = current[i]
-
-    current[sections[-1]] = wrapper()
-    return current[sections[-1]]
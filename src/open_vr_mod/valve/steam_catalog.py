@@ -0,0 +1,231 @@
+"""
+    Persistent catalog of the local Steam libraries and their app manifests.
+
+    libraryfolders.vdf and every appmanifest_*.acf are only parsed again if their
+    size or modification time changed. Lookups by app id or install directory
+    are served from memory.
+
+    App manifests are only read up to the manifest_keys, the depot and config
+    sections following them are neither parsed nor kept.
+"""
+import json
+import logging
+import os
+import time
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from open_vr_mod.util.utils import atomic_write_text
+from . import acf
+
+STEAM_LIBRARY_FOLDERS = 'LibraryFolders'
+STEAM_LIBRARY_FILE = 'libraryfolders.vdf'
+STEAM_APPS_FOLDER = 'steamapps'
+STEAM_MANIFEST_PREFIX = 'appmanifest'
+STEAM_MANIFEST_SUFFIX = '.acf'
+
+
+def _stat_identity(stat: os.stat_result) -> List[int]:
+    return [stat.st_size, stat.st_mtime_ns]
+
+
+def _file_identity(file: Path) -> Optional[List[int]]:
+    try:
+        return _stat_identity(os.stat(file))
+    except OSError:
+        return None
+
+
+class SteamCatalog:
+    catalog_version = 2
+    max_age = 5.0   # Seconds a refresh is considered current, repeated refreshes within do not touch the disk
+
+    # -- AppState values read from app manifests
+    manifest_keys = ('appid', 'name', 'StateFlags', 'installdir', 'LastUpdated', 'SizeOnDisk', 'buildid')
+
+    def __init__(self, catalog_file: Optional[Path] = None):
+        """ Steam libraries and parsed app manifests
+
+            :param catalog_file: json file to persist the catalog to, None keeps it in memory only
+        """
+        self.catalog_file = catalog_file
+        self.steam_location: Optional[Path] = None
+        self.library_file_identity: Optional[List[int]] = None
+        self.library_dirs: List[str] = list()
+        self.manifests: Dict[str, dict] = dict()    # manifest file: {'identity': [size, mtime_ns], 'app': AppState}
+        self.parsed = 0                             # Number of files parsed during the last refresh
+
+        self._by_id: Dict[str, dict] = dict()
+        self._by_installdir: Dict[str, dict] = dict()
+        self._refreshed_at = 0.0
+        self._loaded = False
+
+    def load(self):
+        self._loaded = True
+        if not self.catalog_file or not self.catalog_file.exists():
+            return
+        try:
+            with open(self.catalog_file, 'r', encoding='utf-8') as f:
+                data = json.loads(f.read())
+        except Exception as e:
+            logging.error('Could not read Steam catalog, rebuilding it: %s', e)
+            return
+
+        if data.get('version') != self.catalog_version:
+            return
+        self.steam_location = Path(data['steam_location']) if data.get('steam_location') else None
+        self.library_file_identity = data.get('library_file_identity')
+        self.library_dirs = data.get('library_dirs', list())
+        self.manifests = data.get('manifests', dict())
+        self._update_lookups()
+
+    def save(self):
+        if not self.catalog_file:
+            return
+        data = {'version': self.catalog_version,
+                'steam_location': self.steam_location.as_posix() if self.steam_location else '',
+                'library_file_identity': self.library_file_identity, 'library_dirs': self.library_dirs,
+                'manifests': self.manifests}
+
+        try:
+            atomic_write_text(self.catalog_file, json.dumps(data))
+        except Exception as e:
+            logging.error('Could not save Steam catalog: %s', e)
+
+    def refresh(self, steam_location: Path, force: bool = False) -> bool:
+        """ Revalidate the library file and all app manifests. Returns True if the catalog changed. """
+        if not self._loaded:
+            self.load()
+
+        steam_location = Path(steam_location)
+        if not force and steam_location == self.steam_location and time.monotonic() - self._refreshed_at < self.max_age:
+            return False
+
+        changed, self.parsed = False, 0
+        if steam_location != self.steam_location:
+            self.steam_location, self.library_file_identity = steam_location, None
+            changed = True
+
+        library_dirs = self._refresh_library_dirs()
+        if library_dirs != self.library_dirs:
+            self.library_dirs = library_dirs
+            changed = True
+
+        manifest_files = dict()
+        for lib_dir in self.library_dirs:
+            manifest_files.update(self._scan_library(lib_dir))
+
+        # -- Rebuild in library order, re-using entries of unchanged manifests
+        manifests = dict()
+        for file, identity in manifest_files.items():
+            entry = self.manifests.get(file)
+            if not entry or entry['identity'] != identity:
+                entry = {'identity': identity, 'app': self._read_manifest(file)}
+                self.parsed += 1
+            manifests[file] = entry
+
+        if self.parsed or list(manifests) != list(self.manifests):
+            changed = True
+        self.manifests = manifests
+
+        if changed:
+            self._update_lookups()
+            self.save()
+
+        self._refreshed_at = time.monotonic()
+        return changed
+
+    def _refresh_library_dirs(self) -> List[str]:
+        steam_apps_dir = self.steam_location / STEAM_APPS_FOLDER
+        steam_lib_file = steam_apps_dir / STEAM_LIBRARY_FILE
+        identity = _file_identity(steam_lib_file)
+
+        if identity is not None and identity == self.library_file_identity and self.library_dirs:
+            # -- Library file unchanged, only check that the library folders still exist
+            return [d for d in self.library_dirs if os.path.isdir(d)]
+
+        self.library_file_identity = identity
+        lib_folders = [steam_apps_dir.as_posix()]
+        if identity is None:
+            return lib_folders
+
+        lib_data = dict()
+        try:
+            with open(steam_lib_file, 'r', encoding='utf-8') as f:
+                lib_data = acf.load(f)
+            self.parsed += 1
+        except Exception as e:
+            logging.error('Could not read Steam Library %s file: %s', steam_lib_file.name, e)
+
+        # "LibraryFolders" => "libraryfolders"
+        if STEAM_LIBRARY_FOLDERS.casefold() in lib_data:
+            lib_data[STEAM_LIBRARY_FOLDERS] = lib_data.get(STEAM_LIBRARY_FOLDERS.casefold())
+
+        for k, v in lib_data.get(STEAM_LIBRARY_FOLDERS, dict()).items():
+            if not isinstance(k, str) or not k.isdigit():
+                continue
+            if isinstance(v, dict):
+                v = v.get('path')
+            if not isinstance(v, str) or not v:
+                continue
+            lib_dir = (Path(v) / STEAM_APPS_FOLDER).as_posix()
+            if lib_dir not in lib_folders and os.path.isdir(lib_dir):
+                lib_folders.append(lib_dir)
+
+        return lib_folders
+
+    @staticmethod
+    def _scan_library(lib_dir: str) -> Dict[str, List[int]]:
+        manifest_files = dict()
+        try:
+            with os.scandir(lib_dir) as it:
+                for entry in it:
+                    name = entry.name
+                    if name.startswith(STEAM_MANIFEST_PREFIX) and name.endswith(STEAM_MANIFEST_SUFFIX):
+                        manifest_files[Path(entry.path).as_posix()] = _stat_identity(entry.stat())
+        except OSError as e:
+            logging.error('Could not read Steam Library folder %s: %s', lib_dir, e)
+        return manifest_files
+
+    @classmethod
+    def _read_manifest(cls, file: str) -> Optional[dict]:
+        try:
+            with open(file, 'r', encoding='utf-8') as f:
+                manifest = acf.load(f, keys=cls.manifest_keys)
+        except Exception as e:
+            logging.error('Error reading Steam App manifest: %s %s', file, e)
+            return None
+
+        manifest = manifest.get('AppState') if manifest is not None else None
+        if manifest is None:
+            logging.warning('Skipping invalid App entry: %s', file)
+            return None
+        if manifest.get('appid') is None:
+            logging.warning('Skipping App entry without id: %s', file)
+            return None
+        return manifest
+
+    def _update_lookups(self):
+        self._by_id, self._by_installdir = dict(), dict()
+        for _, app in self.apps():
+            self._by_id[app['appid']] = app
+            if app.get('installdir'):
+                self._by_installdir[app['installdir'].casefold()] = app
+
+    @property
+    def libraries(self) -> List[Path]:
+        return [Path(d) for d in self.library_dirs]
+
+    def apps(self) -> Iterator[Tuple[str, dict]]:
+        """ Valid app manifests as (manifest file, AppState dict) in library order """
+        for file, entry in self.manifests.items():
+            if entry['app'] is not None:
+                yield file, entry['app']
+
+    def app(self, app_id: str) -> Optional[dict]:
+        """ AppState of an installed app by id. The dict is shared, copy it before modifying. """
+        return self._by_id.get(str(app_id))
+
+    def app_by_installdir(self, installdir: str) -> Optional[dict]:
+        """ AppState of an installed app by its install folder name below steamapps/common """
+        return self._by_installdir.get(installdir.casefold())
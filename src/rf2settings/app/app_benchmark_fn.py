@@ -1,17 +1,21 @@
 import json
 import logging
 from subprocess import Popen
+from typing import Optional
 
 from rf2settings.app_settings import AppSettings
 from rf2settings.preset.preset import GraphicsPreset, SessionPreset
 from rf2settings.preset.preset_base import PRESET_TYPES
 from rf2settings.preset.settings_model import BenchmarkSettings
 from rf2settings.benchmark.benchmark_utils import BenchmarkRun, BenchmarkQueue
-from rf2settings.benchmark.result import read_results, read_preset_result, read_result_settings
+from rf2settings.benchmark.result import read_results, read_preset_result
+from rf2settings.benchmark.result_index import BenchmarkResultIndex
 from src.rf2settings.benchmark.fpsvr import FpsVR
 from rf2settings.rf2events import StartBenchmarkEvent
 from rf2settings.utils import capture_app_exceptions
 
+_result_index: Optional[BenchmarkResultIndex] = None
+
 
 @capture_app_exceptions
 def start_benchmark():
@@ -19,34 +23,32 @@ def start_benchmark():
     StartBenchmarkEvent.set(True)
 
 
-@capture_app_exceptions
-def get_benchmark_results():
+def _get_result_index() -> BenchmarkResultIndex:
+    """ Re-use the result index as long as the result directory does not change """
+    global _result_index
     p = AppSettings.present_mon_result_dir
-    logging.debug('Looking up Benchmark Results: %s', p)
-    results = list()
+    if _result_index is None or _result_index.result_dir != p:
+        _result_index = BenchmarkResultIndex(p, skip_prefixes=(FpsVR.FRAMETIMES_FILE_PREFIX,))
+    return _result_index
 
-    for idx, f in enumerate(p.glob('*.csv')):
-        if f.stem.startswith(FpsVR.FRAMETIMES_FILE_PREFIX):
-            continue
 
-        logging.debug('Preparing Benchmark Result: %s', f)
-        r = {'id': idx, 'name': f.name,
-             'data': read_results(f, details=False),
-             'settings': read_result_settings(f)}
-
-        results.append(r)
+@capture_app_exceptions
+def get_benchmark_results():
+    logging.debug('Looking up Benchmark Results: %s', AppSettings.present_mon_result_dir)
+    result_index = _get_result_index()
+    result_index.update()
+    logging.debug('Analysed %s new or changed Benchmark Results', result_index.analysed)
 
-    return json.dumps(sorted(results, key=lambda x: x.get('name'), reverse=True))
+    return json.dumps(result_index.results())
 
 
 @capture_app_exceptions
 def get_benchmark_result_details(result_file_name: str):
     logging.debug('Looking up detailed Benchmark Results for: %s', result_file_name)
 
-    p, data, presets = AppSettings.present_mon_result_dir, dict(), dict()
-    for idx, f in enumerate(p.glob('*.csv')):
-        if f.name != result_file_name:
-            continue
+    data, presets = dict(), dict()
+    f = _get_result_index().find(result_file_name)
+    if f is not None and f.exists():
         logging.debug('Reading detailed Benchmark Result: %s', f)
         data = read_results(f, details=True)
         presets = read_preset_result(f)
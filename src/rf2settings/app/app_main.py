@@ -37,6 +37,8 @@ def close_request():
 def re_run_admin():
     AppSettings.needs_admin = True
     AppSettings.save()
+    # -- The elevated instance reads the settings right away
+    AppSettings.flush()
 
     if not run_as_admin():
         request_close()
@@ -135,6 +137,16 @@ def load_app_preferences():
     return app_main_fn.load_app_preferences()
 
 
+@eel.expose
+def get_wakeup_stats():
+    return app_main_fn.get_wakeup_stats()
+
+
+@eel.expose
+def get_write_behind_stats():
+    return app_main_fn.get_write_behind_stats()
+
+
 def expose_main_methods():
     """ empty method we import to have the exposed methods registered """
     pass
@@ -15,6 +15,8 @@ from ..mods import ext_applications
 from ..rfactor import RfactorPlayer, RfactorLocation
 from ..utils import capture_app_exceptions
 from ..valve.steam_utils import SteamApps
+from ..wakeup import wakeup_stats
+from ..write_behind import write_behind_stats
 
 
 def _get_rf_location(sub_path):
@@ -210,3 +212,13 @@ def save_app_preferences(app_preferences: dict):
 @capture_app_exceptions
 def load_app_preferences():
     return json.dumps({'result': True, 'preferences': AppSettings.app_preferences})
+
+
+@capture_app_exceptions
+def get_wakeup_stats():
+    return json.dumps({'result': True, 'stats': wakeup_stats()})
+
+
+@capture_app_exceptions
+def get_write_behind_stats():
+    return json.dumps({'result': True, 'stats': write_behind_stats()})
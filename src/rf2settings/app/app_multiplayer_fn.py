@@ -4,15 +4,15 @@ import logging
 import eel
 
 from ..app_settings import AppSettings
+from ..server_cache import ServerListCache
 from ..serverlist import ServerList
 from ..utils import capture_app_exceptions
 
 
 @capture_app_exceptions
 def get_server_list(only_favourites: bool = False):
-    server_list = ServerList(update_players=True, only_favourites=only_favourites)
-    server_list.update(eel.add_server_list_chunk, eel.server_progress)
-    return json.dumps({'result': server_list.servers})
+    servers = ServerListCache.get(only_favourites, eel.add_server_list_chunk, eel.server_progress)
+    return json.dumps({'result': servers})
 
 
 @capture_app_exceptions
@@ -23,6 +23,7 @@ def refresh_server(address: list):
         address = (address[0], int(address[1]))
         server_info = server_list.update_single(address)
         if server_info:
+            ServerListCache.store([server_info])
             logging.debug('Updated Server info for: %s', server_info.get('server_name'))
             return json.dumps({'result': server_info, 'msg': f'Server info updated for {address[0]}'})
 
@@ -37,7 +38,8 @@ def get_server_browser_settings():
 @capture_app_exceptions
 def save_server_browser_settings(server_browser: dict):
     AppSettings.server_browser.update(server_browser)
-    if AppSettings.save():
+    AppSettings.save()
+    if AppSettings.flush():
         logging.debug('Updated Server Browser settings.')
         return json.dumps({'result': True})
     return json.dumps({'result': False})
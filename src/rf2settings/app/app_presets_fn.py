@@ -7,7 +7,7 @@ import gevent
 
 from ..app_settings import AppSettings
 from ..preset.preset import PresetType
-from ..preset.preset_base import PRESET_TYPES, load_presets_from_dir
+from ..preset.preset_base import PRESET_TYPES, load_presets_from_dir, get_preset_store, matches_fingerprint
 from ..preset.presets_dir import get_user_presets_dir, get_user_export_dir
 from ..preset.settings_model import VideoSettings
 from ..rf2events import RfactorStatusEvent
@@ -46,7 +46,8 @@ def get_presets(preset_type: int):
     # - Check if the currently selected preset differs
     #   from the actual rFactor 2 settings on disk.
     #   If they deviate, point the user to the current settings.
-    if selected_preset and selected_preset != current_preset:
+    if selected_preset and not _matches_current_preset(current_preset, selected_preset, preset_type) \
+            and selected_preset != current_preset:
         preset_changed = selected_preset.name
         logging.debug('Resetting selected Preset to "Current Preset" from %s because settings differ '
                       'from actual rFactor 2 settings.', preset_changed)
@@ -73,6 +74,15 @@ def get_presets(preset_type: int):
                        'preset_changed': preset_changed})
 
 
+def _matches_current_preset(current_preset, selected_preset, preset_type: int) -> bool:
+    """ Compare the selected preset to the current settings using its pre-calculated fingerprint.
+        A full comparison is only required to mark the differences if they deviate.
+    """
+    fingerprint = get_preset_store(get_user_presets_dir(), refresh=False).fingerprint(preset_type,
+                                                                                     selected_preset.name)
+    return fingerprint is not None and matches_fingerprint(current_preset, fingerprint)
+
+
 @capture_app_exceptions
 def select_preset(preset_name: str, preset_type: int):
     logging.debug('Updating AppSettings: selected_preset = %s %s', preset_name, preset_type)
@@ -221,4 +231,5 @@ def get_fuel_calc_presets():
 @capture_app_exceptions
 def save_fuel_calc_presets(track_presets):
     AppSettings.fuel_calc_presets = track_presets
-    return json.dumps({"result": AppSettings.save()})
+    AppSettings.save()
+    return json.dumps({"result": AppSettings.flush()})
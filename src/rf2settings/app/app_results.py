@@ -21,10 +21,10 @@ def get_result_file(file_name: str):
 def _get_result_file_fn(file_name: str):
     xml_file = Path(file_name)
     if not xml_file.is_file():
-        json.dumps({"result": False, "msg": "File not found"})
+        return json.dumps({"result": False, "msg": "File not found"})
 
     try:
-        race_result = RfactorResults(xml_file)
+        race_result = RfactorResults.from_file(xml_file)
     except Exception as e:
         logging.exception(e)
         return json.dumps({"result": False, "msg": str(e)})
@@ -14,8 +14,8 @@ def quit_rfactor():
 
 
 @eel.expose
-def get_replays():
-    return app_rfconnect_fn.get_replays()
+def get_replays(offset: int = 0, limit: int = 0, sort_key: str = 'ctime', descending: bool = True):
+    return app_rfconnect_fn.get_replays(offset, limit, sort_key, descending)
 
 
 @eel.expose
@@ -46,12 +46,13 @@ def quit_rfactor():
 
 
 @capture_app_exceptions
-def get_replays():
+def get_replays(offset: int = 0, limit: int = 0, sort_key: str = 'ctime', descending: bool = True):
     rf = RfactorPlayer()
     if not rf.is_valid:
         return json.dumps({'result': False, 'msg': rf.error})
 
-    return json.dumps({'result': True, 'replays': rf2replays.get_replays(rf)})
+    replays, total = rf2replays.get_replay_index(rf).replays(offset, limit, sort_key, descending)
+    return json.dumps({'result': True, 'replays': replays, 'total': total})
 
 
 @capture_app_exceptions
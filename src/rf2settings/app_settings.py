@@ -10,6 +10,7 @@ from .preset.preset_base import PRESET_TYPES
 from .preset.presets_dir import PresetDir, get_user_presets_dir
 from .rfactor import RfactorPlayer, RfactorLocation
 from .utils import JsonRepr
+from .write_behind import WriteBehind
 
 
 class AppSettings(JsonRepr):
@@ -57,7 +58,7 @@ class AppSettings(JsonRepr):
     skip_keys = ['first_load_complete', 'session_selection', 'replay_playing',
                  'present_mon_bin', 'present_mon_result_dir', 'chat_plugin_version', 'reshade_version',
                  'content_selected', 'content_keys', 'content_urls', 'content', 'content_saved',
-                 'yt_livestream', 'yt_channel_id']
+                 'yt_livestream', 'yt_channel_id', 'writer']
 
     present_mon_bin: Path = get_present_mon_bin()
     present_mon_result_dir: Path = get_user_presets_dir() / 'benchmark_results'
@@ -73,6 +74,9 @@ class AppSettings(JsonRepr):
     session_selection = dict()  # Session Selection will be saved to preset but transferred to greenlets via this var
     content_saved = False
 
+    # -- Saves within the delay are written once, see _setup_writer
+    writer = WriteBehind('app_settings', delay=0.5, max_delay=5.0)
+
     def __init__(self):
         self.backup_created = AppSettings.backup_created
         self.selected_presets = AppSettings.selected_presets
@@ -229,38 +233,37 @@ class AppSettings(JsonRepr):
         return get_settings_dir() / SETTINGS_CONTENT_FILE_NAME
 
     @classmethod
-    def save_content(cls):
-        file = cls._get_settings_content_file()
+    def _content_written(cls):
+        cls.content_saved = True
 
-        try:
-            with open(file.as_posix(), 'w') as f:
-                f.write(json.dumps(cls.content))
-        except Exception as e:
-            logging.error('Could not save content! %s', e)
-            return False
+    @classmethod
+    def _setup_writer(cls):
+        # noinspection PyTypeChecker
+        cls.writer.add_section('settings', cls._get_settings_file, lambda: json.dumps(cls.to_js_object(cls)))
+        cls.writer.add_section('content', cls._get_settings_content_file, lambda: json.dumps(cls.content),
+                               cls._content_written)
 
-        cls.content_saved = True
-        return True
+    @classmethod
+    def save_content(cls):
+        cls.writer.mark_dirty('content')
 
     @classmethod
     def save(cls, save_content: bool = False):
+        """ Schedule writing the settings or, with save_content, the content file.
+            Use flush to write now and learn whether the write succeeded.
+        """
         # -- Save 'content' in separate file
-        if cls.content and not cls.content_saved:
-            cls.save_content()
+        if save_content or (cls.content and not cls.content_saved):
+            cls.writer.mark_dirty('content')
 
-        file = cls._get_settings_content_file() if save_content else cls._get_settings_file()
+        if not save_content:
+            cls.writer.mark_dirty('settings')
 
-        try:
-            with open(file.as_posix(), 'w') as f:
-                if not save_content:
-                    # -- Save Settings
-                    # noinspection PyTypeChecker
-                    f.write(json.dumps(cls.to_js_object(cls)))
-                else:
-                    # -- Save Content
-                    f.write(json.dumps(cls.content))
-        except Exception as e:
-            logging.error('Could not save application settings! %s', e)
+    @classmethod
+    def flush(cls) -> bool:
+        """ Write pending changes immediately """
+        if not cls.writer.flush():
+            logging.error('Could not save application settings!')
             return False
         return True
 
@@ -337,3 +340,6 @@ class AppSettings(JsonRepr):
         # -- Update WebUi Content Selection Settings for next run
         if rf.webui_content_selection:
             cls.content_selected = rf.webui_content_selection
+
+
+AppSettings._setup_writer()
@@ -0,0 +1,160 @@
+"""
+Columnar frame time analytics for benchmark results.
+
+Only the requested columns of a PresentMon capture are loaded into typed arrays,
+NumPy backed if available and array('d') based otherwise. All statistics are
+computed from a single sort of the fps values.
+"""
+import csv
+import logging
+import math
+from array import array
+from bisect import bisect_left
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Union
+
+from rf2settings.utils import lazy_import
+
+# -- NumPy is loaded when the first result is analysed, not at app start-up
+np = lazy_import('numpy')
+NUMPY_AVAIL = np is not None
+
+# -- Frames taking longer than this multiple of the median frame time count as stutter
+STUTTER_FACTOR = 2.0
+
+Column = Union[array, 'np.ndarray']
+
+
+def _read_header(f) -> List[str]:
+    """ Advance the file past comment rows and return the column names of the header row """
+    while True:
+        line = f.readline()
+        if not line:
+            return list()
+        if line.startswith('//') or not line.strip():
+            continue
+        return next(csv.reader([line]))
+
+
+def _to_float(value: str) -> float:
+    try:
+        return float(value)
+    except ValueError:
+        return 0.0
+
+
+def _read_columns_python(f, indices: Sequence[int]) -> List[array]:
+    columns = [array('d') for _ in indices]
+    appends = [c.append for c in columns]
+    for row in csv.reader(f):
+        if not row or row[0].startswith('//'):
+            continue
+        for append, idx in zip(appends, indices):
+            append(_to_float(row[idx]) if idx < len(row) else 0.0)
+    return columns
+
+
+def _read_columns_numpy(f, indices: Sequence[int]) -> List['np.ndarray']:
+    values = np.loadtxt(f, delimiter=',', usecols=indices, comments='//', dtype=np.float64, ndmin=2)
+    return [values[:, i] for i in range(len(indices))]
+
+
+def read_columns(file: Path, column_names: Sequence[str]) -> Dict[str, Column]:
+    """ Read only the named columns of a CSV capture as float arrays. Missing columns are skipped. """
+    with open(file, newline='') as f:
+        header = _read_header(f)
+        names = [n for n in column_names if n in header]
+        if not names:
+            return dict()
+        indices = [header.index(n) for n in names]
+        data_start = f.tell()
+
+        columns = None
+        if NUMPY_AVAIL:
+            try:
+                columns = _read_columns_numpy(f, indices)
+            except ValueError as e:
+                # -- Non-numeric values, use the lenient reader
+                logging.debug('Falling back to python frame time reader for %s: %s', file.name, e)
+                f.seek(data_start)
+        if columns is None:
+            columns = _read_columns_python(f, indices)
+
+    return dict(zip(names, columns))
+
+
+def to_list(column: Column) -> List[float]:
+    """ JSON serializable copy of a column """
+    if hasattr(column, 'tolist'):
+        return column.tolist()
+    return list(column)
+
+
+def fps_from_frame_times(frame_times: Column) -> Column:
+    """ Convert milliseconds between presents to frames per second, zero frame times stay zero
+        so the fps column lines up with the other columns of the capture.
+    """
+    if NUMPY_AVAIL and isinstance(frame_times, np.ndarray):
+        fps = np.zeros_like(frame_times)
+        np.divide(1000.0, frame_times, out=fps, where=frame_times > 0.0)
+        return fps
+    return array('d', (1000.0 / t if t > 0.0 else 0.0 for t in frame_times))
+
+
+def _percentile(sorted_values, percent: float) -> float:
+    """ Nearest rank percentile, same as utils.percentile """
+    idx = int(math.ceil((len(sorted_values) * percent) / 100)) - 1
+    return float(sorted_values[max(0, idx)])
+
+
+def _low_mean(sorted_values, percent: float, fsum) -> float:
+    """ Average of the slowest percent of frames """
+    count = max(1, int(math.ceil(len(sorted_values) * percent / 100)))
+    return float(fsum(sorted_values[:count]) / count)
+
+
+def frame_time_statistics(frame_times: Optional[Column] = None, fps: Optional[Column] = None) -> dict:
+    """ Calculate fps mean, median, percentiles, 1%/0.1% lows and stutter count from
+        frame times in milliseconds or fps values.
+    """
+    if fps is None:
+        fps = fps_from_frame_times(frame_times if frame_times is not None else array('d'))
+
+    # -- Frames without a valid frame time are not counted
+    use_numpy = NUMPY_AVAIL and isinstance(fps, np.ndarray)
+    if use_numpy:
+        sorted_fps = np.sort(fps[fps > 0.0])
+        fsum = np.sum
+    else:
+        sorted_fps = sorted(f for f in fps if f > 0.0)
+        fsum = math.fsum
+
+    size = len(sorted_fps)
+    if not size:
+        return dict()
+
+    mid = size // 2
+    if size % 2:
+        median = float(sorted_fps[mid])
+    else:
+        median = float(sorted_fps[mid - 1] + sorted_fps[mid]) / 2
+
+    # -- Stutter: frames slower than STUTTER_FACTOR times the median frame time
+    stutter_fps = median / STUTTER_FACTOR
+    if use_numpy:
+        stutters = int(np.searchsorted(sorted_fps, stutter_fps, side='left'))
+    else:
+        stutters = bisect_left(sorted_fps, stutter_fps)
+
+    return {
+        'fps99': _percentile(sorted_fps, 99),
+        'fps98': _percentile(sorted_fps, 98),
+        'fps002': _percentile(sorted_fps, 0.2),
+        'fpsmean': float(fsum(sorted_fps) / size),
+        'fpsmedian': median,
+        'fps1low': _low_mean(sorted_fps, 1, fsum),
+        'fps01low': _low_mean(sorted_fps, 0.1, fsum),
+        'stutters': stutters,
+        'frames': size,
+    }
+
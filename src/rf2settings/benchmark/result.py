@@ -1,14 +1,12 @@
-import csv
 import json
 import logging
-import statistics
 from pathlib import Path
 from typing import Dict
 
 from rf2settings.preset.preset import BasePreset, GraphicsPreset, SessionPreset
 from rf2settings.preset.preset_base import load_preset
 from rf2settings.benchmark.fpsvr_result import read_raw_frametimes_file_name, read_fps_vr_result
-from rf2settings.utils import percentile
+from rf2settings.benchmark.frametimes import read_columns, fps_from_frame_times, frame_time_statistics, to_list
 
 
 def read_results(file: Path, details: bool = False):
@@ -19,55 +17,33 @@ def read_results(file: Path, details: bool = False):
     if not data:
         data = read_present_mon_result(file, details)
 
-    if 'fps' not in data:
-        data['fps'] = [1000 / i for i in data.get('msBetweenPresents')]
-
     # -- Add Statistics
-    sorted_fps = sorted(data['fps'])
-    data['fps99'] = percentile(sorted_fps, 99)
-    data['fps98'] = percentile(sorted_fps, 98)
-    data['fps002'] = percentile(sorted_fps, 0.2)
-    data['fpsmean'], data['fpsmedian'] = statistics.mean(sorted_fps), statistics.median(sorted_fps)
+    if 'fps' not in data:
+        data['fps'] = fps_from_frame_times(data.get('msBetweenPresents', list()))
+    data.update(frame_time_statistics(fps=data['fps']))
 
     if not details:
-        data.pop('msBetweenPresents')
+        data.pop('msBetweenPresents', None)
         data.pop('fps')
-        data.pop('TimeInSeconds')
+        data.pop('TimeInSeconds', None)
+    else:
+        for key in ('msBetweenPresents', 'fps', 'TimeInSeconds'):
+            if key in data:
+                data[key] = to_list(data[key])
 
     return data
 
 
 def read_present_mon_result(file: Path, details: bool = False):
-    required_fields = {'msUntilDisplayed', 'QPCTime', 'msUntilRenderComplete', 'msBetweenDisplayChange',
-                       'Dropped', 'msInPresentAPI', 'TimeInSeconds', 'msBetweenPresents', 'msGPUActive'}
-    non_detail_fields = {'msBetweenPresents', }
-
-    data = dict()
-    with open(file, newline='') as f:
-        csv_reader = csv.reader(f)
-        for row in csv_reader:
-            if row[0].startswith('//'):
-                # -- Skip comment rows
-                continue
-            if not data:
-                # -- Assume first line as Header with column names
-                for field_name in row:
-                    data[field_name] = list()
-                continue
-
-            # -- Collect data for every row
-            for field_value, field_name in zip(row, data.keys()):
-                if not details and field_name not in non_detail_fields:
-                    continue
-                if field_value.replace('.', '', 1).isdigit():
-                    field_value = float(field_value)
-                if field_name in required_fields:
-                    data[field_name].append(field_value)
-
-    # -- Remove unnecessary fields
-    for key in set(data.keys()):
-        if key not in required_fields:
-            data.pop(key)
+    """ Read the PresentMon columns shown in the results page, only frame times if no details are requested """
+    required_fields = ('msUntilDisplayed', 'QPCTime', 'msUntilRenderComplete', 'msBetweenDisplayChange',
+                       'Dropped', 'msInPresentAPI', 'TimeInSeconds', 'msBetweenPresents', 'msGPUActive')
+    non_detail_fields = ('msBetweenPresents', )
+
+    data = read_columns(file, required_fields if details else non_detail_fields)
+    if details:
+        for key, column in data.items():
+            data[key] = to_list(column)
 
     return data
 
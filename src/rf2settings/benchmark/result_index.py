@@ -0,0 +1,146 @@
+"""
+On-disk index of benchmark result summaries.
+
+Entries are keyed by the result file path and store the size and modification time
+of the capture and its settings file. Only new or changed captures are analysed again.
+"""
+import json
+import logging
+import os
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from rf2settings.benchmark.result import read_results, read_result_settings
+from rf2settings.globals import get_settings_dir, BENCHMARK_INDEX_FILE_NAME
+from rf2settings.utils import atomic_write_text
+
+FileIdentity = Tuple[int, int]  # size, mtime_ns
+
+
+def _identity(entry: os.DirEntry) -> FileIdentity:
+    stat = entry.stat()
+    return stat.st_size, stat.st_mtime_ns
+
+
+class BenchmarkResultIndex:
+    index_version = 1
+    settings_suffix = '_settings.json'
+
+    def __init__(self, result_dir: Path, index_file: Optional[Path] = None, skip_prefixes: Tuple[str, ...] = ()):
+        """ Summaries of every result CSV in result_dir
+
+            :param result_dir: directory holding PresentMon and fpsVR result CSV files
+            :param index_file: json file to persist the index to, defaults to the settings dir
+            :param skip_prefixes: CSV files starting with one of these are not results, eg. raw fpsVR frame times
+        """
+        self.result_dir = Path(result_dir)
+        self.index_file = index_file or get_settings_dir() / BENCHMARK_INDEX_FILE_NAME
+        self.skip_prefixes = skip_prefixes
+        self.entries: Dict[str, dict] = dict()
+        self.analysed = 0  # Number of captures analysed during the last update
+        self._loaded = False
+
+    def load(self):
+        self._loaded = True
+        if not self.index_file.exists():
+            return
+        try:
+            with open(self.index_file, 'r') as f:
+                data = json.loads(f.read())
+        except Exception as e:
+            logging.error('Could not read benchmark result index, rebuilding it: %s', e)
+            return
+
+        if data.get('version') != self.index_version:
+            return
+        self.entries = data.get('results', dict()).get(str(self.result_dir), dict())
+
+    def save(self):
+        data = dict()
+        if self.index_file.exists():
+            try:
+                with open(self.index_file, 'r') as f:
+                    data = json.loads(f.read())
+            except Exception as e:
+                logging.error('Could not read benchmark result index: %s', e)
+
+        if data.get('version') != self.index_version:
+            data = {'version': self.index_version, 'results': dict()}
+        data['results'][str(self.result_dir)] = self.entries
+
+        try:
+            atomic_write_text(self.index_file, json.dumps(data))
+        except Exception as e:
+            logging.error('Could not save benchmark result index: %s', e)
+
+    def _scan(self) -> Tuple[Dict[str, os.DirEntry], Dict[str, os.DirEntry]]:
+        results, settings = dict(), dict()
+        if not self.result_dir.exists():
+            return results, settings
+
+        with os.scandir(self.result_dir) as it:
+            for entry in it:
+                name = entry.name
+                if name.endswith(self.settings_suffix):
+                    settings[name[:-len(self.settings_suffix)]] = entry
+                elif name.lower().endswith('.csv') and not name.startswith(self.skip_prefixes):
+                    results[name] = entry
+        return results, settings
+
+    def update(self) -> bool:
+        """ Re-analyse new or changed result files and drop removed ones. Returns True if the index changed. """
+        if not self._loaded:
+            self.load()
+
+        results, settings = self._scan()
+        changed, self.analysed = False, 0
+
+        for name in set(self.entries) - set(results):
+            self.entries.pop(name)
+            changed = True
+
+        for name, entry in results.items():
+            stem = name[:-len('.csv')]
+            identity = list(_identity(entry))
+            settings_entry = settings.get(stem)
+            settings_identity = list(_identity(settings_entry)) if settings_entry else None
+
+            indexed = self.entries.get(name)
+            if indexed and indexed['identity'] == identity and indexed['settings_identity'] == settings_identity:
+                continue
+
+            file = Path(entry.path)
+            if indexed and indexed['identity'] == identity:
+                # -- Only the settings file changed
+                indexed['settings'] = read_result_settings(file)
+                indexed['settings_identity'] = settings_identity
+            else:
+                logging.debug('Analysing Benchmark Result: %s', file)
+                try:
+                    data = read_results(file, details=False)
+                except Exception as e:
+                    logging.error('Could not read Benchmark Result %s: %s', name, e)
+                    data = dict()
+                self.entries[name] = {'identity': identity, 'settings_identity': settings_identity,
+                                      'data': data, 'settings': read_result_settings(file)}
+                self.analysed += 1
+            changed = True
+
+        if changed:
+            self.save()
+        return changed
+
+    def results(self) -> List[dict]:
+        """ Result summaries sorted newest name first, as expected by the frontend """
+        names = sorted(self.entries, reverse=True)
+        return [{'id': idx, 'name': name, 'data': self.entries[name]['data'],
+                 'settings': self.entries[name]['settings']} for idx, name in enumerate(names)]
+
+    def find(self, name: str) -> Optional[Path]:
+        """ Path of a result file by file name, the index is updated if the name is not indexed yet """
+        if name not in self.entries:
+            # -- Not looked up yet in this session or captured since the last update
+            self.update()
+        if name not in self.entries:
+            return None
+        return self.result_dir / name
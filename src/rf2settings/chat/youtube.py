@@ -1,8 +1,6 @@
 import logging
 from typing import Optional, Union
 
-from googleapiclient.discovery import build
-
 from rf2settings.app_settings import AppSettings
 
 LAST_ERRORS = list()
@@ -10,6 +8,12 @@ API_K = AppSettings.chat_plugin_version.get("2022.10.19")
 youtube = None
 
 
+def build(*args, **kwargs):
+    # -- googleapiclient is only imported once the live chat is used
+    from googleapiclient.discovery import build as build_resource
+    return build_resource(*args, **kwargs)
+
+
 def get_channel_id_by_username(username: str) -> Optional[str]:
     global youtube
     if youtube is None:
@@ -9,13 +9,7 @@ import gevent.timeout
 from .app.app_main import CLOSE_EVENT
 from .app_settings import AppSettings
 from .utils import create_js_pygame_event_dict, create_js_joystick_device_list, capture_app_exceptions
-from .utils import get_pygame_joy_dict
-
-try:
-    import pygame
-    py_game_avail = 1
-except ImportError:
-    py_game_avail = 0
+from .utils import get_pygame_joy_dict, pygame, pygame_avail as py_game_avail
 
 
 class SetupControllerAxis:
@@ -34,12 +28,16 @@ class ControllerEvents:
     joysticks = dict()
     capturing = False  # When we want to capture input mappings and capture all axis events as well
 
+    # -- Seconds between pygame event polls, slower while no device is connected
+    poll_interval = 0.02
+    idle_poll_interval = 0.25
+
 
 @capture_app_exceptions
-def controller_event_loop():
+def controller_event_loop(timeout: float = 1.0):
     """ Will be run in main eel greenlet to be able to post events to JS frontend """
     # -- Block for timeout until event is set
-    event_found = ControllerEvents.event.wait(timeout=1.0)
+    event_found = ControllerEvents.event.wait(timeout=timeout)
 
     # -- Forward Controller Events to FrontEnd
     if event_found:
@@ -163,6 +161,9 @@ def controller_greenlet(event_callback: callable = _set_event_result):
             event_loop_active = False
 
         # -- End of event loop, restart to get pygame events
-        gevent.sleep(0.02)
+        if ControllerEvents.joysticks or ControllerEvents.capturing:
+            CLOSE_EVENT.wait(ControllerEvents.poll_interval)
+        else:
+            CLOSE_EVENT.wait(ControllerEvents.idle_poll_interval)
 
     logging.info('Controller greenlet exiting.')
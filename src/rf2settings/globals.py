@@ -103,6 +103,10 @@ else:
 
 SETTINGS_FILE_NAME = 'settings.json' if FROZEN else 'settings_dev.json'
 SETTINGS_CONTENT_FILE_NAME = 'content.json'
+BENCHMARK_INDEX_FILE_NAME = 'benchmark_index.json'
+REPLAY_INDEX_FILE_NAME = 'replay_index.json'
+STEAM_CATALOG_FILE_NAME = 'steam_catalog.json'
+LATENCY_HISTORY_FILE_NAME = 'latency_history.json'
 
 
 def check_and_create_dir(directory: Union[str, Path]) -> str:
@@ -5,7 +5,7 @@ import gevent
 
 from .app.app_main import CLOSE_EVENT
 from .app_settings import AppSettings
-from .gamecontroller import ControllerEvents, SetupControllerAxis
+from .gamecontroller import ControllerEvents, SetupControllerAxis, py_game_avail
 from .preset.preset import HeadlightControlsSettingsPreset
 from .preset.settings_model import HeadlightSettings, HeadlightControllerAssignments, AutoHeadlightSettings
 from .mods.rf2lights import RfactorHeadlight
@@ -13,12 +13,6 @@ from .rfactor import RfactorPlayer
 from .settingsdef.headlights import controller_assignments
 from .utils import create_js_pygame_event_dict, capture_app_exceptions, AppAudioFx
 
-try:
-    import pygame
-    py_game_avail = 1
-except ImportError:
-    py_game_avail = 0
-
 # -- Headlight Greenlet Update rate in float seconds
 #    Controller Events will wait for UPDATE_RATE but trigger instantaneous updates when needed.
 #
@@ -0,0 +1,114 @@
+"""
+Measure the time spent importing modules during app start-up.
+
+ImportProfiler wraps builtins.__import__ while active and records every import
+statement that loads new modules: the cumulative time including nested imports and
+the self time without them. The report is written to the log dir on every start,
+together with the total of the previous start, so regressions in the time until the
+app window opens are visible.
+"""
+import builtins
+import importlib.util
+import json
+import logging
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+IMPORT_PROFILE_FILE_NAME = 'import_profile.json'
+
+
+class ImportProfiler:
+    def __init__(self):
+        # -- {module name: [cumulative seconds, self seconds, modules loaded]}
+        self.modules: Dict[str, list] = dict()
+        self.total = 0.0
+        self._stack: List[float] = list()  # Time spent in nested imports per active import
+        self._active: List[str] = list()    # Names of the active imports
+        self._original_import = None
+        self._start = 0.0
+
+    def start(self) -> 'ImportProfiler':
+        self._original_import = builtins.__import__
+        builtins.__import__ = self._import
+        self._start = time.perf_counter()
+        return self
+
+    def stop(self):
+        if self._original_import is not None:
+            builtins.__import__ = self._original_import
+            self._original_import = None
+            self.total = time.perf_counter() - self._start
+
+    def _import(self, name, globals=None, locals=None, fromlist=(), level=0):
+        original_import = self._original_import or builtins.__import__
+        loaded = len(sys.modules)
+        if name in sys.modules and not fromlist and not level:
+            return original_import(name, globals, locals, fromlist, level)
+
+        module_name = self._resolve(name, globals, level)
+        sub_modules = [f'{module_name}.{n}' for n in fromlist or () if f'{module_name}.{n}' not in sys.modules]
+        self._stack.append(0.0)
+        self._active.append(module_name)
+        start = time.perf_counter()
+        try:
+            return original_import(name, globals, locals, fromlist, level)
+        finally:
+            elapsed = time.perf_counter() - start
+            nested = self._stack.pop()
+            self._active.pop()
+            if self._stack:
+                self._stack[-1] += elapsed
+
+            new_modules = len(sys.modules) - loaded
+            if new_modules > 0:
+                # -- "from package import module" is reported as package.module
+                loaded_sub_modules = [n for n in sub_modules if n in sys.modules]
+                if len(loaded_sub_modules) == 1:
+                    module_name = loaded_sub_modules[0]
+                entry = self.modules.setdefault(module_name, [0.0, 0.0, 0])
+                # -- A package importing its own sub modules is already counted by the outer import
+                if module_name not in self._active:
+                    entry[0] += elapsed
+                    entry[2] += new_modules
+                entry[1] += elapsed - nested
+
+    @staticmethod
+    def _resolve(name: str, globals_: Optional[dict], level: int) -> str:
+        if not level:
+            return name
+        try:
+            return importlib.util.resolve_name('.' * level + name, (globals_ or dict()).get('__package__'))
+        except (ImportError, ValueError):
+            return name
+
+    def report(self, top: int = 40) -> dict:
+        modules = sorted(self.modules.items(), key=lambda i: i[1][0], reverse=True)
+        return {'total_ms': round(self.total * 1000, 1),
+                'modules': [{'name': n, 'cumulative_ms': round(c * 1000, 1), 'self_ms': round(s * 1000, 1),
+                             'loaded': loaded} for n, (c, s, loaded) in modules[:top]]}
+
+    def save(self, directory: Path, top: int = 40) -> dict:
+        """ Write the report to directory and log it compared to the previous start """
+        file = Path(directory) / IMPORT_PROFILE_FILE_NAME
+        report = self.report(top)
+
+        previous_total = None
+        try:
+            with open(file, 'r', encoding='utf-8') as f:
+                previous_total = json.loads(f.read()).get('total_ms')
+        except (OSError, ValueError):
+            pass
+        report['previous_total_ms'] = previous_total
+
+        # -- Imported here, the profiler is set up before any app module is imported
+        from .utils import atomic_write_text
+        try:
+            atomic_write_text(file, json.dumps(report, indent=2))
+        except OSError as e:
+            logging.error('Could not write import profile: %s', e)
+
+        logging.info('Imports took %.1fms, previous start %sms. Slowest: %s', report['total_ms'], previous_total,
+                     ', '.join(f"{m['name']} {m['cumulative_ms']}ms" for m in report['modules'][:5]))
+        return report
@@ -0,0 +1,117 @@
+"""
+Line based ini document that keeps the layout of a file.
+
+rFactor 2 writes its Config_DX11.ini with a comment header, its own key order and
+no trailing new line. IniDocument only replaces the values of the keys that
+changed; every other line, including comments, blank lines and line endings, is
+written back byte for byte. Files are only replaced, atomically, if their content
+differs.
+"""
+import re
+from pathlib import Path
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+from .utils import atomic_write_text
+
+# -- key=value with an optional inline // comment that ConfigParser would strip as well
+_KEY_VALUE = re.compile(r'^(?P<key>[^=\[\s][^=]*?)(?P<sep>\s*=\s*)(?P<value>.*?)(?P<comment>\s+//.*)?(?P<eol>\r?\n?)$')
+_SECTION = re.compile(r'^\s*\[(?P<name>[^\]]+)\]')
+_COMMENT_PREFIXES = ('#', ';', '//')
+
+
+class IniWriteResult(NamedTuple):
+    written: bool       # File content differed and was replaced
+    keys_changed: int
+    bytes_changed: int  # Size of the lines that changed
+    bytes_written: int
+
+
+class IniDocument:
+    def __init__(self, text: str = ''):
+        self.lines: List[str] = list()
+        # -- {section: {key: line index}}, keys before the first section are in section ''
+        self._index: Dict[str, Dict[str, int]] = dict()
+        self._changed_lines: Dict[int, str] = dict()  # line index: original line
+        self.parse(text)
+
+    def parse(self, text: str):
+        self.lines = text.splitlines(keepends=True)
+        self._index, self._changed_lines = {'': dict()}, dict()
+        section = ''
+
+        for idx, line in enumerate(self.lines):
+            stripped = line.strip()
+            if not stripped or stripped.startswith(_COMMENT_PREFIXES):
+                continue
+            m = _SECTION.match(line)
+            if m:
+                section = m.group('name')
+                self._index.setdefault(section, dict())
+                continue
+            m = _KEY_VALUE.match(line)
+            if m:
+                self._index[section][m.group('key')] = idx
+
+    @classmethod
+    def read(cls, file: Path, encoding: Optional[str] = None) -> 'IniDocument':
+        with open(file, 'r', encoding=encoding, newline='') as f:
+            return cls(f.read())
+
+    def has_key(self, section: str, key: str) -> bool:
+        return key in self._index.get(section, dict())
+
+    def get(self, section: str, key: str, default: Optional[str] = None) -> Optional[str]:
+        idx = self._index.get(section, dict()).get(key)
+        if idx is None:
+            return default
+        return _KEY_VALUE.match(self.lines[idx]).group('value')
+
+    def set(self, section: str, key: str, value: str) -> bool:
+        """ Update the value of an existing key, returns True if the value changed """
+        idx = self._index.get(section, dict()).get(key)
+        if idx is None:
+            raise KeyError(f'{key} not found in section {section}')
+
+        line = self.lines[idx]
+        m = _KEY_VALUE.match(line)
+        if m.group('value') == value:
+            return False
+
+        self._changed_lines.setdefault(idx, line)
+        self.lines[idx] = line[:m.start('value')] + value + line[m.end('value'):]
+        if self.lines[idx] == self._changed_lines[idx]:
+            self._changed_lines.pop(idx)
+        return True
+
+    def changes(self) -> List[Tuple[str, str, str]]:
+        """ Changed lines as (key, previous value, new value) """
+        result = list()
+        for idx, original in sorted(self._changed_lines.items()):
+            result.append((_KEY_VALUE.match(original).group('key'), _KEY_VALUE.match(original).group('value'),
+                           _KEY_VALUE.match(self.lines[idx]).group('value')))
+        return result
+
+    @property
+    def text(self) -> str:
+        return ''.join(self.lines)
+
+    def write(self, file: Path, encoding: Optional[str] = None) -> IniWriteResult:
+        """ Atomically replace file if its content differs from this document """
+        text = self.text
+        try:
+            with open(file, 'r', encoding=encoding, newline='') as f:
+                current = f.read()
+        except FileNotFoundError:
+            current = None
+
+        keys_changed = len(self._changed_lines)
+        bytes_changed = sum(len(self.lines[idx]) for idx in self._changed_lines)
+        if current == text:
+            return IniWriteResult(False, keys_changed, 0, 0)
+
+        bytes_written = atomic_write_text(file, text, encoding, newline='')
+
+        if current is None:
+            bytes_changed = bytes_written
+        self._changed_lines = dict()
+        return IniWriteResult(True, keys_changed, bytes_changed, bytes_written)
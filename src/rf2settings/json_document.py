@@ -0,0 +1,204 @@
+"""
+Patch values of rFactor 2 player.JSON and Controller.JSON files in place.
+
+rF2 settings files are two levels deep: categories holding settings. JsonDocument
+scans a file once and remembers where the value of every setting starts and ends
+in the text, next to the decoded data. Changed settings replace only their value
+text; the rest of the file, its formatting and key order, is written back as read.
+
+Documents are cached per file together with the detected encoding, size and
+modification time, so applying presets repeatedly neither re-reads nor re-decodes
+unchanged files. Files are only replaced, atomically, if a value changed.
+"""
+import json
+import logging
+import os
+import re
+from bisect import bisect_left
+from json.decoder import scanstring
+from pathlib import Path
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+
+from .utils import atomic_write_text
+
+_WHITESPACE = re.compile(r'[ \t\n\r]*')
+_scan_once = json.JSONDecoder().scan_once
+
+
+class JsonWriteResult(NamedTuple):
+    written: bool
+    values_changed: int
+    bytes_written: int
+
+
+class JsonDocument:
+    # -- {file: (size, mtime_ns, JsonDocument)}
+    cache: Dict[str, tuple] = dict()
+
+    def __init__(self, text: str, encoding: str = 'utf-8'):
+        self.encoding = encoding
+        self.text = str()
+        self.data: Dict[str, Any] = dict()
+        # -- {(category, key): (value start, value end)} and {category: (key end, closing brace)}
+        self._spans: Dict[Tuple[str, str], Tuple[int, int]] = dict()
+        self._categories: Dict[str, Tuple[int, int]] = dict()
+        self._patches: Dict[Tuple[str, str], Any] = dict()
+        self._parse(text)
+
+    def _ws(self, idx: int) -> int:
+        return _WHITESPACE.match(self.text, idx).end()
+
+    def _expect(self, idx: int, char: str) -> int:
+        if self.text[idx:idx + 1] != char:
+            raise ValueError(f'Expected {char} at position {idx}')
+        return idx + 1
+
+    def _parse(self, text: str):
+        self.text, self.data, self._spans, self._categories = text, dict(), dict(), dict()
+        idx = self._expect(self._ws(0), '{')
+
+        while True:
+            idx = self._ws(idx)
+            if self.text.startswith('}', idx):
+                break
+            category, idx = scanstring(self.text, self._expect(idx, '"'))
+            idx = self._ws(self._expect(self._ws(idx), ':'))
+
+            if self.text.startswith('{', idx):
+                self.data[category], idx = self._parse_category(category, idx)
+            else:
+                self.data[category], idx = _scan_once(self.text, idx)
+
+            idx = self._ws(idx)
+            if self.text.startswith(',', idx):
+                idx += 1
+
+    def _parse_category(self, category: str, idx: int) -> Tuple[dict, int]:
+        values, idx = dict(), idx + 1
+        last_value_end = idx
+        while True:
+            idx = self._ws(idx)
+            if self.text.startswith('}', idx):
+                self._categories[category] = (last_value_end, idx)
+                return values, idx + 1
+
+            key, idx = scanstring(self.text, self._expect(idx, '"'))
+            start = self._ws(self._expect(self._ws(idx), ':'))
+            values[key], idx = _scan_once(self.text, start)
+            self._spans[(category, key)] = (start, idx)
+            last_value_end = idx
+
+            idx = self._ws(idx)
+            if self.text.startswith(',', idx):
+                idx += 1
+
+    @classmethod
+    def read(cls, file: Path, encoding: Optional[str] = None) -> 'JsonDocument':
+        """ Decode file with encoding first, then with the remaining encodings rF2 uses """
+        encodings = ['utf-8', 'cp1252']
+        if encoding:
+            encodings = [encoding] + [e for e in encodings if e != encoding]
+
+        raw = Path(file).read_bytes()
+        for encoding in encodings:
+            try:
+                text = raw.decode(encoding)
+            except UnicodeDecodeError as e:
+                logging.debug('Could not decode JSON data with encoding %s: %s', encoding, e)
+                continue
+            return cls(text, encoding)
+        raise ValueError(f'Could not decode {Path(file).name} with any of {encodings}')
+
+    @classmethod
+    def load(cls, file: Path, encoding: Optional[str] = None) -> 'JsonDocument':
+        """ Cached document of file, read again only if the file changed on disk """
+        stat = os.stat(file)
+        entry = cls.cache.get(str(file))
+        if entry is not None and entry[:2] == (stat.st_size, stat.st_mtime_ns) and not entry[2]._patches:
+            return entry[2]
+
+        doc = cls.read(file, encoding)
+        cls.cache[str(file)] = (stat.st_size, stat.st_mtime_ns, doc)
+        return doc
+
+    def set(self, category: str, key: str, value: Any) -> bool:
+        """ Set a value of a category, returns True if the value changed. Unknown keys are appended. """
+        if category not in self._categories:
+            raise KeyError(f'Category {category} not found')
+
+        current = self.data[category].get(key)
+        if key in self.data[category] and current == value and type(current) is type(value):
+            return False
+
+        self.data[category][key] = value
+        self._patches[(category, key)] = value
+        return True
+
+    def _patched_text(self) -> Tuple[str, List[Tuple[int, int, str]], bool]:
+        edits: List[Tuple[int, int, str]] = list()
+        appended: Dict[str, List[str]] = dict()
+
+        for (category, key), value in self._patches.items():
+            value_text = json.dumps(value, ensure_ascii=False)
+            span = self._spans.get((category, key))
+            if span is not None:
+                edits.append((span[0], span[1], value_text))
+            else:
+                appended.setdefault(category, list()).append(
+                    f'{json.dumps(key, ensure_ascii=False)}: {value_text}')
+
+        for category, entries in appended.items():
+            last_value_end, closing = self._categories[category]
+            # -- Indent like the line of the closing brace, one level deeper
+            line_start = self.text.rfind('\n', 0, closing) + 1
+            indent = self.text[line_start:closing] + '  '
+            separator = ',' if any(c == category for c, _ in self._spans) else ''
+            insert = separator + ''.join(f'\n{indent}{e},' for e in entries).rstrip(',')
+            edits.append((last_value_end, last_value_end, insert))
+
+        edits.sort()
+        parts, position = list(), 0
+        for start, end, replacement in edits:
+            parts.append(self.text[position:start])
+            parts.append(replacement)
+            position = end
+        parts.append(self.text[position:])
+        return ''.join(parts), edits, bool(appended)
+
+    def _move_spans(self, text: str, edits: List[Tuple[int, int, str]]):
+        """ Shift the stored value positions by the size difference of the replaced values before them """
+        starts, offsets, offset = [e[0] for e in edits], [0], 0
+        for start, end, replacement in edits:
+            offset += len(replacement) - (end - start)
+            offsets.append(offset)
+
+        def move(start: int, end: int) -> Tuple[int, int]:
+            idx = bisect_left(starts, start)
+            if idx < len(starts) and starts[idx] == start:
+                # -- Replaced value
+                return start + offsets[idx], start + offsets[idx] + len(edits[idx][2])
+            return start + offsets[idx], end + offsets[idx]
+
+        self._spans = {k: move(*span) for k, span in self._spans.items()}
+        self._categories = {k: move(*span) for k, span in self._categories.items()}
+        self.text = text
+
+    def write(self, file: Path) -> JsonWriteResult:
+        """ Atomically replace file with the patched document, nothing is written without changes """
+        values_changed = len(self._patches)
+        if not values_changed:
+            return JsonWriteResult(False, 0, 0)
+
+        text, edits, appended = self._patched_text()
+        data = text.encode(self.encoding)
+        atomic_write_text(file, data)
+
+        # -- Value positions moved, appended keys need a new index
+        self._patches = dict()
+        if appended:
+            self._parse(text)
+        else:
+            self._move_spans(text, edits)
+        stat = os.stat(file)
+        JsonDocument.cache[str(file)] = (stat.st_size, stat.st_mtime_ns, self)
+        return JsonWriteResult(True, values_changed, len(data))
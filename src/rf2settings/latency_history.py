@@ -0,0 +1,164 @@
+"""
+Round-trip times of A2S queries per server address.
+
+Every query of a server adds a sample: the time until its info reply arrived or a
+loss if it did not answer. LatencyHistory keeps, per address, an exponentially
+weighted moving average of the round-trip time, the jitter as in RFC 3550, a
+smoothed loss rate and the most recent samples. The server browser sorts by the
+average instead of the last sample, so a single slow reply does not bury a good
+server.
+
+The history is written to the settings dir through a WriteBehind. Only the last
+max_samples samples of at most max_servers addresses seen within max_age are kept.
+"""
+import base64
+import json
+import logging
+import time
+from array import array
+from pathlib import Path
+from typing import Dict, Optional
+
+from .globals import LATENCY_HISTORY_FILE_NAME, get_settings_dir
+from .write_behind import WriteBehind
+
+LOST = 0xFFFF   # Sample of a query that was not answered
+MAX_RTT = 0xFFFE
+
+
+class ServerLatency:
+    __slots__ = ('avg', 'jitter', 'loss', 'sent', 'lost', 'last_query', 'samples')
+
+    def __init__(self):
+        self.avg: Optional[float] = None    # Smoothed round-trip time in ms, None until the first answer
+        self.jitter = 0.0                   # Smoothed difference between consecutive round-trip times in ms
+        self.loss = 0.0                     # Smoothed share of unanswered queries
+        self.sent = 0
+        self.lost = 0
+        self.last_query = 0.0
+        self.samples = array('H')           # Round-trip times in ms, LOST for unanswered queries
+
+    def last_rtt(self) -> Optional[int]:
+        for sample in reversed(self.samples):
+            if sample != LOST:
+                return sample
+
+    def to_list(self) -> list:
+        return [self.avg, round(self.jitter, 2), round(self.loss, 4), self.sent, self.lost, self.last_query,
+                base64.b64encode(self.samples.tobytes()).decode('ascii')]
+
+    @classmethod
+    def from_list(cls, values: list) -> 'ServerLatency':
+        entry = cls()
+        entry.avg, entry.jitter, entry.loss, entry.sent, entry.lost, entry.last_query, samples = values
+        entry.samples.frombytes(base64.b64decode(samples))
+        return entry
+
+
+class LatencyHistory:
+    history_version = 1
+    alpha = 0.2             # Weight of a new sample in the average and the loss rate
+    jitter_gain = 1 / 16    # RFC 3550
+    max_samples = 32        # Samples kept per address
+    max_servers = 4000      # Addresses kept, least recently queried are dropped first
+    max_age = 14 * 86400.0  # Drop addresses not queried for this many seconds
+
+    def __init__(self, history_file: Optional[Path] = None):
+        """ Latency samples per server id ip:port
+
+            :param history_file: json file to persist the history to, None keeps it in memory only
+        """
+        self.history_file = history_file
+        self.servers: Dict[str, ServerLatency] = dict()
+        self.writer: Optional[WriteBehind] = None
+
+        if history_file is not None:
+            self.writer = WriteBehind('latency_history', delay=5.0, max_delay=60.0)
+            self.writer.add_section('history', lambda: self.history_file, self._serialize)
+
+    def load(self):
+        if not self.history_file or not self.history_file.exists():
+            return
+        try:
+            with open(self.history_file, 'r', encoding='utf-8') as f:
+                data = json.loads(f.read())
+            if data.get('version') != self.history_version:
+                return
+            self.servers = {k: ServerLatency.from_list(v) for k, v in data.get('servers', dict()).items()}
+        except Exception as e:
+            logging.error('Could not read latency history, starting a new one: %s', e)
+
+    def save(self):
+        """ Schedule writing the history """
+        if self.writer is not None:
+            self.writer.mark_dirty('history')
+
+    def _serialize(self) -> str:
+        self.prune()
+        return json.dumps({'version': self.history_version,
+                           'servers': {k: v.to_list() for k, v in self.servers.items()}})
+
+    def record(self, server_id: str, rtt: Optional[float], now: Optional[float] = None) -> ServerLatency:
+        """ Add a sample
+
+            :param server_id: ip:port of the server
+            :param rtt: round-trip time in seconds, None if the query was not answered
+            :param now: time of the query, defaults to time.time()
+        """
+        entry = self.servers.get(server_id)
+        if entry is None:
+            entry = self.servers[server_id] = ServerLatency()
+
+        entry.sent += 1
+        entry.last_query = now or time.time()
+
+        if rtt is None:
+            entry.lost += 1
+            entry.loss += self.alpha * (1.0 - entry.loss)
+            sample = LOST
+        else:
+            sample = min(MAX_RTT, round(rtt * 1000))
+            previous = entry.last_rtt()
+            if entry.avg is None:
+                entry.avg = float(sample)
+            else:
+                entry.avg = round(entry.avg + self.alpha * (sample - entry.avg), 2)
+            if previous is not None:
+                entry.jitter += self.jitter_gain * (abs(sample - previous) - entry.jitter)
+            entry.loss -= self.alpha * entry.loss
+
+        entry.samples.append(sample)
+        if len(entry.samples) > self.max_samples:
+            del entry.samples[:len(entry.samples) - self.max_samples]
+        return entry
+
+    def get(self, server_id: str) -> Optional[ServerLatency]:
+        return self.servers.get(server_id)
+
+    def summary(self, server_id: str) -> dict:
+        """ Latency values added to the server info of the server browser """
+        entry = self.servers.get(server_id)
+        if entry is None or entry.avg is None:
+            return dict()
+        return {'ping_avg': round(entry.avg), 'jitter': round(entry.jitter),
+                'loss': round(entry.loss * 100)}
+
+    def prune(self, now: Optional[float] = None):
+        oldest = (now or time.time()) - self.max_age
+        servers = [(k, v) for k, v in self.servers.items() if v.last_query >= oldest]
+        if len(servers) > self.max_servers:
+            servers.sort(key=lambda i: i[1].last_query, reverse=True)
+            servers = servers[:self.max_servers]
+        if len(servers) != len(self.servers):
+            self.servers = dict(servers)
+
+
+_latency_history: Optional[LatencyHistory] = None
+
+
+def get_latency_history() -> LatencyHistory:
+    global _latency_history
+    if _latency_history is None:
+        _latency_history = LatencyHistory(get_settings_dir() / LATENCY_HISTORY_FILE_NAME)
+        _latency_history.load()
+    return _latency_history
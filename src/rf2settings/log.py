@@ -1,11 +1,124 @@
+import atexit
 import logging
 import logging.config
+import logging.handlers
+import queue
+import threading
+import time
 from pathlib import Path
+from typing import Dict, Optional, Tuple
 
 from .globals import APP_NAME, DEFAULT_LOG_LEVEL, get_log_file
 
 
-def setup_logging(logger_name: str = APP_NAME):
+class RateLimitFilter(logging.Filter):
+    """ Token bucket per logging call site for records below WARNING, so loops logging on every
+        iteration can not flood the log. The next record passing a call site reports how many
+        records were suppressed.
+    """
+    rate = 10.0     # Records per second and call site
+    burst = 50      # Records a call site may log at once before being limited
+    # -- Override rate and burst per logger or module name, eg. {'rf2connect': (2.0, 10)}
+    limits: Dict[str, Tuple[float, int]] = dict()
+
+    def __init__(self):
+        super().__init__()
+        self._buckets: Dict[tuple, list] = dict()  # call site: [tokens, last update, suppressed]
+        self._lock = threading.Lock()
+        self.suppressed = 0
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= logging.WARNING:
+            return True
+
+        rate, burst = self.limits.get(record.name) or self.limits.get(record.module) or (self.rate, self.burst)
+        key, now = (record.name, record.pathname, record.lineno), record.created
+        with self._lock:
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                bucket = self._buckets[key] = [float(burst), now, 0]
+            bucket[0] = min(float(burst), bucket[0] + (now - bucket[1]) * rate)
+            bucket[1] = now
+
+            if bucket[0] < 1.0:
+                bucket[2] += 1
+                self.suppressed += 1
+                return False
+            bucket[0] -= 1.0
+            suppressed, bucket[2] = bucket[2], 0
+
+        if suppressed:
+            record.msg, record.args = f'{record.getMessage()} [{suppressed} similar records suppressed]', None
+        return True
+
+
+class BoundedQueueHandler(logging.handlers.QueueHandler):
+    """ Hands records to the log writer thread without ever blocking, records are dropped
+        and counted while the queue is full.
+    """
+    def __init__(self, maxsize: int):
+        super().__init__(queue.Queue(maxsize))
+        self.dropped = 0
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+class LogPipeline:
+    """ Records are formatted in the logging thread and written by a dedicated writer thread """
+    max_queued_records = 10000
+
+    handler: Optional[BoundedQueueHandler] = None
+    listener: Optional[logging.handlers.QueueListener] = None
+    rate_limit: Optional[RateLimitFilter] = None
+    started = 0.0
+    _exit_registered = False
+
+    @classmethod
+    def start(cls, logger_names):
+        cls.stop()
+        if not cls._exit_registered:
+            # -- Runs before logging.shutdown, which is registered earlier
+            atexit.register(cls.stop)
+            cls._exit_registered = True
+        loggers = [logging.getLogger(n or None) for n in logger_names]
+        handlers = list()
+        for logger in loggers:
+            handlers.extend(h for h in logger.handlers if h not in handlers)
+
+        cls.rate_limit = RateLimitFilter()
+        cls.handler = BoundedQueueHandler(cls.max_queued_records)
+        cls.handler.addFilter(cls.rate_limit)
+        for logger in loggers:
+            for h in logger.handlers.copy():
+                logger.removeHandler(h)
+            logger.addHandler(cls.handler)
+
+        cls.listener = logging.handlers.QueueListener(cls.handler.queue, *handlers, respect_handler_level=True)
+        cls.listener.start()
+        cls.started = time.time()
+
+    @classmethod
+    def stop(cls):
+        """ Write all queued records and stop the writer thread """
+        if cls.listener is None:
+            return
+        logging.getLogger(APP_NAME).info('Logging pipeline stats: %s', cls.stats())
+        cls.listener.stop()
+        cls.listener = None
+
+    @classmethod
+    def stats(cls) -> dict:
+        if cls.handler is None:
+            return dict()
+        return {'queued': cls.handler.queue.qsize(), 'dropped': cls.handler.dropped,
+                'rate_limited': cls.rate_limit.suppressed, 'seconds': round(time.time() - cls.started, 1)}
+
+
+def setup_logging(logger_name: str = APP_NAME, use_queue: bool = True):
     log_level = DEFAULT_LOG_LEVEL
     log_handlers = ['file', 'console']
 
@@ -45,6 +158,14 @@ def setup_logging(logger_name: str = APP_NAME):
 
     logging.config.dictConfig(log_conf)
 
+    if use_queue:
+        # -- Move file and console output into the writer thread
+        LogPipeline.start(log_conf['loggers'].keys())
+
+
+def stop_logging():
+    LogPipeline.stop()
+
 
 def setup_logger(name):
     module_logger_name = f'{APP_NAME}.{name}'
@@ -53,6 +174,7 @@ def setup_logger(name):
 
 
 def reset_logging():
+    LogPipeline.stop()
     manager = logging.root.manager
     manager.disabled = logging.NOTSET
     for logger in manager.loggerDict.values():
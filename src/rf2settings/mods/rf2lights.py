@@ -37,7 +37,7 @@ class RfactorHeadlight:
         self.headlight_state = None
         self.headlight_toggle_dik = headlight_toggle_dik or 'DIK_H'
         self.rf2_auto_headlights_enabled = False
-        self.info = RfactorConnect.shared_memory_obj
+        self.info = RfactorConnect.shared_memory()
         self._flashing = False
         self._count = 0
         self.timer = (0, 0)  # On time, off time
@@ -119,10 +119,12 @@ class RfactorHeadlight:
             return  # Don't turn headlights on when flashing
 
         if on_automatically and not self.are_headlights_on():
-            _num_drivers = self.info.Rf2Scor.mScoringInfo.mNumVehicles
+            # -- Count from one coherent frame instead of the live, possibly half-written, vehicle arrays
+            snapshot = self.info.snapshot()
+            _num_drivers = snapshot.num_vehicles
             _num_drivers_with_lights = 0
             for _driver in range(_num_drivers):
-                if self.info.Rf2Tele.mVehicles[_driver].mHeadlights:
+                if snapshot.telemetry.mVehicles[_driver].mHeadlights:
                     _num_drivers_with_lights += 1
             # Total includes the player so
             _num_drivers -= 1
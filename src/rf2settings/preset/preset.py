@@ -65,7 +65,9 @@ class BasePreset:
         name_idx = 0
         preset_dir = get_user_presets_dir()
 
-        while [_ for _ in preset_dir.glob(f'*{name}*.json')]:
+        # -- List the directory once instead of globbing for every candidate name
+        file_stems = [f.stem.lower() for f in preset_dir.glob('*.json')]
+        while any(name.lower() in stem for stem in file_stems):
             name_idx += 1
             name = f'{base_name}_{name_idx}'
 
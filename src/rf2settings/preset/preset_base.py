@@ -1,10 +1,11 @@
 import json
 import logging
+import os
 from pathlib import Path
-from typing import Dict, Type, Optional
+from typing import Dict, Type, Optional, List, Tuple
 
 from . import preset
-from .settings_model import OptionsTarget
+from .settings_model import OptionsTarget, FLOAT_SETTING_NDIGITS
 from ..globals import find_subclasses
 
 PRESET_TYPES: Dict[int, Type[preset.BasePreset]] = dict()
@@ -13,6 +14,146 @@ for name, preset_cls in find_subclasses(preset, preset.BasePreset):
 del preset_cls
 
 
+# -- Flat comparison table of a preset: {(options app_key, option key): value}
+Fingerprint = Dict[Tuple[str, str], object]
+
+
+class PresetStore:
+    """ In-memory index of the preset files inside a directory.
+
+        Files are only parsed again if their size or modification time changed.
+        Presets are indexed by type and name and every preset instance handed out
+        is a new object, so callers are free to modify it.
+    """
+    def __init__(self, preset_dir: Path):
+        self.preset_dir = Path(preset_dir)
+        self.entries: Dict[str, dict] = dict()  # file name: entry
+        self.by_type: Dict[int, Dict[str, str]] = dict()  # preset_type: {preset name: file name}
+        self.parsed = 0  # Number of files parsed during the last refresh
+
+    def refresh(self):
+        """ Update the index from the preset directory, only new or changed files are read """
+        self.parsed = 0
+        files = dict()
+        try:
+            with os.scandir(self.preset_dir) as it:
+                for entry in it:
+                    if entry.name.lower().endswith('.json') and entry.is_file():
+                        stat = entry.stat()
+                        files[entry.name] = (stat.st_size, stat.st_mtime_ns)
+        except OSError as e:
+            logging.error('Could not read preset directory %s: %s', self.preset_dir, e)
+
+        changed = False
+        for file_name in set(self.entries) - set(files):
+            self.entries.pop(file_name)
+            changed = True
+
+        for file_name, identity in files.items():
+            indexed = self.entries.get(file_name)
+            if indexed and indexed['identity'] == identity:
+                continue
+            self.entries[file_name] = self._read_entry(self.preset_dir / file_name, identity)
+            self.parsed += 1
+            changed = True
+
+        if changed:
+            self._update_type_index()
+
+    def _read_entry(self, file: Path, identity: tuple) -> dict:
+        entry = {'identity': identity, 'preset_type': None, 'name': None, 'data': None, 'fingerprint': None}
+        preset_dict = _read_preset_dict(file)
+        preset_type = _get_preset_type(preset_dict, file)
+        if preset_type is None or preset_type not in PRESET_TYPES:
+            return entry
+
+        # -- Create a preset once to validate the data and calculate its fingerprint
+        new_preset = create_preset(preset_dict, preset_type)
+        entry.update({'preset_type': preset_type, 'name': new_preset.name, 'data': preset_dict,
+                      'fingerprint': preset_fingerprint(new_preset)})
+        return entry
+
+    def _update_type_index(self):
+        self.by_type = dict()
+        # -- Sorted by file name, the last file wins for duplicate names like glob on Windows did
+        for file_name in sorted(self.entries):
+            entry = self.entries[file_name]
+            if entry['preset_type'] is None:
+                continue
+            self.by_type.setdefault(entry['preset_type'], dict())[entry['name']] = file_name
+
+    def names(self, preset_type: int) -> List[str]:
+        return list(self.by_type.get(preset_type, dict()).keys())
+
+    def get(self, preset_type: int, name: str) -> Optional[preset.BasePreset]:
+        """ New preset instance by preset name """
+        file_name = self.by_type.get(preset_type, dict()).get(name)
+        if file_name is None:
+            return None
+        return create_preset(self.entries[file_name]['data'], preset_type)
+
+    def presets(self, preset_type: int) -> List[preset.BasePreset]:
+        """ New preset instances of every preset file of a type """
+        return [create_preset(entry['data'], preset_type) for _, entry in sorted(self.entries.items())
+                if entry['preset_type'] == preset_type]
+
+    def fingerprint(self, preset_type: int, name: str) -> Optional[Fingerprint]:
+        file_name = self.by_type.get(preset_type, dict()).get(name)
+        if file_name is None:
+            return None
+        return self.entries[file_name]['fingerprint']
+
+
+_preset_stores: Dict[str, PresetStore] = dict()
+
+
+def get_preset_store(preset_dir: Path, refresh: bool = True) -> PresetStore:
+    """ PresetStore of a preset directory, one store is kept per directory """
+    key = str(preset_dir)
+    if key not in _preset_stores:
+        _preset_stores[key] = PresetStore(preset_dir)
+        refresh = True
+    store = _preset_stores[key]
+    if refresh:
+        store.refresh()
+    return store
+
+
+def preset_fingerprint(preset_obj: preset.BasePreset) -> Fingerprint:
+    """ Option values of a preset as used by preset comparison """
+    fingerprint = dict()
+    for key, options in preset_obj.iterate_options():
+        for option in options.options:
+            if option.value is not None:
+                fingerprint[(key, option.key)] = option.value
+    return fingerprint
+
+
+def _values_equal(a, b) -> bool:
+    """ Same as Option.__eq__ """
+    if isinstance(a, float) and isinstance(b, float):
+        return round(a, FLOAT_SETTING_NDIGITS) == round(b, FLOAT_SETTING_NDIGITS)
+    return a == b
+
+
+def matches_fingerprint(current_preset: preset.BasePreset, fingerprint: Fingerprint) -> bool:
+    """ Quick check if a preset fingerprint equals the current settings. Returns the same
+        result as comparing the presets but does not mark differences for the FrontEnd.
+    """
+    for key, options in current_preset.iterate_options():
+        if options.ignore_equal:
+            continue
+        for option in options.options:
+            if option.key in options.skip_keys or not option.exists_in_rf:
+                continue
+            if option.value is None or option.hidden:
+                continue
+            value = fingerprint.get((key, option.key))
+            if value is not None and not _values_equal(option.value, value):
+                return False
+    return True
+
+
 def load_presets_from_dir(preset_dir, preset_type: int, current_preset: Optional[preset.BasePreset]=None,
                           selected_preset_name=None):
     """ Load all Presets from a directory of a certain type
@@ -23,20 +164,18 @@ def load_presets_from_dir(preset_dir, preset_type: int, current_preset: Optional
     :param str selected_preset_name: optional currently selected preset name
     :return: Tuple[List[rf2settings.preset.BasePreset], Optional[rf2settings.preset.BasePreset]]
     """
+    store = get_preset_store(preset_dir)
     preset_ls, selected_preset = list(), None
 
-    for preset_file in preset_dir.glob('*.json'):
-        preset_obj = load_preset(preset_file, preset_type)
-        if not preset_obj:
-            continue
+    for preset_obj in store.presets(preset_type):
         if preset_obj.name == selected_preset_name:
             selected_preset = preset_obj
-        if current_preset and preset_obj and preset_obj.name != current_preset.name:
+        if current_preset and preset_obj.name != current_preset.name:
             preset_ls.append(preset_obj)
 
         # -- Make sure we read WebUi Options for Current Preset from Preset file
         #    Because these options can not be read from the rF installation.
-        if current_preset and preset_obj and preset_obj.name == current_preset.name:
+        if current_preset and preset_obj.name == current_preset.name:
             webui_opt = {k: o for k, o in preset_obj.iterate_options()
                          if o.target in (OptionsTarget.webui_session, OptionsTarget.webui_content)}
             if webui_opt:
@@ -46,42 +185,40 @@ def load_presets_from_dir(preset_dir, preset_type: int, current_preset: Optional
     return preset_ls, selected_preset
 
 
-def load_preset(file: Path, load_preset_type: int) -> Optional[preset.BasePreset]:
-    """
-
-    :param file:
-    :param load_preset_type:
-    :return: Optional[rf2settings.preset.BasePreset]
-    """
+def _read_preset_dict(file: Path) -> Optional[dict]:
     try:
         with open(file.as_posix(), 'r') as f:
-            new_preset_dict: dict = json.loads(f.read())
+            return json.loads(f.read())
     except Exception as e:
         logging.fatal('Could not load Preset from file! %s', e)
+
+
+def _get_preset_type(preset_dict: Optional[dict], file: Path) -> Optional[int]:
+    if not isinstance(preset_dict, dict):
         return
 
     # -- Get type
-    preset_type = new_preset_dict.get('preset_type', None)
+    preset_type = preset_dict.get('preset_type', None)
 
     # -- Check JSON is actually a preset file
     if preset_type is None:
         test_keys = {'desc', 'name', 'title'}
-        if test_keys.difference(new_preset_dict.keys()):
+        if test_keys.difference(preset_dict.keys()):
             logging.error('%s was not identified as valid preset file.', file.name)
             return
 
         # -- Fallback to GraphicsPreset
         preset_type = preset.PresetType.graphics
 
-    # -- Skip Presets that are not of the desired type
-    if load_preset_type is not None and load_preset_type != preset_type:
-        return
+    return preset_type
 
-    # -- Create new preset instance based on type
+
+def create_preset(preset_dict: dict, preset_type: int) -> preset.BasePreset:
+    """ Create a new preset instance of preset_type from a preset json dict """
     new_preset = PRESET_TYPES.get(preset_type)()
 
     # -- Load preset options from json
-    new_preset.from_js_dict(new_preset_dict)
+    new_preset.from_js_dict(preset_dict)
 
     # - Make sure older Preset Versions contain all fields
     for k, v in PRESET_TYPES.get(preset_type)().__dict__.items():
@@ -90,3 +227,23 @@ def load_preset(file: Path, load_preset_type: int) -> Optional[preset.BasePreset
                 setattr(new_preset, k, v)
 
     return new_preset
+
+
+def load_preset(file: Path, load_preset_type: int) -> Optional[preset.BasePreset]:
+    """
+
+    :param file:
+    :param load_preset_type:
+    :return: Optional[rf2settings.preset.BasePreset]
+    """
+    preset_dict = _read_preset_dict(file)
+    preset_type = _get_preset_type(preset_dict, file)
+    if preset_type is None:
+        return
+
+    # -- Skip Presets that are not of the desired type
+    if load_preset_type is not None and load_preset_type != preset_type:
+        return
+
+    # -- Create new preset instance based on type
+    return create_preset(preset_dict, preset_type)
@@ -1,5 +1,7 @@
 import json as JSON
 import socket
+import threading
+import time
 
 import urllib.parse as urlparse
 from urllib.parse import urlencode
@@ -93,23 +95,13 @@ class RequestResponse(object):
             return self.json().keys()
 
 
-def base_request(method, url, params=None, headers=None, data=None, json=None, timeout=None):
+def _prepare_request(url, params=None, headers=None, data=None, json=None):
+    """ Return url, headers and encoded body for a request """
     # process url
     if params:
         query = urlencode(params)
         url += "?" + query
 
-    # process if socket
-    url_parts = urlparse.urlsplit(url)
-    is_sock = socket_scheme in url_parts.scheme
-    socket_path = None
-    if is_sock:
-        # get the socket path
-        socket_path = urlparse.unquote(url_parts.netloc)
-        # fix the scheme to play well with urllib2
-        original_scheme = url_parts.scheme.replace(socket_scheme, "")
-        url = url_parts._replace(scheme=original_scheme, netloc="localhost").geturl()
-
     # default headers
     _headers = {
         "Accept": "*/*"
@@ -127,10 +119,27 @@ def base_request(method, url, params=None, headers=None, data=None, json=None, t
     # process headers
     if headers:
         _headers.update(headers)
-    
+
+    return url, _headers, bytes(data, 'UTF-8') if data else None
+
+
+def base_request(method, url, params=None, headers=None, data=None, json=None, timeout=None):
+    url, _headers, body = _prepare_request(url, params, headers, data, json)
+
+    # process if socket
+    url_parts = urlparse.urlsplit(url)
+    is_sock = socket_scheme in url_parts.scheme
+    socket_path = None
+    if is_sock:
+        # get the socket path
+        socket_path = urlparse.unquote(url_parts.netloc)
+        # fix the scheme to play well with urllib2
+        original_scheme = url_parts.scheme.replace(socket_scheme, "")
+        url = url_parts._replace(scheme=original_scheme, netloc="localhost").geturl()
+
     # get request obj
-    if data:
-        request_obj = urllib2.Request(url, data=bytes(data, 'UTF-8'), headers=_headers)
+    if body:
+        request_obj = urllib2.Request(url, data=body, headers=_headers)
     else:
         request_obj = urllib2.Request(url, headers=_headers)
 
@@ -167,3 +176,190 @@ def delete(url, params=None, headers=None, data=None, json=None, timeout=None):
 def put(url, params=None, headers=None, data=None, json=None, timeout=None):
     return base_request("PUT", url, params=params, headers=headers, data=data, json=json, timeout=timeout)
 
+
+
+# Pooled keep-alive connections
+
+
+class PoolTimeout(Exception):
+    """ No connection slot became available within the request timeout """
+    pass
+
+
+class PoolStats(object):
+    """ Request and latency counters of one host pool """
+
+    def __init__(self):
+        self.requests = 0
+        self.errors = 0
+        self.retries = 0
+        self.connections_opened = 0
+        self.connections_reused = 0
+        self.total_latency = 0.0
+        self.max_latency = 0.0
+        self.last_latency = 0.0
+
+    def add_latency(self, latency):
+        self.requests += 1
+        self.last_latency = latency
+        self.total_latency += latency
+        self.max_latency = max(self.max_latency, latency)
+
+    @property
+    def mean_latency(self):
+        return self.total_latency / self.requests if self.requests else 0.0
+
+    def to_dict(self):
+        return {'requests': self.requests, 'errors': self.errors, 'retries': self.retries,
+                'connections_opened': self.connections_opened, 'connections_reused': self.connections_reused,
+                'mean_latency': self.mean_latency, 'max_latency': self.max_latency,
+                'last_latency': self.last_latency}
+
+
+class HostPool(object):
+    """ Idle keep-alive connections to one host with a limit on concurrently used connections """
+
+    def __init__(self, host, port, max_connections, idle_timeout):
+        self.host = host
+        self.port = port
+        self.idle_timeout = idle_timeout
+        self.stats = PoolStats()
+
+        self._idle = list()
+        self._lock = threading.Lock()
+        self._slots = threading.BoundedSemaphore(max_connections)
+
+    def acquire(self, timeout=None):
+        """ Return a connection and True if it is a re-used keep-alive connection """
+        if not self._slots.acquire(timeout=timeout):
+            raise PoolTimeout(f'No free connection to {self.host}:{self.port}')
+
+        now = time.monotonic()
+        with self._lock:
+            while self._idle:
+                conn, idle_since = self._idle.pop()
+                if now - idle_since < self.idle_timeout and conn.sock is not None:
+                    try:
+                        conn.sock.settimeout(timeout)
+                    except OSError:
+                        conn.close()
+                        continue
+                    conn.timeout = timeout
+                    self.stats.connections_reused += 1
+                    return conn, True
+                conn.close()
+            self.stats.connections_opened += 1
+
+        return httplib.HTTPConnection(self.host, self.port, timeout=timeout), False
+
+    def release(self, conn, reusable):
+        if reusable:
+            with self._lock:
+                self._idle.append((conn, time.monotonic()))
+        else:
+            conn.close()
+        self._slots.release()
+
+    def close(self):
+        with self._lock:
+            for conn, _ in self._idle:
+                conn.close()
+            self._idle.clear()
+
+
+class PooledSession(object):
+    """
+    Keep-alive HTTP client returning the same RequestResponse objects as the module level functions.
+    Connections are pooled per host, a request failing on a re-used connection the server
+    already closed is retried on a fresh connection. Requests that may have reached the server
+    are only retried for idempotent methods.
+    """
+    # Errors raised if a kept-alive connection was closed by the server in between requests
+    stale_connection_errors = (httplib.RemoteDisconnected, httplib.BadStatusLine, httplib.CannotSendRequest,
+                               ConnectionResetError, ConnectionAbortedError, BrokenPipeError)
+    # Methods retried even if the request was sent before the connection failed
+    retry_methods = ('GET', 'HEAD')
+
+    def __init__(self, max_connections_per_host=4, max_retries=2, idle_timeout=30.0):
+        self.max_connections_per_host = max_connections_per_host
+        self.max_retries = max_retries
+        self.idle_timeout = idle_timeout
+
+        self._pools = dict()
+        self._lock = threading.Lock()
+
+    def _get_pool(self, host, port):
+        key = (host, port)
+        with self._lock:
+            pool = self._pools.get(key)
+            if pool is None:
+                pool = HostPool(host, port, self.max_connections_per_host, self.idle_timeout)
+                self._pools[key] = pool
+        return pool
+
+    def request(self, method, url, params=None, headers=None, data=None, json=None, timeout=None):
+        url, _headers, body = _prepare_request(url, params, headers, data, json)
+
+        url_parts = urlparse.urlsplit(url)
+        if url_parts.scheme != 'http':
+            # -- Unix sockets and https are not pooled
+            return base_request(method, url, headers=_headers, data=body.decode('UTF-8') if body else None,
+                                timeout=timeout)
+
+        _headers.setdefault("Connection", "keep-alive")
+        path = url_parts.path or '/'
+        if url_parts.query:
+            path += '?' + url_parts.query
+
+        request_obj = urllib2.Request(url, data=body, headers=_headers, method=method)
+        pool = self._get_pool(url_parts.hostname, url_parts.port or 80)
+
+        attempt = 0
+        while True:
+            start = time.perf_counter()
+            conn, reused = pool.acquire(timeout)
+            sent = False
+            try:
+                conn.request(method, path, body=body, headers=_headers)
+                sent = True
+                response = conn.getresponse()
+                response.url = url
+                result = RequestResponse(request_obj, response)
+            except self.stale_connection_errors:
+                pool.release(conn, False)
+                if reused and attempt < self.max_retries and (not sent or method in self.retry_methods):
+                    attempt += 1
+                    pool.stats.retries += 1
+                    continue
+                pool.stats.errors += 1
+                raise
+            except Exception:
+                pool.release(conn, False)
+                pool.stats.errors += 1
+                raise
+
+            pool.release(conn, not response.will_close)
+            pool.stats.add_latency(time.perf_counter() - start)
+            return result
+
+    def get(self, url, params=None, headers=None, data=None, json=None, timeout=None):
+        return self.request("GET", url, params=params, headers=headers, data=data, json=json, timeout=timeout)
+
+    def post(self, url, params=None, headers=None, data=None, json=None, timeout=None):
+        return self.request("POST", url, params=params, headers=headers, data=data, json=json, timeout=timeout)
+
+    def delete(self, url, params=None, headers=None, data=None, json=None, timeout=None):
+        return self.request("DELETE", url, params=params, headers=headers, data=data, json=json, timeout=timeout)
+
+    def put(self, url, params=None, headers=None, data=None, json=None, timeout=None):
+        return self.request("PUT", url, params=params, headers=headers, data=data, json=json, timeout=timeout)
+
+    def stats(self):
+        """ Return the counters of every host pool keyed by host:port """
+        with self._lock:
+            return {f'{host}:{port}': pool.stats.to_dict() for (host, port), pool in self._pools.items()}
+
+    def close(self):
+        with self._lock:
+            for pool in self._pools.values():
+                pool.close()
@@ -414,6 +414,7 @@ class CommandQueue:
     @classmethod
     def append(cls, command: Command):
         cls.queue.append(command)
+        RfactorConnect.wakeup.notify()
 
     @classmethod
     def reset(cls):
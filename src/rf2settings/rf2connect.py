@@ -12,6 +12,7 @@ from rf2settings.directInputKeySend import PressReleaseKey
 from rf2settings.rf2sharedmem.sharedMemoryAPI import SimInfoAPI
 from rf2settings.rfactor import RfactorPlayer
 from rf2settings.utils import rfactor_process_with_id_exists
+from rf2settings.wakeup import WakeUp
 
 CONNECTION_DEBUG = False
 
@@ -62,6 +63,7 @@ class _RfactorConnectRequestThread:
                         response_json = {'status_code': response.status_code}
 
                 response_queue.put(response_json)
+                RfactorConnect.wakeup.notify_threadsafe()
             elif r.get('method') == 'POST':
                 try:
                     response = RfactorConnect.post_request(r.get('url'), r.get('data'))
@@ -73,6 +75,7 @@ class _RfactorConnectRequestThread:
                     logging.debug('Request Thread received error response for POST request to %s %s %s',
                                   r.get('url'), response.status_code, response.text)
                 response_queue.put(response or False)  # Make sure we do not put None in the queue
+                RfactorConnect.wakeup.notify_threadsafe()
 
         logging.debug('RfactorConnect request thread exiting.')
 
@@ -112,6 +115,9 @@ class RfactorConnect:
     state = 0  # RfactorState
     get_request_time = 0.5  # float seconds timeout for get requests
 
+    # -- Keep-alive connections to the WebUi, shared by the request thread and greenlets
+    session = requests.PooledSession(max_connections_per_host=4)
+
     long_timeout = 120.0    # Maximum connection check timeout
     idle_timeout = 15.0     # Start with this time out after an active connection
     active_timeout = 1.0    # Check connection timeout while eg. loading
@@ -122,8 +128,11 @@ class RfactorConnect:
     # -- Track rF2 available state changes
     last_rfactor_live_state = False
 
-    # -- Shared memory
-    shared_memory_obj = SimInfoAPI()
+    # -- Wakes the rFactor greenlet on responses, queued commands and frontend requests
+    wakeup = WakeUp('rfactor')
+
+    # -- Shared memory, mapped on first use by shared_memory()
+    shared_memory_obj: Optional[SimInfoAPI] = None
     enable_shared_mem_check = None
     rf2_pid = None
 
@@ -136,6 +145,8 @@ class RfactorConnect:
     @staticmethod
     def stop_request_thread() -> None:
         _RfactorConnectRequestThread.stop_request_thread()
+        logging.debug('WebUi connection pool stats: %s', RfactorConnect.session.stats())
+        RfactorConnect.session.close()
 
     @classmethod
     def base_url(cls) -> str:
@@ -152,18 +163,25 @@ class RfactorConnect:
                 return True
         return False
 
+    @classmethod
+    def shared_memory(cls) -> SimInfoAPI:
+        if cls.shared_memory_obj is None:
+            cls.shared_memory_obj = SimInfoAPI()
+        return cls.shared_memory_obj
+
     @classmethod
     def _shared_memory_check(cls):
+        shared_memory = cls.shared_memory()
         # -- Check if shared Memory available
-        if not cls.shared_memory_obj.sharedMemoryVerified:
-            if cls.shared_memory_obj.isRF2running():
-                if not cls.shared_memory_obj.isSharedMemoryAvailable():
+        if not shared_memory.sharedMemoryVerified:
+            if shared_memory.isRF2running():
+                if not shared_memory.isSharedMemoryAvailable():
                     logging.info('Shared memory not available: Disabling Shared Memory Updates')
                     cls.enable_shared_mem_check = False
                     return
         # -- Shared Memory available
         else:
-            if not cls.shared_memory_obj.isRF2running():
+            if not shared_memory.isRF2running():
                 # -- Do an extra check for running rF2 processes
                 if cls._rf2_processes_detected():
                     cls.set_to_active_timeout()
@@ -208,6 +226,12 @@ class RfactorConnect:
             cls.last_connection_check = time.time()  # Update TimeOut
             _RfactorConnectRequestThread.request_queue.put({'method': 'GET', 'url': '/navigation/state'})
 
+    @classmethod
+    def next_connection_check(cls) -> float:
+        """ Seconds until check_connection will request the navigation state again """
+        timeout = min(cls.long_timeout, cls.connection_check_interval)
+        return max(0.0, cls.last_connection_check + timeout - time.time())
+
     @classmethod
     def set_state(cls, nav_state: Union[bool, dict]) -> None:
         previous_state = int(cls.state)
@@ -316,7 +340,8 @@ class RfactorConnect:
     @classmethod
     def get_request(cls, url) -> Optional[requests.RequestResponse]:
         try:
-            r = requests.get(f'{cls.base_url()}{url}', timeout=cls.get_request_time)
+            # -- urllib never applied get_request_time to http urls, content lists may take longer to respond
+            r = cls.session.get(f'{cls.base_url()}{url}')
         except Exception as e:
             if CONNECTION_DEBUG:
                 logging.debug('Error during get request: %s', e)
@@ -330,7 +355,7 @@ class RfactorConnect:
     @classmethod
     def post_request(cls, url, data=None, json=None, headers=None) -> Optional[requests.RequestResponse]:
         try:
-            r = requests.post(f'{cls.base_url()}{url}', data=data, json=json, headers=headers)
+            r = cls.session.post(f'{cls.base_url()}{url}', data=data, json=json, headers=headers)
         except Exception as exc:
             logging.error('Could not connect to rFactor 2 Web UI: %s', exc)
             return
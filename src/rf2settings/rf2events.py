@@ -27,6 +27,7 @@ class RfactorLiveEvent(RfactorBaseEvent):
     event = gevent.event.Event()
     result = gevent.event.AsyncResult()
     was_live = False
+    reported = False  # State change was forwarded to the frontend at least once
 
     @classmethod
     def set(cls, value):
@@ -58,6 +59,7 @@ class RfactorQuitEvent(RfactorBaseEvent):
     def set(cls, value):
         cls.result.set(value)
         cls.event.set()
+        RfactorConnect.wakeup.notify()
         # -- Reset async result
         cls.quit_result = gevent.event.AsyncResult()
 
@@ -143,6 +145,7 @@ class StartBenchmarkEvent(RfactorBaseEvent):
     def set(cls, value):
         cls.result.set(value)
         cls.event.set()
+        RfactorConnect.wakeup.notify()
 
 
 class RecordBenchmarkEvent(RfactorBaseEvent):
@@ -153,6 +156,7 @@ class RecordBenchmarkEvent(RfactorBaseEvent):
     def set(cls, value):
         cls.result.set(value)
         cls.event.set()
+        RfactorConnect.wakeup.notify()
 
 
 class BenchmarkProgressEvent(RfactorBaseEvent):
@@ -2,7 +2,6 @@
 import logging
 
 import eel
-import gevent
 
 from .app.app_main import CLOSE_EVENT
 from .app_settings import AppSettings
@@ -67,11 +66,18 @@ def _rfactor_greenlet_loop():
     CommandQueue.run()
 
 
+def _is_idle(rfb: RfactorBenchmark) -> bool:
+    return (CommandQueue.is_empty() and CommandQueue.current_command is None and not rfb.running
+            and RfactorConnect.state == RfactorState.unavailable and not RfactorConnect.enable_shared_mem_check)
+
+
 @capture_app_exceptions
 def rfactor_greenlet():
     logging.info('rFactor Greenlet started.')
     RfactorConnect.start_request_thread()
     rfb = RfactorBenchmark()
+    wakeup = RfactorConnect.wakeup
+    wakeup.watch(CLOSE_EVENT)
 
     while True:
         # -- App functionality
@@ -83,20 +89,33 @@ def rfactor_greenlet():
             logging.info('rFactor Greenlet received CLOSE event.')
             break
 
-        gevent.sleep(RfactorConnect.active_timeout)
+        # -- Block until a response, command or frontend request arrives.
+        #    Poll at the active timeout while commands, a benchmark or rF2 need tracking,
+        #    otherwise only wake up for the next connection check.
+        timeout = RfactorConnect.active_timeout
+        if _is_idle(rfb):
+            timeout = max(timeout, RfactorConnect.next_connection_check())
+        wakeup.wait(timeout)
 
     RfactorConnect.stop_request_thread()
+    wakeup.close()
     logging.info('rFactor Greenlet exiting')
 
 
 @capture_app_exceptions
-def rfactor_event_loop():
-    """ Will be run in main eel greenlet to be able to post events to JS frontend """
-    if RfactorLiveEvent.event.is_set():
+def rfactor_event_loop(heartbeat: bool = True):
+    """ Will be run in main eel greenlet to be able to post events to JS frontend
+
+        :param heartbeat: re-send the last live state, eg. for a reloaded frontend
+    """
+    if RfactorLiveEvent.event.is_set() or (heartbeat and RfactorLiveEvent.reported):
         is_live = RfactorLiveEvent.get_nowait()
         # -- Update rFactor live state to front end
         if is_live is not None:
             eel.rfactor_live(is_live)
+        # -- Clear so the event loop does not wake up again until the next state change
+        RfactorLiveEvent.event.clear()
+        RfactorLiveEvent.reported = True
 
     if RfactorStatusEvent.event.is_set():
         status = RfactorStatusEvent.get_nowait()
@@ -1,15 +1,28 @@
+import json
 import logging
+import os
 import re
 from datetime import datetime
 from pathlib import Path
 
+from rf2settings.globals import get_settings_dir, REPLAY_INDEX_FILE_NAME
 from rf2settings.rfactor import RfactorPlayer
-from rf2settings.utils import create_file_safe_name
+from rf2settings.utils import create_file_safe_name, atomic_write_text
 
 REPLAY_FILE_SUFFIX = ".Vcr"
 RESULT_FILE_SUFFIX = ".xml"
 RESULT_TIME_THRESHOLD = 180.0 * 4  # 60s * 4
 
+# -- Replay type by name, checked in order
+REPLAY_TYPES = (
+    (re.compile(r".*(HOT\sLAP)"), 4),  # Hot Lap
+    (re.compile(r".*(Q\d)\s.*"), 1),  # Qualy
+    (re.compile(r".*(P\d)\s.*"), 2),  # Practice
+    (re.compile(r".*(R\d)\s.*"), 3),  # Race
+    (re.compile(r".*(WU\s\d)"), 5),  # WarmUp
+)
+REPLAY_SORT_KEYS = {"name": "name", "size": "bytes", "ctime": "ctime", "date": "ctime", "type": "type"}
+
 
 def get_replay_location_from_rfactor_player(rf: RfactorPlayer) -> Path:
     if hasattr(rf.options, "game_options"):
@@ -75,12 +88,15 @@ def create_result_files_lookup(result_location: Path) -> dict[str, list[dict[Pat
 
     """
     result_files = dict()
-    for f in result_location.glob(f"*{RESULT_FILE_SUFFIX}"):
-        m_time = f.stat().st_mtime
-        timestamp_group = datetime.fromtimestamp(m_time).strftime("%Y%m%d%H")
-        if timestamp_group not in result_files:
-            result_files[timestamp_group] = list()
-        result_files[timestamp_group].append({"path": f, "m_time": m_time})
+    with os.scandir(result_location) as it:
+        for entry in it:
+            if not entry.name.lower().endswith(RESULT_FILE_SUFFIX):
+                continue
+            m_time = entry.stat().st_mtime
+            timestamp_group = datetime.fromtimestamp(m_time).strftime("%Y%m%d%H")
+            if timestamp_group not in result_files:
+                result_files[timestamp_group] = list()
+            result_files[timestamp_group].append({"path": Path(entry.path), "m_time": m_time})
 
     return result_files
 
@@ -108,50 +124,185 @@ def match_result_file_to_replay(replay_file_stats, result_files: dict[str, list[
     return result_file
 
 
-def get_replays(rf: RfactorPlayer | None = None) -> list[dict]:
-    """Return attributes of all replays as JSON ready list sorted by date"""
-    result_location, result_files = None, dict()
-    if rf is None:
-        rf = RfactorPlayer()
-        p = get_replay_location_from_rfactor_player(rf)
-        result_location = get_result_location_from_rfactor_player(rf)
-    else:
-        p = get_replay_location_from_rfactor_player(rf)
-        result_location = get_result_location_from_rfactor_player(rf)
-
-    if result_location is not None and result_location.exists():
-        result_files = create_result_files_lookup(result_location)
-
-    replays = list()
-
-    for idx, r in enumerate(p.glob(f"*{REPLAY_FILE_SUFFIX}")):
-        s = r.stat()
-
-        # Determine type by name
-        replay_type = 0
-        if re.match(r".*(HOT\sLAP)", r.stem):
-            replay_type = 4  # Hot Lap
-        elif re.match(r".*(Q\d)\s.*", r.stem):
-            replay_type = 1  # Qualy
-        elif re.match(r".*(P\d)\s.*", r.stem):
-            replay_type = 2  # Practice
-        elif re.match(r".*(R\d)\s.*", r.stem):
-            replay_type = 3  # Race
-        elif re.match(r".*(WU\s\d)", r.stem):
-            replay_type = 5  # WarmUp
-
-        result_file = match_result_file_to_replay(s, result_files)
-
-        # define Entry
-        replay = {
-            "id": idx,
-            "name": r.stem,
-            "size": f"{s.st_size / 1048576:.2f}MB",
-            "result_file": result_file,
-            "ctime": s.st_mtime,
-            "type": replay_type,
-            "date": datetime.fromtimestamp(s.st_mtime).strftime("%Y-%m-%d %H:%M"),
-        }
-        replays.append(replay)
+def get_replay_type(name: str) -> int:
+    """Determine replay type by name"""
+    for pattern, replay_type in REPLAY_TYPES:
+        if pattern.match(name):
+            return replay_type
+    return 0
+
+
+def _dir_mtime(path: Path) -> int:
+    try:
+        return os.stat(path).st_mtime_ns
+    except OSError:
+        return -1
+
+
+class ReplayIndex:
+    """Persistent index of the replays in the replay directory
 
-    return sorted(replays, key=lambda e: e["ctime"], reverse=True)
+    Replay classification and the matched result file are stored per replay file.
+    Only new or changed replay files are classified, result files are matched
+    again only if the result directory changed.
+    """
+
+    index_version = 1
+
+    def __init__(self, replay_dir: Path, result_dir: Path | None = None, index_file: Path | None = None):
+        self.replay_dir = Path(replay_dir)
+        self.result_dir = result_dir
+        self.index_file = index_file or get_settings_dir() / REPLAY_INDEX_FILE_NAME
+        self.entries: dict[str, dict] = dict()
+        self.result_dir_mtime = -1
+        self.indexed = 0  # Number of replays classified during the last update
+        self._loaded = False
+
+    def load(self):
+        self._loaded = True
+        if not self.index_file.exists():
+            return
+        try:
+            with open(self.index_file, "r") as f:
+                data = json.loads(f.read())
+        except Exception as e:
+            logging.error("Could not read replay index, rebuilding it: %s", e)
+            return
+
+        if data.get("version") != self.index_version or data.get("replay_dir") != str(self.replay_dir) \
+                or data.get("result_dir") != str(self.result_dir):
+            return
+        self.entries = data.get("replays", dict())
+        self.result_dir_mtime = data.get("result_dir_mtime", -1)
+
+    def save(self):
+        data = {
+            "version": self.index_version,
+            "replay_dir": str(self.replay_dir),
+            "result_dir": str(self.result_dir),
+            "result_dir_mtime": self.result_dir_mtime,
+            "replays": self.entries,
+        }
+        try:
+            atomic_write_text(self.index_file, json.dumps(data))
+        except Exception as e:
+            logging.error("Could not save replay index: %s", e)
+
+    def _scan(self) -> dict[str, os.stat_result]:
+        replays = dict()
+        if not self.replay_dir.exists():
+            return replays
+        with os.scandir(self.replay_dir) as it:
+            for entry in it:
+                if entry.name.lower().endswith(REPLAY_FILE_SUFFIX.lower()):
+                    replays[entry.name] = entry.stat()
+        return replays
+
+    def update(self) -> bool:
+        """Add new or changed replays, drop removed ones and update result matches. Returns True on changes."""
+        if not self._loaded:
+            self.load()
+
+        replays = self._scan()
+        changed, self.indexed = False, 0
+
+        for name in set(self.entries) - set(replays):
+            self.entries.pop(name)
+            changed = True
+
+        # -- Result files are only looked up again if the result directory changed
+        result_files = None
+        result_dir_mtime = _dir_mtime(self.result_dir) if self.result_dir is not None else -1
+        rematch = result_dir_mtime != self.result_dir_mtime
+
+        for name, s in replays.items():
+            identity = [s.st_size, s.st_mtime_ns]
+            entry = self.entries.get(name)
+            if entry and entry["identity"] == identity and not rematch:
+                continue
+
+            if result_files is None:
+                result_files = self._result_files_lookup()
+
+            if not entry or entry["identity"] != identity:
+                stem = name[: -len(REPLAY_FILE_SUFFIX)]
+                entry = {
+                    "identity": identity,
+                    "name": stem,
+                    "bytes": s.st_size,
+                    "ctime": s.st_mtime,
+                    "type": get_replay_type(stem),
+                    "date": datetime.fromtimestamp(s.st_mtime).strftime("%Y-%m-%d %H:%M"),
+                }
+                self.indexed += 1
+
+            result_file = match_result_file_to_replay(s, result_files)
+            if self.entries.get(name) is not entry or entry.get("result_file") != result_file:
+                entry["result_file"] = result_file
+                self.entries[name] = entry
+                changed = True
+
+        if rematch:
+            self.result_dir_mtime = result_dir_mtime
+            changed = True
+
+        if changed:
+            self.save()
+        return changed
+
+    def _result_files_lookup(self) -> dict:
+        if self.result_dir is None or not self.result_dir.exists():
+            return dict()
+        return create_result_files_lookup(self.result_dir)
+
+    def replays(self, offset: int = 0, limit: int = 0, sort_key: str = "ctime", descending: bool = True
+                ) -> tuple[list[dict], int]:
+        """Page of replay entries sorted by sort_key and the total number of replays
+
+        :param offset: index of the first replay of the page
+        :param limit: max number of replays per page, 0 returns all replays
+        :param sort_key: one of name, size, ctime, date or type
+        :param descending: sort order
+        """
+        key = REPLAY_SORT_KEYS.get(sort_key, "ctime")
+        entries = sorted(self.entries.values(), key=lambda e: e[key], reverse=descending)
+        total = len(entries)
+        entries = entries[offset: offset + limit] if limit else entries[offset:]
+
+        return [
+            {
+                "id": offset + idx,
+                "name": e["name"],
+                "size": f"{e['bytes'] / 1048576:.2f}MB",
+                "result_file": e["result_file"],
+                "ctime": e["ctime"],
+                "type": e["type"],
+                "date": e["date"],
+            }
+            for idx, e in enumerate(entries)
+        ], total
+
+
+_replay_index: ReplayIndex | None = None
+
+
+def get_replay_index(rf: RfactorPlayer | None = None) -> ReplayIndex:
+    """Updated replay index of the current replay directory"""
+    global _replay_index
+    rf = rf or RfactorPlayer()
+    replay_dir = get_replay_location_from_rfactor_player(rf)
+    result_dir = get_result_location_from_rfactor_player(rf)
+
+    if _replay_index is None or _replay_index.replay_dir != replay_dir or _replay_index.result_dir != result_dir:
+        _replay_index = ReplayIndex(replay_dir, result_dir)
+
+    _replay_index.update()
+    logging.debug("Indexed %s new or changed replays", _replay_index.indexed)
+    return _replay_index
+
+
+def get_replays(rf: RfactorPlayer | None = None, offset: int = 0, limit: int = 0, sort_key: str = "ctime",
+                descending: bool = True) -> list[dict]:
+    """Return attributes of replays as JSON ready list, by default all replays sorted by date"""
+    replays, _ = get_replay_index(rf).replays(offset, limit, sort_key, descending)
+    return replays
@@ -1,6 +1,7 @@
 import re
 from pathlib import Path
 import statistics
+from typing import Dict, Optional, Tuple
 
 from lxml import etree
 
@@ -25,6 +26,15 @@ def get_text_from_element(element: etree._Element | etree._ElementTree, tag: str
     return sub_element.text
 
 
+def _is_element_path(element: Optional[etree._Element], tags: Tuple[str, ...]) -> bool:
+    """ Check that element and its ancestors have the tags, eg. ('Race', 'RaceResults'), directly below the root """
+    for tag in tags:
+        if element is None or element.tag != tag:
+            return False
+        element = element.getparent()
+    return element is not None and element.getparent() is None
+
+
 class ResultsJsonRepr(JsonRepr):
     def to_js_object(self, export: bool = False) -> dict:
         js_dict = super().to_js_object()
@@ -196,6 +206,12 @@ class ResultStreamEntry(ResultsJsonRepr):
 
 
 class RfactorResults(ResultsJsonRepr):
+    read_chunk_size = 64 * 1024
+
+    # -- Results of recently read files: {path: ((size, mtime_ns), RfactorResults)} least recently used first
+    _cache: Dict[str, Tuple[Tuple[int, int], "RfactorResults"]] = dict()
+    cache_size = 8
+
     def __init__(self, file: Path = None):
         self.entries = list()
         self.drivers = list()
@@ -205,28 +221,76 @@ class RfactorResults(ResultsJsonRepr):
 
         self._read_result_file(file)
 
+    @classmethod
+    def from_file(cls, file: Path) -> "RfactorResults":
+        """ Results of a result file, the file is only parsed again if its size or modification time changed """
+        stat = file.stat()
+        key, identity = str(file), (stat.st_size, stat.st_mtime_ns)
+
+        cached = cls._cache.pop(key, None)
+        if cached is not None and cached[0] == identity:
+            results = cached[1]
+        else:
+            results = cls(file)
+
+        # -- Re-insert as most recently used and drop the least recently used results
+        cls._cache[key] = (identity, results)
+        while len(cls._cache) > cls.cache_size:
+            cls._cache.pop(next(iter(cls._cache)))
+
+        return results
+
     def _read_result_file(self, file: Path):
         if file is None or not file.is_file():
             return
 
         self.file_name = file.name
 
+        # -- Stream the file thru a pull parser and drop every element once it has been read,
+        #    so long races with big incident streams never need to be held in memory as a whole.
+        parser = etree.XMLPullParser(events=("end",))
         with open(file, "r") as f:
-            et: etree._ElementTree = etree.parse(f)
-
-        self.racelaps = int(get_text_from_element(et, "RaceResults/RaceLaps", "0"))
-        self.racetime = int(get_text_from_element(et, "RaceResults/RaceTime", "0"))
+            while True:
+                data = f.read(self.read_chunk_size)
+                if not data:
+                    break
+                parser.feed(data)
+                for _, element in parser.read_events():
+                    self._read_element(element)
+        parser.close()
+        for _, element in parser.read_events():
+            self._read_element(element)
 
-        for idx, element in enumerate(et.iterfind(".//Driver")):
-            self.drivers.append(ResultsDriverEntry(element))
         self._create_global_data()
 
-        stream_element = et.find("RaceResults/Race/Stream")
-        stream_element = stream_element if stream_element is not None else []
+    def _read_element(self, element: etree._Element):
+        parent = element.getparent()
+        if parent is None:
+            return
 
-        for element in stream_element:
-            if element.tag in ResultStreamEntry.SUPPORTED_TYPES:
+        if element.tag == "Driver":
+            self.drivers.append(ResultsDriverEntry(element))
+            self._release_element(element)
+        elif parent.tag == "Stream":
+            # -- Only Incidents of the Race session are reported, every other stream entry is dropped
+            race = parent.getparent()
+            if element.tag in ResultStreamEntry.SUPPORTED_TYPES and _is_element_path(race, ("Race", "RaceResults")):
                 self.entries.append(ResultStreamEntry(element))
+            self._release_element(element)
+        elif parent.tag == "RaceResults" and parent.getparent() is not None \
+                and parent.getparent().getparent() is None:
+            if element.tag == "RaceLaps":
+                self.racelaps = int(element.text or "0")
+            elif element.tag == "RaceTime":
+                self.racetime = int(element.text or "0")
+
+    @staticmethod
+    def _release_element(element: etree._Element):
+        """ Clear a processed element and remove already processed siblings before it """
+        element.clear()
+        parent = element.getparent()
+        while element.getprevious() is not None:
+            del parent[0]
 
     def _create_global_data(self):
         lead_times = dict()
@@ -0,0 +1,75 @@
+"""
+Memory mapping backends for the rF2 Shared Memory buffers.
+
+rF2 and its Shared Memory plugin use named Windows mappings like
+"$rFactor2SMMP_Telemetry$". FileMmapBackend maps regular files of the same
+layout instead, so the shared memory consumers can run against buffers written
+by rf2sharedmem.writer on any platform.
+
+Setting the RF2_SHARED_MEMORY_DIR environment variable to a directory makes
+file backed buffers in that directory the default.
+"""
+import abc
+import mmap
+import os
+import re
+import sys
+import tempfile
+from pathlib import Path
+from typing import Optional
+
+SHARED_MEMORY_DIR_ENV = 'RF2_SHARED_MEMORY_DIR'
+
+
+class SharedMemoryBackend(abc.ABC):
+    """ Opens a mapped buffer by its rF2 Shared Memory name """
+    @abc.abstractmethod
+    def open(self, name: str, size: int) -> mmap.mmap:
+        ...
+
+
+class TaggedMmapBackend(SharedMemoryBackend):
+    """ Named Windows mappings as created by the rF2 Shared Memory plugin """
+    def open(self, name: str, size: int) -> mmap.mmap:
+        return mmap.mmap(0, size, name)
+
+
+class FileMmapBackend(SharedMemoryBackend):
+    """ Files in a directory, one per buffer, as stand-in for the Windows mappings """
+    def __init__(self, directory: Path):
+        self.directory = Path(directory)
+
+    def file(self, name: str) -> Path:
+        # -- "$rFactor2SMMP_Telemetry$" => "rFactor2SMMP_Telemetry.bin"
+        return self.directory / (re.sub(r'[^\w\-.]', '', name) + '.bin')
+
+    def open(self, name: str, size: int) -> mmap.mmap:
+        self.directory.mkdir(parents=True, exist_ok=True)
+        file = self.file(name)
+
+        with open(file, 'a+b') as f:
+            if os.fstat(f.fileno()).st_size < size:
+                f.truncate(size)
+            # -- The mapping keeps its own handle, the file can be closed
+            return mmap.mmap(f.fileno(), size)
+
+
+_default_backend: Optional[SharedMemoryBackend] = None
+
+
+def set_default_backend(backend: Optional[SharedMemoryBackend]):
+    """ Backend used by SimInfo instances created without an explicit backend, None restores the default """
+    global _default_backend
+    _default_backend = backend
+
+
+def get_default_backend() -> SharedMemoryBackend:
+    if _default_backend is not None:
+        return _default_backend
+
+    directory = os.environ.get(SHARED_MEMORY_DIR_ENV)
+    if directory:
+        return FileMmapBackend(Path(directory))
+    if sys.platform == 'win32':
+        return TaggedMmapBackend()
+    return FileMmapBackend(Path(tempfile.gettempdir()) / 'rf2_shared_memory')
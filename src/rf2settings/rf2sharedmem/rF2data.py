@@ -5,9 +5,13 @@ Auto-generated from rF2data.cs
 # pylint: disable=C,R,W
 
 import ctypes
-import mmap
 from enum import IntEnum, Enum
 
+try:
+    from .backend import SharedMemoryBackend, get_default_backend
+except ImportError:  # standalone, not package
+    from backend import SharedMemoryBackend, get_default_backend
+
 
 class rFactor2Constants:
     MAX_MAPPED_VEHICLES = 128
@@ -814,13 +818,14 @@ class SubscribedBuffer(Enum):
 
 
 class SimInfo:
-    def __init__(self):
+    def __init__(self, backend: SharedMemoryBackend = None):
+        backend = backend or get_default_backend()
 
-        self._rf2_tele = mmap.mmap(0, ctypes.sizeof(rF2Telemetry), "$rFactor2SMMP_Telemetry$")
+        self._rf2_tele = backend.open("$rFactor2SMMP_Telemetry$", ctypes.sizeof(rF2Telemetry))
         self.Rf2Tele = rF2Telemetry.from_buffer(self._rf2_tele)
-        self._rf2_scor = mmap.mmap(0, ctypes.sizeof(rF2Scoring), "$rFactor2SMMP_Scoring$")
+        self._rf2_scor = backend.open("$rFactor2SMMP_Scoring$", ctypes.sizeof(rF2Scoring))
         self.Rf2Scor = rF2Scoring.from_buffer(self._rf2_scor)
-        self._rf2_ext = mmap.mmap(0, ctypes.sizeof(rF2Extended), "$rFactor2SMMP_Extended$")
+        self._rf2_ext = backend.open("$rFactor2SMMP_Extended$", ctypes.sizeof(rF2Extended))
         self.Rf2Ext = rF2Extended.from_buffer(self._rf2_ext)
 
     def close(self):
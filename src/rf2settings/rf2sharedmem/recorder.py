@@ -0,0 +1,252 @@
+"""
+Record and replay rF2 Telemetry, Scoring and Extended frames.
+
+FrameRecorder copies every changed buffer of a SimSnapshot into one preallocated
+ring buffer; the oldest frames are overwritten once it is full. Only the used part
+of the Telemetry and Scoring buffers, header and active vehicles, is stored.
+
+Recordings are saved as a sequence of zlib compressed records. Every record is
+XORed with the previous frame of the same buffer, so unchanged bytes become zeros
+and compress well. A full keyframe is stored at regular intervals.
+
+RecordingPlayer writes a recording back into rF2 structures, following the
+mVersionUpdateBegin/End protocol of the rF2 Shared Memory plugin, at original or
+accelerated speed. It waits with gevent.sleep so it can run in a greenlet.
+"""
+import ctypes
+import logging
+import struct
+import time
+import zlib
+from collections import deque
+from pathlib import Path
+from typing import Callable, Deque, Iterator, NamedTuple, Optional, Tuple, Union
+
+import gevent
+
+try:
+    from . import rF2data
+    from .snapshot import SimSnapshot
+except ImportError:  # standalone, not package
+    import rF2data
+    from snapshot import SimSnapshot
+
+KIND_TELEMETRY, KIND_SCORING, KIND_EXTENDED = 0, 1, 2
+STRUCT_TYPES = (rF2data.rF2Telemetry, rF2data.rF2Scoring, rF2data.rF2Extended)
+# -- mVersionUpdateBegin and mVersionUpdateEnd at the start of every buffer
+VERSION_COUNTERS_SIZE = ctypes.sizeof(rF2data.rF2MappedBufferVersionBlock)
+
+MAGIC = b'RF2REC'
+FORMAT_VERSION = 1
+FLAG_KEYFRAME = 1
+# -- magic, format version, size of the Telemetry, Scoring and Extended structures
+FILE_HEADER = struct.Struct('<6sHIII')
+# -- kind, flags, seconds since the start of the recording, frame size, payload size
+RECORD_HEADER = struct.Struct('<BBdII')
+
+
+class RecordedFrame(NamedTuple):
+    timestamp: float
+    kind: int
+    data: Union[bytes, memoryview]
+
+
+def used_size(kind: int, data: ctypes.Structure) -> int:
+    """ Number of bytes of a buffer holding information: header and active vehicles """
+    max_vehicles = rF2data.rFactor2Constants.MAX_MAPPED_VEHICLES
+    if kind == KIND_TELEMETRY:
+        num_vehicles = min(max(0, data.mNumVehicles), max_vehicles)
+        return rF2data.rF2Telemetry.mVehicles.offset + num_vehicles * ctypes.sizeof(rF2data.rF2VehicleTelemetry)
+    if kind == KIND_SCORING:
+        num_vehicles = min(max(0, data.mScoringInfo.mNumVehicles), max_vehicles)
+        return rF2data.rF2Scoring.mVehicles.offset + num_vehicles * ctypes.sizeof(rF2data.rF2VehicleScoring)
+    return ctypes.sizeof(STRUCT_TYPES[kind])
+
+
+def _xor(data: bytes, previous: bytes) -> bytes:
+    size = len(data)
+    previous = previous[:size].ljust(size, b'\0')
+    return (int.from_bytes(data, 'little') ^ int.from_bytes(previous, 'little')).to_bytes(size, 'little')
+
+
+class FrameRecorder:
+    def __init__(self, capacity: int = 64 * 1024 * 1024):
+        """ Preallocated ring buffer of rF2 buffer frames
+
+            :param capacity: size of the ring buffer in bytes
+        """
+        self.capacity = capacity
+        self._buffer = bytearray(capacity)
+        self._view = memoryview(self._buffer)
+        self._c_buffer = (ctypes.c_char * capacity).from_buffer(self._buffer)
+        self._address = ctypes.addressof(self._c_buffer)
+        self._records: Deque[Tuple[int, int, int, float]] = deque()  # offset, size, kind, timestamp
+        self._position = 0
+        self._versions = [None, None, None]
+
+        self.start_time: Optional[float] = None
+        self.recorded = 0   # Frames recorded
+        self.evicted = 0    # Frames overwritten by newer frames
+
+    def __len__(self):
+        return len(self._records)
+
+    @property
+    def duration(self) -> float:
+        return self._records[-1][3] - self._records[0][3] if self._records else 0.0
+
+    def record(self, snapshot: SimSnapshot) -> int:
+        """ Copy the buffers of a snapshot that changed since the last call. Returns the number of frames recorded. """
+        timestamp = snapshot.timestamp
+        if self.start_time is None:
+            self.start_time = timestamp
+
+        recorded = 0
+        for kind, (version, data) in enumerate(zip(snapshot.versions, (
+                snapshot.telemetry, snapshot.scoring, snapshot.extended))):
+            if version is None or version == self._versions[kind]:
+                continue
+            self._versions[kind] = version
+            if self._append(kind, ctypes.addressof(data), used_size(kind, data), timestamp - self.start_time):
+                recorded += 1
+        return recorded
+
+    def _append(self, kind: int, address: int, size: int, timestamp: float) -> bool:
+        if size > self.capacity:
+            logging.error('Frame of %s bytes does not fit into recorder of %s bytes', size, self.capacity)
+            return False
+
+        position = self._position
+        if position + size > self.capacity:
+            # -- Wrap around, frames behind the current position are the oldest
+            while self._records and self._records[0][0] >= position:
+                self._records.popleft()
+                self.evicted += 1
+            position = 0
+
+        end = position + size
+        while self._records and self._records[0][0] < end and self._records[0][0] >= position:
+            self._records.popleft()
+            self.evicted += 1
+
+        ctypes.memmove(self._address + position, address, size)
+        self._records.append((position, size, kind, timestamp))
+        self._position = end
+        self.recorded += 1
+        return True
+
+    def frames(self) -> Iterator[RecordedFrame]:
+        """ Recorded frames, oldest first. The data views are only valid until the next record call. """
+        for offset, size, kind, timestamp in self._records:
+            yield RecordedFrame(timestamp, kind, self._view[offset:offset + size])
+
+    def clear(self):
+        self._records.clear()
+        self._position = 0
+        self._versions = [None, None, None]
+        self.start_time = None
+
+    def save(self, file: Path, keyframe_interval: int = 50, compress_level: int = 6) -> int:
+        """ Write the recorded frames delta-encoded to file. Returns the number of bytes written. """
+        previous: list = [None, None, None]
+        since_keyframe = [0, 0, 0]
+        written = 0
+
+        with open(file, 'wb') as f:
+            written += f.write(FILE_HEADER.pack(MAGIC, FORMAT_VERSION, *(ctypes.sizeof(s) for s in STRUCT_TYPES)))
+            for timestamp, kind, view in self.frames():
+                data = bytes(view)
+                if previous[kind] is None or since_keyframe[kind] >= keyframe_interval:
+                    flags, payload = FLAG_KEYFRAME, data
+                    since_keyframe[kind] = 0
+                else:
+                    flags, payload = 0, _xor(data, previous[kind])
+                    since_keyframe[kind] += 1
+
+                payload = zlib.compress(payload, compress_level)
+                written += f.write(RECORD_HEADER.pack(kind, flags, timestamp, len(data), len(payload)))
+                written += f.write(payload)
+                previous[kind] = data
+
+        return written
+
+
+class RecordingReader:
+    def __init__(self, file: Path):
+        self.file = Path(file)
+
+    def __iter__(self) -> Iterator[RecordedFrame]:
+        previous: list = [None, None, None]
+        with open(self.file, 'rb') as f:
+            magic, version, *sizes = FILE_HEADER.unpack(f.read(FILE_HEADER.size))
+            if magic != MAGIC or version != FORMAT_VERSION:
+                raise ValueError(f'{self.file.name} is not a supported rF2 recording')
+            if sizes != [ctypes.sizeof(s) for s in STRUCT_TYPES]:
+                raise ValueError(f'{self.file.name} was recorded with different rF2 Shared Memory structures')
+
+            while header := f.read(RECORD_HEADER.size):
+                if len(header) < RECORD_HEADER.size:
+                    logging.warning('Recording %s ends with an incomplete record', self.file.name)
+                    return
+                kind, flags, timestamp, size, payload_size = RECORD_HEADER.unpack(header)
+                data = zlib.decompress(f.read(payload_size))
+                if not flags & FLAG_KEYFRAME:
+                    data = _xor(data, previous[kind])
+                if len(data) != size:
+                    raise ValueError(f'Corrupt frame in recording {self.file.name}')
+
+                previous[kind] = data
+                yield RecordedFrame(timestamp, kind, data)
+
+
+class RecordingPlayer:
+    """ Replays a recording into Rf2Tele, Rf2Scor and Rf2Ext structures, like the ones of rF2data.SimInfo,
+        so a SimSnapshot can read from it.
+    """
+    def __init__(self, file: Path, speed: float = 1.0):
+        """
+            :param speed: playback speed multiplier, 0 replays as fast as possible
+        """
+        self.reader = RecordingReader(file)
+        self.speed = speed
+        self.Rf2Tele = rF2data.rF2Telemetry()
+        self.Rf2Scor = rF2data.rF2Scoring()
+        self.Rf2Ext = rF2data.rF2Extended()
+        self.frames_played = 0
+        self._stop = False
+
+    def stop(self):
+        self._stop = True
+
+    def _apply(self, frame: RecordedFrame):
+        target = (self.Rf2Tele, self.Rf2Scor, self.Rf2Ext)[frame.kind]
+        target.mVersionUpdateBegin += 1
+
+        # -- Copy everything but the recorded version counters
+        counters_size = VERSION_COUNTERS_SIZE
+        ctypes.memmove(ctypes.addressof(target) + counters_size, bytes(frame.data[counters_size:]),
+                       len(frame.data) - counters_size)
+        if frame.kind != KIND_EXTENDED:
+            target.mBytesUpdatedHint = len(frame.data)
+
+        target.mVersionUpdateEnd = target.mVersionUpdateBegin
+
+    def play(self, on_frame: Optional[Callable[[RecordedFrame], None]] = None) -> int:
+        """ Replay all frames, waiting between them according to their timestamps and the speed. """
+        self._stop, start = False, time.perf_counter()
+        for frame in self.reader:
+            if self._stop:
+                break
+            if self.speed > 0:
+                delay = frame.timestamp / self.speed - (time.perf_counter() - start)
+                if delay > 0:
+                    gevent.sleep(delay)
+            elif self.frames_played % 64 == 0:
+                # -- Let other greenlets run while replaying as fast as possible
+                gevent.sleep(0)
+
+            self._apply(frame)
+            self.frames_played += 1
+            if on_frame is not None:
+                on_frame(frame)
+        return self.frames_played
@@ -4,12 +4,18 @@ and add access functions to it.
 """
 # pylint: disable=invalid-name
 
+from typing import Optional
+
 import psutil
 
 try:
     from . import rF2data
+    from .snapshot import SimSnapshot
+    from .recorder import FrameRecorder
 except ImportError:  # standalone, not package
     import rF2data
+    from snapshot import SimSnapshot
+    from recorder import FrameRecorder
 
 
 class SimInfoAPI(rF2data.SimInfo):
@@ -26,8 +32,10 @@ class SimInfoAPI(rF2data.SimInfo):
     rf2_pid_counter = 0     # Counter to check if running
     rf2_running = False
 
-    def __init__(self):
-        rF2data.SimInfo.__init__(self)
+    def __init__(self, backend: Optional[rF2data.SharedMemoryBackend] = None):
+        rF2data.SimInfo.__init__(self, backend)
+        self._snapshot = SimSnapshot(self)
+        self.recorder: Optional[FrameRecorder] = None
         self.versionCheckMsg = self.versionCheck()
         self.__find_rf2_pid()
 
@@ -192,6 +200,25 @@ class SimInfoAPI(rF2data.SimInfo):
         self.__playersDriverNum()
         return self.Rf2Scor.mVehicles[self.__playersDriverNum()]
 
+    def snapshot(self):
+        """
+        Update and return a consistent copy of the Telemetry, Scoring and
+        Extended buffers. The returned object is reused between calls.
+        """
+        self._snapshot.update()
+        if self.recorder is not None:
+            self.recorder.record(self._snapshot)
+        return self._snapshot
+
+    def start_recording(self, capacity: int = 64 * 1024 * 1024) -> FrameRecorder:
+        """ Record every frame seen by snapshot() into a ring buffer of capacity bytes """
+        self.recorder = FrameRecorder(capacity)
+        return self.recorder
+
+    def stop_recording(self) -> Optional[FrameRecorder]:
+        recorder, self.recorder = self.recorder, None
+        return recorder
+
     def vehicleName(self):
         """
         Get the vehicle's name
@@ -0,0 +1,170 @@
+"""
+Torn-read-safe copies of the rF2 Shared Memory buffers.
+
+The rF2 Shared Memory plugin increments mVersionUpdateBegin right before it writes
+to a buffer and mVersionUpdateEnd right after the write is done. A copy is only
+accepted if no write was in progress when we started and none started while we were copying.
+Copies go into two preallocated ctypes structures, the one being copied to only becomes the
+published copy once the copy was accepted, so reading a frame does not allocate.
+"""
+import ctypes
+import logging
+import time
+from typing import Optional
+
+import gevent
+
+try:
+    from . import rF2data
+except ImportError:  # standalone, not package
+    import rF2data
+
+
+class BufferCopy:
+    """ Preallocated, version checked copy of one mapped rF2 buffer """
+    def __init__(self, struct_type, source: ctypes.Structure):
+        self.struct_type = struct_type
+        self.source = source
+        self.data = struct_type()
+        self._back = struct_type()  # Copy target, swapped with data once a copy was accepted
+        self.size = ctypes.sizeof(struct_type)
+
+        # -- Telemetry and Scoring report how many bytes were written during the last update,
+        #    no need to copy the unused vehicle slots in that case.
+        self.uses_hint = hasattr(struct_type, 'mBytesUpdatedHint')
+        self.header_size = struct_type.mBytesUpdatedHint.offset + ctypes.sizeof(ctypes.c_int) \
+            if self.uses_hint else 0
+
+        self._dst = ctypes.addressof(self._back)
+        self._src = ctypes.addressof(source)
+
+        self.version: Optional[int] = None  # mVersionUpdateEnd of the last good copy
+        self.copies = 0
+        self.torn_reads = 0
+
+    def copy_size(self) -> int:
+        if not self.uses_hint:
+            return self.size
+        hint = self.source.mBytesUpdatedHint
+        if hint <= self.header_size or hint > self.size:
+            return self.size
+        return hint
+
+    def read(self, force: bool = False) -> bool:
+        """ Copy the live buffer if it changed since the last good copy.
+
+            :param force: copy even if the version counter did not change
+            :return: False if the writer was busy or the copy was torn, the previous copy stays published then
+        """
+        begin = self.source.mVersionUpdateBegin
+        if begin != self.source.mVersionUpdateEnd:
+            # -- Writer busy
+            return False
+        if begin == self.version and not force:
+            return True
+
+        ctypes.memmove(self._dst, self._src, self.copy_size())
+
+        if self.source.mVersionUpdateBegin != begin:
+            # -- Writer started while we were copying
+            self.torn_reads += 1
+            return False
+
+        # -- Publish the copy, the previous one becomes the next copy target
+        self.data, self._back = self._back, self.data
+        self._dst = ctypes.addressof(self._back)
+        self.version = begin
+        self.copies += 1
+        return True
+
+
+class SimSnapshot:
+    """ One coherent frame of the rF2 Telemetry, Scoring and Extended buffers.
+
+        Wraps the live structures of a rF2data.SimInfo instance. Call update() to refresh
+        the copies; the structures returned by telemetry, scoring and extended
+        alternate between two preallocated copies and must not be kept across
+        updates if the values of a specific frame are needed.
+    """
+    max_retries = 12     # Attempts per buffer before giving up on this update
+    spin_retries = 3     # Attempts retried immediately before backing off
+    backoff_start = 0.0002
+    backoff_max = 0.004
+
+    def __init__(self, sim_info: rF2data.SimInfo):
+        self._telemetry = BufferCopy(rF2data.rF2Telemetry, sim_info.Rf2Tele)
+        self._scoring = BufferCopy(rF2data.rF2Scoring, sim_info.Rf2Scor)
+        self._extended = BufferCopy(rF2data.rF2Extended, sim_info.Rf2Ext)
+        self._buffers = (self._telemetry, self._scoring, self._extended)
+
+        self.frame = 0           # Incremented whenever a buffer changed
+        self.timestamp = 0.0     # time.perf_counter() of the last successful update
+        self.stale = True        # Last update could not copy every buffer consistently
+        self.player_index = 0
+
+    @property
+    def telemetry(self) -> rF2data.rF2Telemetry:
+        return self._telemetry.data
+
+    @property
+    def scoring(self) -> rF2data.rF2Scoring:
+        return self._scoring.data
+
+    @property
+    def extended(self) -> rF2data.rF2Extended:
+        return self._extended.data
+
+    @property
+    def versions(self) -> tuple:
+        """ mVersionUpdateEnd of the Telemetry, Scoring and Extended copies, None if not copied yet """
+        return tuple(b.version for b in self._buffers)
+
+    @property
+    def torn_reads(self) -> int:
+        return sum(b.torn_reads for b in self._buffers)
+
+    @property
+    def num_vehicles(self) -> int:
+        return min(max(0, self.scoring.mScoringInfo.mNumVehicles), rF2data.rFactor2Constants.MAX_MAPPED_VEHICLES)
+
+    def _read_buffer(self, buffer: BufferCopy, force: bool) -> bool:
+        backoff = self.backoff_start
+        for attempt in range(self.max_retries):
+            if buffer.read(force):
+                return True
+            if attempt >= self.spin_retries:
+                gevent.sleep(backoff)
+                backoff = min(backoff * 2, self.backoff_max)
+        return False
+
+    def update(self, force: bool = False) -> bool:
+        """ Refresh all buffers. Returns False if at least one buffer could not be copied
+            consistently, the previous copy of that buffer stays in place.
+        """
+        versions = self.versions
+        consistent = True
+        for buffer in self._buffers:
+            if not self._read_buffer(buffer, force):
+                logging.debug('Could not take a consistent copy of %s', buffer.struct_type.__name__)
+                consistent = False
+
+        if versions != self.versions:
+            self.frame += 1
+            self.player_index = self._find_player_index()
+        if consistent:
+            self.timestamp = time.perf_counter()
+        self.stale = not consistent
+        return consistent
+
+    def _find_player_index(self) -> int:
+        vehicles = self.scoring.mVehicles
+        for idx in range(self.num_vehicles):
+            if vehicles[idx].mIsPlayer:
+                return idx
+        return 0
+
+    def player_telemetry(self) -> rF2data.rF2VehicleTelemetry:
+        return self.telemetry.mVehicles[self.player_index]
+
+    def player_scoring(self) -> rF2data.rF2VehicleScoring:
+        return self.scoring.mVehicles[self.player_index]
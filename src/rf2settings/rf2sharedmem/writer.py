@@ -0,0 +1,228 @@
+"""
+Write realistic rF2 Shared Memory buffers, as a stand-in for rF2 and its Shared Memory plugin.
+
+Buffers are written through a SharedMemoryBackend, usually a FileMmapBackend, with
+the same mVersionUpdateBegin/End protocol as the plugin: Telemetry every frame and
+Scoring at a lower rate, for up to 128 vehicles. Readers in other processes or threads
+can map the same files, which makes reading paths measurable on any platform:
+
+    python -m rf2settings.rf2sharedmem.writer --dir /tmp/rf2_shm --rate 90
+    python -m rf2settings.rf2sharedmem.writer --dir /tmp/rf2_shm --benchmark 2000
+"""
+import argparse
+import ctypes
+import math
+import threading
+import time
+from pathlib import Path
+from typing import Optional
+
+try:
+    from . import rF2data
+    from .backend import SharedMemoryBackend, FileMmapBackend
+    from .snapshot import SimSnapshot
+except ImportError:  # standalone, not package
+    import rF2data
+    from backend import SharedMemoryBackend, FileMmapBackend
+    from snapshot import SimSnapshot
+
+TRACK_LENGTH = 5800.0
+
+
+def _set_string(field, value: str):
+    data = value.encode('utf-8')[:len(field) - 1]
+    ctypes.memmove(field, data + b'\0', len(data) + 1)
+
+
+class SharedMemoryWriter:
+    scoring_interval = 18   # Telemetry frames per Scoring update, 90Hz vs. 5Hz in rF2
+
+    def __init__(self, backend: Optional[SharedMemoryBackend] = None, num_vehicles: int = 128,
+                 version: str = '3.7.15.1', track: str = 'Loch Drummond'):
+        self.info = rF2data.SimInfo(backend)
+        self.num_vehicles = min(num_vehicles, rF2data.rFactor2Constants.MAX_MAPPED_VEHICLES)
+        self.track = track
+        self.frame = 0
+        self.elapsed_time = 0.0
+        self.write_extended(version)
+        self.write_scoring()
+
+    def close(self):
+        self.info.close()
+
+    @staticmethod
+    def _begin(buffer):
+        buffer.mVersionUpdateBegin += 1
+
+    @staticmethod
+    def _end(buffer):
+        buffer.mVersionUpdateEnd = buffer.mVersionUpdateBegin
+
+    def write_extended(self, version: str):
+        ext = self.info.Rf2Ext
+        self._begin(ext)
+        _set_string(ext.mVersion, version)
+        ext.is64bit = 1
+        ext.mSessionStarted = 1
+        ext.mInRealtimeFC = 1
+        self._end(ext)
+
+    def _lap_dist(self, idx: int) -> float:
+        speed = 50.0 + idx * 0.05
+        return (self.elapsed_time * speed + idx * 40.0) % TRACK_LENGTH
+
+    def write_scoring(self):
+        scor = self.info.Rf2Scor
+        self._begin(scor)
+        info = scor.mScoringInfo
+        _set_string(info.mTrackName, self.track)
+        info.mSession = 10
+        info.mGamePhase = 5
+        info.mCurrentET = self.elapsed_time
+        info.mNumVehicles = self.num_vehicles
+        info.mLapDist = TRACK_LENGTH
+
+        for idx in range(self.num_vehicles):
+            v = scor.mVehicles[idx]
+            v.mID = idx
+            _set_string(v.mDriverName, f'Driver {idx + 1}')
+            _set_string(v.mVehicleName, f'Vehicle #{idx + 1}')
+            _set_string(v.mVehicleClass, 'GT3' if idx % 3 else 'Hypercar')
+            v.mIsPlayer = int(idx == 0)
+            v.mControl = 0 if idx == 0 else 1
+            v.mPlace = idx + 1
+            v.mLapDist = self._lap_dist(idx)
+            v.mTotalLaps = int(self.elapsed_time * 50.0 / TRACK_LENGTH)
+            v.mHeadlights = int(self.elapsed_time % 60.0 > 30.0)
+            v.mInPits = 0
+
+        scor.mBytesUpdatedHint = rF2data.rF2Scoring.mVehicles.offset + \
+            self.num_vehicles * ctypes.sizeof(rF2data.rF2VehicleScoring)
+        self._end(scor)
+
+    def write_telemetry(self):
+        tele = self.info.Rf2Tele
+        self._begin(tele)
+        tele.mNumVehicles = self.num_vehicles
+
+        for idx in range(self.num_vehicles):
+            v = tele.mVehicles[idx]
+            lap_dist = self._lap_dist(idx)
+            angle = lap_dist / TRACK_LENGTH * 2 * math.pi
+            rpm = 4000.0 + 3000.0 * abs(math.sin(self.elapsed_time + idx))
+
+            v.mID = idx
+            v.mElapsedTime = self.elapsed_time
+            v.mPos.x, v.mPos.z = math.cos(angle) * 900.0, math.sin(angle) * 900.0
+            v.mLocalVel.z = -(50.0 + idx * 0.05)
+            v.mGear = 1 + int(rpm / 1200) % 6
+            v.mEngineRPM = rpm
+            v.mClutchRPM = rpm
+            v.mHeadlights = int(self.elapsed_time % 60.0 > 30.0)
+            v.mIgnitionStarter = 1
+
+        tele.mBytesUpdatedHint = rF2data.rF2Telemetry.mVehicles.offset + \
+            self.num_vehicles * ctypes.sizeof(rF2data.rF2VehicleTelemetry)
+        self._end(tele)
+
+    def write_frame(self, delta: float = 1 / 90):
+        """ Advance the simulation by delta seconds and write Telemetry, and Scoring if due """
+        self.elapsed_time += delta
+        self.frame += 1
+        self.write_telemetry()
+        if self.frame % self.scoring_interval == 0:
+            self.write_scoring()
+
+    def run(self, rate: float = 90.0, duration: float = 0.0, stop_event: Optional[threading.Event] = None):
+        """ Write frames at rate Hz, for duration seconds or until stop_event is set, rate 0 writes unthrottled """
+        interval = 1.0 / rate if rate > 0 else 0.0
+        start = time.perf_counter()
+        next_frame = start
+        while not (stop_event and stop_event.is_set()):
+            now = time.perf_counter()
+            if duration and now - start >= duration:
+                break
+            if interval:
+                if now < next_frame:
+                    time.sleep(next_frame - now)
+                next_frame += interval
+            self.write_frame(interval or 1 / 90)
+
+
+def _percentile(sorted_values, percent: float) -> float:
+    idx = int(math.ceil(len(sorted_values) * percent / 100)) - 1
+    return sorted_values[max(0, idx)]
+
+
+def benchmark_reads(backend: SharedMemoryBackend, frames: int = 1000, num_vehicles: int = 128,
+                    concurrent_seconds: float = 2.0) -> dict:
+    """ Measure SimSnapshot.update latency after every written frame, then the update
+        rate and torn reads while a writer thread writes unthrottled.
+    """
+    writer = SharedMemoryWriter(backend, num_vehicles)
+    reader = rF2data.SimInfo(backend)
+    snapshot = SimSnapshot(reader)
+
+    latencies = list()
+    for _ in range(frames):
+        writer.write_frame()
+        start = time.perf_counter()
+        snapshot.update()
+        latencies.append(time.perf_counter() - start)
+    latencies.sort()
+
+    stop_event = threading.Event()
+    thread = threading.Thread(target=writer.run, kwargs={'rate': 0, 'stop_event': stop_event}, daemon=True)
+    frames_before, updates, consistent = writer.frame, 0, 0
+    thread.start()
+    start = time.perf_counter()
+    while time.perf_counter() - start < concurrent_seconds:
+        consistent += int(snapshot.update(force=True))
+        updates += 1
+    stop_event.set()
+    thread.join()
+    seconds = time.perf_counter() - start
+
+    result = {
+        'vehicles': writer.num_vehicles,
+        'frames': frames,
+        'update_mean_ms': sum(latencies) / len(latencies) * 1000,
+        'update_p99_ms': _percentile(latencies, 99) * 1000,
+        'update_max_ms': latencies[-1] * 1000,
+        'concurrent_updates_per_s': updates / seconds,
+        'concurrent_consistent_updates': consistent,
+        'concurrent_frames_written_per_s': (writer.frame - frames_before) / seconds,
+        'torn_reads': snapshot.torn_reads,
+    }
+    reader.close()
+    writer.close()
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Write rF2 Shared Memory buffers to memory mapped files')
+    parser.add_argument('--dir', type=Path, required=True, help='Directory of the memory mapped buffer files')
+    parser.add_argument('--vehicles', type=int, default=128)
+    parser.add_argument('--rate', type=float, default=90.0, help='Telemetry frames per second, 0 is unthrottled')
+    parser.add_argument('--duration', type=float, default=0.0, help='Seconds to run, 0 runs until interrupted')
+    parser.add_argument('--benchmark', type=int, default=0, metavar='FRAMES',
+                        help='Measure reading the buffers instead of only writing them')
+    args = parser.parse_args()
+
+    backend = FileMmapBackend(args.dir)
+    if args.benchmark:
+        for k, v in benchmark_reads(backend, args.benchmark, args.vehicles).items():
+            print(f'{k}: {v:.4f}' if isinstance(v, float) else f'{k}: {v}')
+        return
+
+    writer = SharedMemoryWriter(backend, args.vehicles)
+    try:
+        writer.run(args.rate, args.duration)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        writer.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -1,18 +1,22 @@
 import json
 import logging
+import os
 import subprocess
 from configparser import ConfigParser
 from pathlib import Path, WindowsPath
-from typing import Optional, Iterator, Union, Type
+from typing import Optional, Iterator, Union, Type, Dict, Tuple
 
 from .globals import RFACTOR_PLAYER, RFACTOR_DXCONFIG, RFACTOR_DXVRCONFIG
 from .globals import RF2_APPID, RFACTOR_VERSION_TXT, RFACTOR_CONTROLLER
+from .ini_document import IniDocument
+from .json_document import JsonDocument
 from .preset.preset import BasePreset, PresetType
 from .preset.settings_model import BaseOptions, OptionsTarget
 from .preset.settings_model_base import OPTION_CLASSES
 from .valve.steam_utils import SteamApps
 from .mods.vrtoolkit import VrToolKit
 from .mods.open_vr import OpenVrFsrMod, OpenVrFoveatedMod
+from open_vr_mod.globals import OPEN_VR_FSR_CFG
 
 """
 ModMgr.exe
@@ -103,6 +107,44 @@ class RfactorLocation:
         cls.dev = dev
 
 
+def _file_identity(file: Path) -> Tuple[str, int, int]:
+    """ Path, size and modification time of a file or directory, -1 if it does not exist """
+    try:
+        stat = os.stat(file)
+        return str(file), stat.st_size, stat.st_mtime_ns
+    except OSError:
+        return str(file), -1, -1
+
+
+class RfactorPlayerCache:
+    """ Options read from the rFactor 2 installation, shared by all RfactorPlayer instances.
+        Entries are stored per OptionsTarget together with the identity of the files they
+        were read from. A target is only read again from disk once one of its files changed.
+    """
+    entries: Dict[int, dict] = dict()
+    hits = 0
+    misses = 0
+
+    @classmethod
+    def get(cls, target: int, identity: tuple) -> Optional[dict]:
+        entry = cls.entries.get(target)
+        if entry is not None and entry['identity'] == identity:
+            cls.hits += 1
+            return entry
+        cls.misses += 1
+
+    @classmethod
+    def set(cls, target: int, entry: dict):
+        cls.entries[target] = entry
+
+    @classmethod
+    def invalidate(cls, target: Optional[int] = None):
+        if target is None:
+            cls.entries = dict()
+        else:
+            cls.entries.pop(target, None)
+
+
 class RfactorPlayer:
     resolution_key = 'resolution_settings'
     config_parser_args = {'inline_comment_prefixes': ('//', ),
@@ -126,6 +168,7 @@ class RfactorPlayer:
         self.ini_file = Path()
         self.ini_vr_file = Path()
         self.ini_first_line = str()
+        self.ini_text = str()
         self.ini_config = self._create_ini_config_parser()
         self.location = Path('../modules')
         self.version_file = Path()
@@ -147,54 +190,166 @@ class RfactorPlayer:
         if only_version:
             return
 
-        if self.player_json_import_data is not None:
-            # -- Use player.json data provided on init
-            player_json = self.player_json_import_data
-        else:
-            # -- Read Player JSON
-            player_json = self.read_player_json_dict(self.player_file, encoding='utf-8')
-
-        # -- Get Options from Player JSON
-        r = self._read_options_from_target(OptionsTarget.player_json, player_json)
-        del player_json
-
-        # -- Read Controller JSON
-        controller_json = self.read_player_json_dict(self.controller_file, encoding='cp1252')
-        r = self._read_options_from_target(OptionsTarget.controller_json, controller_json) and r
-        del controller_json
+        # -- Get Options from Player and Controller JSON
+        r = self._read_target(OptionsTarget.player_json)
+        r = self._read_target(OptionsTarget.controller_json) and r
 
         if not r:
             # -- Error reading either player or controller JSON
             return
 
-        # -- Read dx_config
-        config = self.read_dx_ini()
-        if not config:
+        # -- Get Options from dx_config
+        if not self._read_target(OptionsTarget.dx_config):
             self.is_valid = False
             return
-        # -- Get Options from dx_config
-        for preset_options in self._get_target_options(OptionsTarget.dx_config):
-            if not self._get_options_from_dx_config(preset_options, config):
-                self.error += f'Could not read rFactor2 CONFIG_DX11.ini for ' \
-                              f'{preset_options.__class__.__name__}\n'
-                self.is_valid = False
-                return
 
-        # -- Get ReShade Options
-        vr_toolkit = VrToolKit(self._get_target_options(OptionsTarget.reshade), self.location)
+        # -- Get ReShade and OpenVr Options, errors are reported but do not invalidate the installation
+        for target in (OptionsTarget.reshade, OptionsTarget.open_vr_fsr, OptionsTarget.open_vr_fov):
+            self._read_target(target)
+
+        self.is_valid = True
+
+    def _target_files(self, target: OptionsTarget) -> tuple:
+        """ Files and directories the options of a target are read from """
+        bin_dir = self.location / 'Bin64'
+        if target == OptionsTarget.player_json:
+            return self.player_file,
+        elif target == OptionsTarget.controller_json:
+            return self.controller_file,
+        elif target == OptionsTarget.dx_config:
+            return self.ini_file, self.ini_vr_file
+        elif target == OptionsTarget.reshade:
+            return bin_dir, bin_dir / VrToolKit.RESHADE_PRESET_DIR / VrToolKit.RESHADE_TARGET_PRESET_NAME
+        elif target in (OptionsTarget.open_vr_fsr, OptionsTarget.open_vr_fov):
+            return bin_dir, bin_dir / OPEN_VR_FSR_CFG
+        return tuple()
+
+    def _target_identity(self, target: OptionsTarget) -> tuple:
+        return tuple(_file_identity(f) for f in self._target_files(target))
+
+    def _read_target(self, target: OptionsTarget) -> bool:
+        """ Read the options of a target from the RfactorPlayerCache or from disk if its files changed """
+        if target == OptionsTarget.player_json and self.player_json_import_data is not None:
+            # -- Use player.json data provided on init
+            return self._read_target_from_disk(target)
+
+        identity = self._target_identity(target)
+        entry = RfactorPlayerCache.get(target, identity)
+
+        if entry is None:
+            error, self.error = self.error, str()
+            result = self._read_target_from_disk(target)
+            is_dx_config = target == OptionsTarget.dx_config
+            entry = {'identity': identity, 'result': result, 'error': self.error,
+                     'values': self._get_option_values(target),
+                     'ini': (self.ini_first_line, self.ini_text) if is_dx_config else None,
+                     'vr_values': self._read_dx_vr_values() if is_dx_config and result else None}
+            self.error = error + self.error
+            RfactorPlayerCache.set(target, entry)
+            return result
+
+        # -- Restore options from memory
+        self.error += entry['error']
+        self._set_option_values(target, entry['values'])
+        if entry['ini'] is not None:
+            self.ini_first_line, self.ini_text = entry['ini']
+            self.ini_config = self._create_ini_config_parser()
+            self.ini_config.read_string(self.ini_text)
+        return entry['result']
+
+    def _read_target_from_disk(self, target: OptionsTarget) -> bool:
+        if target == OptionsTarget.player_json:
+            if self.player_json_import_data is not None:
+                player_json = self.player_json_import_data
+            else:
+                player_json = self.read_player_json_dict(self.player_file, encoding='utf-8')
+            return self._read_options_from_target(OptionsTarget.player_json, player_json)
+        elif target == OptionsTarget.controller_json:
+            controller_json = self.read_player_json_dict(self.controller_file, encoding='cp1252')
+            return self._read_options_from_target(OptionsTarget.controller_json, controller_json)
+        elif target == OptionsTarget.dx_config:
+            config = self.read_dx_ini()
+            if not config:
+                return False
+            for preset_options in self._get_target_options(OptionsTarget.dx_config):
+                if not self._get_options_from_dx_config(preset_options, config):
+                    self.error += f'Could not read rFactor2 CONFIG_DX11.ini for ' \
+                                  f'{preset_options.__class__.__name__}\n'
+                    return False
+            return True
+        elif target == OptionsTarget.reshade:
+            mod = VrToolKit(self._get_target_options(OptionsTarget.reshade), self.location)
+        elif target == OptionsTarget.open_vr_fsr:
+            mod = OpenVrFsrMod(self._get_target_options(target), self.location)
+        elif target == OptionsTarget.open_vr_fov:
+            mod = OpenVrFoveatedMod(self._get_target_options(target), self.location)
+        else:
+            return False
 
-        result = vr_toolkit.read()
+        result = mod.read()
         if not result:
-            self.error += f'{vr_toolkit.error}\n'
+            self.error += f'{mod.error}\n'
+        return result
 
-        # -- Get OpenVr Options
-        for target, mod_type in zip((OptionsTarget.open_vr_fsr, OptionsTarget.open_vr_fov),
-                                    (OpenVrFsrMod, OpenVrFoveatedMod)):
-            mod = mod_type(self._get_target_options(target), self.location)
-            if not mod.read():
-                self.error += f'{mod.error}\n'
+    def _read_dx_vr_values(self) -> Dict[str, str]:
+        """ Values of the dx_config options present in Config_DX11_VR.ini, which is written along CONFIG_DX11.ini """
+        if not self.ini_vr_file.is_file():
+            return dict()
+        try:
+            doc = IniDocument.read(self.ini_vr_file)
+        except Exception as e:
+            logging.error('Could not read %s: %s', self.ini_vr_file.name, e)
+            return dict()
 
-        self.is_valid = True
+        section, values = self.ini_config.default_section, dict()
+        for preset_options in self._get_target_options(OptionsTarget.dx_config):
+            for option in preset_options.options:
+                value = doc.get(section, option.key)
+                if value is not None:
+                    values[option.key] = value
+        return values
+
+    def _get_option_values(self, target: OptionsTarget) -> Dict[str, list]:
+        return {preset_options.app_key: [(o.key, o.value, o.exists_in_rf, o.hidden) for o in preset_options.options]
+                for preset_options in self._get_target_options(target)}
+
+    def _set_option_values(self, target: OptionsTarget, values: Dict[str, list]):
+        for preset_options in self._get_target_options(target):
+            for option, (_, value, exists_in_rf, hidden) in zip(preset_options.options,
+                                                                values[preset_options.app_key]):
+                option.value, option.exists_in_rf, option.hidden = value, exists_in_rf, hidden
+
+    def is_target_modified(self, target: OptionsTarget, preset: BasePreset) -> bool:
+        """ Report if a preset would change any setting of a target compared to the settings on disk.
+            Targets without an up-to-date RfactorPlayerCache entry are always reported as modified.
+        """
+        entry = RfactorPlayerCache.get(target, self._target_identity(target))
+        if entry is None:
+            return True
+        is_mod = target in (OptionsTarget.reshade, OptionsTarget.open_vr_fsr, OptionsTarget.open_vr_fov)
+        vr_values = entry.get('vr_values') or dict()
+
+        for preset_options in self._get_target_options(target, preset):
+            if preset_options.app_key not in entry['values']:
+                return True
+            current = {key: (value, exists_in_rf) for key, value, exists_in_rf, _ in
+                       entry['values'][preset_options.app_key]}
+
+            for option in preset_options.options:
+                if option.value is None:
+                    continue
+                # -- The VR ini is written with the same values and may differ from the desktop ini
+                if option.key in vr_values and vr_values[option.key] != str(option.value):
+                    return True
+                value, exists_in_rf = current.get(option.key, (None, False))
+                if not exists_in_rf:
+                    # -- Missing keys are skipped when writing JSON and ini files but mods need to be installed
+                    if is_mod:
+                        return True
+                    continue
+                if value != option.value:
+                    return True
+        return False
 
     def _get_target_options(self, target: OptionsTarget, options=None) -> Iterator[BaseOptions]:
         if options is None:
@@ -215,13 +370,16 @@ class RfactorPlayer:
         return True
 
     def write_settings(self, preset: BasePreset) -> bool:
-        """ Writes all settings of a preset into the rFactor 2 installation
+        """ Writes all settings of a preset into the rFactor 2 installation. Targets
+            whose settings already match the preset are not touched.
 
         :param preset:
         :return:
         """
         # -- Write video config to dx_config
-        self._write_video_config(preset)
+        if self.is_target_modified(OptionsTarget.dx_config, preset):
+            self._write_video_config(preset)
+            RfactorPlayerCache.invalidate(OptionsTarget.dx_config)
 
         # -- Write reshade settings
         self.write_mod(preset, VrToolKit)
@@ -234,21 +392,29 @@ class RfactorPlayer:
         self.update_webui_settings(preset, OptionsTarget.webui_session)
         self.update_webui_settings(preset, OptionsTarget.webui_content)
 
-        # -- Update Player Json settings
-        player_json_dict = self.read_player_json_dict(self.player_file, encoding='utf-8')
-        update_result = self._write_to_target(OptionsTarget.player_json, preset, player_json_dict)
-
-        # -- Update Controller Json settings
-        controller_json_dict = self.read_player_json_dict(self.controller_file, encoding='cp1252')
-        update_result = self._write_to_target(
-            OptionsTarget.controller_json, preset, controller_json_dict) and update_result
-
-        if not update_result:
-            return False
+        # -- Update Player and Controller Json settings
+        json_updates = list()
+        for target, file, encoding in ((OptionsTarget.player_json, self.player_file, 'utf-8'),
+                                       (OptionsTarget.controller_json, self.controller_file, 'cp1252')):
+            if not self.is_target_modified(target, preset):
+                logging.info('Found no updated settings for %s. Skipping update!', file.name)
+                continue
+            try:
+                doc = JsonDocument.load(file, encoding)
+            except Exception as e:
+                self.error += f'Could not read {file.name} file! {e}\n'
+                logging.fatal(self.error)
+                return False
+            if not self._write_to_target(target, preset, doc):
+                return False
+            json_updates.append((target, doc, file))
 
         # -- Write JSON files
-        r = self.write_json(player_json_dict, self.player_file, encoding='utf-8')
-        return r and self.write_json(controller_json_dict, self.controller_file, encoding='cp1252')
+        for target, doc, file in json_updates:
+            RfactorPlayerCache.invalidate(target)
+            if not self.write_json_document(doc, file):
+                return False
+        return True
 
     def update_webui_settings(self, preset, target):
         for preset_options in self._get_target_options(target, preset):
@@ -257,38 +423,42 @@ class RfactorPlayer:
             elif target == OptionsTarget.webui_content:
                 self.webui_content_selection = preset_options.to_webui_js()
 
-    def write_json(self, json_dict: dict, file: Path, encoding: str = 'UTF-8') -> bool:
+    def write_json_document(self, doc: JsonDocument, file: Path) -> bool:
+        """ Write only the changed values of a player or controller JSON document """
         try:
-            with open(file, 'w', encoding=encoding) as f:
-                json.dump(json_dict, f, indent=2, ensure_ascii=False)
+            result = doc.write(file)
         except Exception as e:
             self.error += f'Error while writing file! {e}\n'
             logging.fatal(self.error)
             return False
+
+        if result.written:
+            logging.info('Updated %s values in %s', result.values_changed, file.name)
+        else:
+            logging.info('%s already up to date', file.name)
         return True
 
-    def _write_to_target(self, target: OptionsTarget, preset: BasePreset, json_dict: dict) -> bool:
+    def _write_to_target(self, target: OptionsTarget, preset: BasePreset, doc: JsonDocument) -> bool:
         for preset_options in self._get_target_options(target, preset):
-            if not self._update_player_json(json_dict, preset_options):
+            if not self._update_player_json(doc, preset_options):
                 return False
         return True
 
     def _write_video_config(self, preset: BasePreset):
-        """ Update the Config_DX11.ini with supported Video Settings """
-        settings_updated = False
+        """ Update the Config_DX11.ini with supported Video Settings, only changed keys are rewritten """
+        section = self.ini_config.default_section
+        values = dict()
 
         for preset_options in self._get_target_options(OptionsTarget.dx_config, preset):
             for option in preset_options.options:
-                if option.key not in self.ini_config[self.ini_config.default_section]:
+                if option.key not in self.ini_config[section]:
                     self.error += f'Could not locate settings key: {option.key} in CONFIG_DX11.ini\n'
                     logging.error(self.error)
                     continue
                 if option.value is not None:
-                    self.ini_config[self.ini_config.default_section][option.key] = str(option.value)
-                    logging.info('Updated Dx Setting: %s: %s', option.key, option.value)
-                    settings_updated = True
+                    values[option.key] = str(option.value)
 
-        if not settings_updated:
+        if not values:
             logging.info('Found no updated Video Settings. Skipping update of dx_config!')
             return
 
@@ -297,30 +467,27 @@ class RfactorPlayer:
             for ini_file in (self.ini_file, self.ini_vr_file):
                 if not ini_file.exists():
                     continue
-                # - Write config
-                with open(ini_file, 'w') as f:
-                    self.ini_config.write(f, space_around_delimiters=False)
-
-                # - Restore first ini comment line
-                with open(ini_file, 'r') as f:
-                    f_lines = f.readlines()
-                f_lines = [self.ini_first_line] + f_lines
-
-                # - Remove trailing new line
-                if f_lines[-1] == '\n':
-                    f_lines = f_lines[:-1]
-                # - Remove trailing new line character
-                f_lines[-1] = f_lines[-1].rstrip('\n')
-
-                # - Write modified config
-                with open(ini_file, 'w') as f:
-                    f.writelines(f_lines)
+                doc = IniDocument.read(ini_file)
+                for key, value in values.items():
+                    if not doc.has_key(section, key):
+                        logging.debug('Settings key %s not present in %s', key, ini_file.name)
+                        continue
+                    if doc.set(section, key, value):
+                        logging.info('Updated Dx Setting: %s: %s', key, value)
+
+                result = doc.write(ini_file)
+                if result.written:
+                    logging.info('Updated %s keys, %s bytes in %s', result.keys_changed, result.bytes_changed,
+                                 ini_file.name)
+                else:
+                    logging.info('%s already up to date', ini_file.name)
         except Exception as e:
             self.error += f'Could not write CONFIG_DX11.ini file! {e}\n'
             logging.error(self.error)
             return False
 
-    def _update_player_json(self, player_json_dict, preset_options: BaseOptions):
+    def _update_player_json(self, doc: JsonDocument, preset_options: BaseOptions):
+        player_json_dict = doc.data
         if preset_options.key not in player_json_dict:
             self.error += f'Could not locate CATEGORY settings key: {preset_options.key} in player.JSON.\n'
             logging.error(self.error)
@@ -336,16 +503,16 @@ class RfactorPlayer:
                 logging.debug('Skipping write of %s because value is None.', option.key)
                 continue
 
-            player_json_dict[preset_options.key][option.key] = option.value
-            logging.info('Updated Setting: %s: %s', option.key, option.value)
+            if doc.set(preset_options.key, option.key, option.value):
+                logging.info('Updated Setting: %s: %s', option.key, option.value)
 
             # -- Write duplicate keys e.g. GPRIX RaceTime + CURNT RaceTime
             duplicates_list = option.dupl or list()
             if isinstance(option.dupl, str):
                 duplicates_list = [option.dupl]
             for key in duplicates_list:
-                player_json_dict[preset_options.key][key] = option.value
-                logging.info('Updated duplicated Setting: %s: %s', key, option.value)
+                if doc.set(preset_options.key, key, option.value):
+                    logging.info('Updated duplicated Setting: %s: %s', key, option.value)
 
         return True
 
@@ -365,9 +532,14 @@ class RfactorPlayer:
         elif mod_type is OpenVrFoveatedMod:
             target = OptionsTarget.open_vr_fov
 
+        if not self.is_target_modified(target, preset):
+            logging.debug('Found no updated settings for %s. Skipping update!', mod_type.__name__)
+            return True
+
         mod = mod_type(self._get_target_options(target, preset), self.location)
 
         result = mod.write()
+        RfactorPlayerCache.invalidate(target)
         if not result:
             self.error = mod.error
 
@@ -436,8 +608,9 @@ class RfactorPlayer:
             conf = self._create_ini_config_parser()
             with open(self.ini_file, 'r') as f:
                 self.ini_first_line = f.readline()
-                conf.read_file(f)
-                return conf
+                self.ini_text = f.read()
+            conf.read_string(self.ini_text)
+            return conf
         except Exception as e:
             self.error += f'Could not read CONFIG_DX11.ini file! {e} {self.ini_file}\n'
             logging.fatal(self.error)
@@ -0,0 +1,146 @@
+"""
+Serve the server browser from the last known server list and refresh it in the background.
+
+ServerListCache keeps the info of every server that answered. Opening the server
+browser transfers the cached servers right away, each with its age in seconds. If
+the list is older than refresh_interval, a background greenlet queries the servers
+again and streams the results to the frontend, which replaces entries by id.
+Known servers are queried first, in priority order: favourites, servers whose
+info recently changed, populated servers and the rest last. Servers listed by
+Steam follow as their pages arrive, new ones before the rest.
+
+Only an empty cache, eg. on the first visit, makes the caller wait for the query.
+"""
+import logging
+import time
+from typing import Dict, Iterator, List, Optional, Tuple
+
+import gevent
+
+from .app_settings import AppSettings
+from .serverlist import ServerList
+from .valve.a2s_engine import Address
+
+
+class ServerListCache:
+    refresh_interval = 30.0     # Seconds until a served list is refreshed in the background
+    expire_age = 900.0          # Forget servers that did not answer for this many seconds
+    recent_change_age = 300.0   # Servers that changed within this many seconds are queried early
+
+    # -- Server info that marks a server as changed
+    change_keys = ('server_name', 'map_name', 'player_count', 'players', 'password_protected', 'version')
+
+    servers: Dict[str, dict] = dict()      # {id: server info}
+    updated: Dict[str, float] = dict()     # {id: time of the last answer}
+    changed: Dict[str, float] = dict()     # {id: time the info last changed}
+    last_refresh: Dict[bool, float] = dict()  # {only favourites: time the last refresh started}
+    refresh_greenlets: Dict[bool, gevent.Greenlet] = dict()  # {only favourites: running refresh}
+
+    @classmethod
+    def get(cls, only_favourites: bool, transfer_server_list_chunk: callable,
+            report_progress: Optional[callable] = None) -> List[dict]:
+        """ Transfer the cached servers and refresh them if stale. Waits for the refresh if nothing is cached. """
+        cached = cls.cached(only_favourites)
+        for idx in range(0, len(cached), ServerList.transfer_chunk_size):
+            transfer_server_list_chunk(cached[idx:idx + ServerList.transfer_chunk_size])
+
+        if (time.time() - cls.last_refresh.get(only_favourites, 0.0) > cls.refresh_interval
+                and not cls.refreshing(only_favourites)):
+            cls.refresh_greenlets[only_favourites] = gevent.spawn(
+                cls.refresh, only_favourites, transfer_server_list_chunk, report_progress)
+
+        if not cached and cls.refreshing(only_favourites):
+            cls.refresh_greenlets[only_favourites].join()
+        return cls.cached(only_favourites)
+
+    @classmethod
+    def refreshing(cls, only_favourites: bool) -> bool:
+        greenlet = cls.refresh_greenlets.get(only_favourites)
+        return greenlet is not None and not greenlet.dead
+
+    @classmethod
+    def cached(cls, only_favourites: bool = False) -> List[dict]:
+        now = time.time()
+        favourites = set(AppSettings.server_favourites)
+        result = list()
+        for server_id, server_info in cls.servers.items():
+            if only_favourites and server_id not in favourites:
+                continue
+            result.append(dict(server_info, age=round(now - cls.updated[server_id]),
+                               password=AppSettings.server_passwords.get(server_id, '')))
+        return result
+
+    @classmethod
+    def store(cls, servers: List[dict]):
+        now = time.time()
+        for server_info in servers:
+            server_id = server_info['id']
+            previous = cls.servers.get(server_id)
+            if previous is not None and any(previous.get(k) != server_info.get(k) for k in cls.change_keys):
+                cls.changed[server_id] = now
+            server_info['age'] = 0
+            cls.servers[server_id] = server_info
+            cls.updated[server_id] = now
+
+    @classmethod
+    def forget(cls, server_id: str):
+        cls.servers.pop(server_id, None)
+        cls.updated.pop(server_id, None)
+        cls.changed.pop(server_id, None)
+
+    @classmethod
+    def prioritize(cls, addresses: List[Address]) -> List[Address]:
+        """ Order addresses: favourites, recently changed, populated, unknown, the rest """
+        now = time.time()
+        favourites = set(AppSettings.server_favourites)
+
+        def priority(address: Address) -> Tuple[int, int]:
+            server_id = f'{address[0]}:{address[1]}'
+            server_info = cls.servers.get(server_id)
+            if server_id in favourites:
+                return 0, 0
+            if server_info is None:
+                return 3, 0
+            if now - cls.changed.get(server_id, 0.0) < cls.recent_change_age:
+                return 1, 0
+            if server_info.get('player_count'):
+                return 2, -server_info['player_count']
+            return 4, 0
+
+        return sorted(addresses, key=priority)
+
+    @classmethod
+    def refresh(cls, only_favourites: bool, transfer_server_list_chunk: callable,
+                report_progress: Optional[callable] = None):
+        """ Query the servers in priority order and stream the answers to the frontend """
+        start = time.time()
+        cls.last_refresh[only_favourites] = start
+        server_list = ServerList(update_players=True, only_favourites=only_favourites)
+        listed = set()
+
+        def _transfer(chunk: List[dict]):
+            cls.store(chunk)
+            transfer_server_list_chunk(chunk)
+
+        def _address_batches() -> Iterator[List[Address]]:
+            # -- Known servers first, then the servers listed by Steam as their pages arrive
+            known = [tuple(s['address']) for s in cls.cached(only_favourites) if s.get('address')]
+            yield cls.prioritize(known)
+            for batch in server_list.address_batches():
+                listed.update(f'{a[0]}:{a[1]}' for a in batch)
+                yield cls.prioritize(batch)
+
+        try:
+            server_list.update(_transfer, report_progress, _address_batches())
+        except Exception as e:
+            logging.error('Error while refreshing the server list: %s', e)
+            return
+
+        # -- Forget servers no longer listed or not answering for too long. Keep all if Steam could not be reached.
+        for server_id, updated in list(cls.updated.items()):
+            unlisted = listed and not only_favourites and server_id not in listed
+            if (unlisted and updated < start) or start - updated > cls.expire_age:
+                cls.forget(server_id)
+
+        logging.debug('Refreshed %s servers in %.2fs, %s listed, %s cached', len(server_list.servers),
+                      time.time() - start, len(listed), len(cls.servers))
@@ -1,14 +1,15 @@
-import concurrent.futures
 import logging
-import os
-from typing import List, Optional, Union, Tuple
+from typing import Iterable, Iterator, List, Optional, Sequence, Union
 
 import a2s
 from a2s import Player
 
 from rf2settings.app_settings import AppSettings
 from rf2settings.globals import RF2_APPID
-from rf2settings.valve import master_server, NoResponseError
+from rf2settings.latency_history import LatencyHistory, get_latency_history
+from rf2settings.valve import NoResponseError
+from rf2settings.valve.a2s_engine import A2SQueryEngine, A2SQueryResult, QUERY_INFO, QUERY_PLAYERS, Address
+from rf2settings.valve.master_stream import MasterServerStream
 from rf2settings.valve.steam_webapi import get_server_list
 
 
@@ -17,9 +18,7 @@ _SERVER_REGIONS = ['eu', 'na-east', 'na-west', 'na', 'sa', 'as', 'oc', 'af', 're
 
 class ServerList:
     timeout = 1.0    # Timeout per server info query
-    workers = min(48, int(max(4, os.cpu_count()) * 3))  # Number of server info workers
-    chunk_size = 8  # Max number of servers to query per worker
-    transfer_chunk_size = chunk_size * 10  # Reduce update rate for a more responsive front end
+    transfer_chunk_size = 80  # Reduce update rate for a more responsive front end
 
     # Age in hours of a player instance we consider no longer valid
     skip_player_threshold_age = 8.0
@@ -29,85 +28,103 @@ class ServerList:
                   'platform', 'bot_count', 'player_count', 'protocol', 'server_name', 'server_type', 'steam_id',
                   'ip', 'port', 'players')
 
-    def __init__(self, update_players: bool = False, only_favourites: bool = False):
+    def __init__(self, update_players: bool = False, only_favourites: bool = False,
+                 latency_history: Optional[LatencyHistory] = None):
         self.servers: List[dict] = list()
         self.update_players = update_players
         self.only_favourites = only_favourites
+        self.latency_history = latency_history or get_latency_history()
 
         _a2s_logger = logging.getLogger('a2s')
         _a2s_logger.setLevel(logging.INFO)
 
-    def update(self, transfer_server_list_chunk: callable, report_progress: Optional[callable] = None):
+    def update(self, transfer_server_list_chunk: callable, report_progress: Optional[callable] = None,
+               address_batches: Optional[Iterable[List[Address]]] = None):
         """ Acquire a complete list of available rFactor 2 Servers
-            This will block until all worker threads are finished.
-        """
-        server_address_list = list()
-        update_chunk_size = self.chunk_size
-
-        # -- Get a list of IP:Port addresses from the Steam Master Server
-        #    that run rFactor 2 Servers
-        if not self.only_favourites:
-            server_address_list = self.get_server_addresses()
-            if not server_address_list:
-                logging.error('Could not acquire server list from master server!')
-                return
+            This will block until all queries are answered or timed out. Servers are
+            transferred in chunks as soon as their replies arrive.
 
-        if self.only_favourites:
-            update_chunk_size = 1
-            for favourite_id in AppSettings.server_favourites:
-                fav_ip, fav_port = favourite_id.split(':')
-                server_address_list.append((fav_ip, int(fav_port)))
+            :param address_batches: query these lists of addresses, in order, instead of looking them up.
+                                    Servers of a batch are queried while the next batches are produced.
+        """
+        if address_batches is None:
+            address_batches = self.address_batches()
 
         # -- Initial progress report
-        _num_server = len(server_address_list)
+        _num_server = 0
         self.report_progress(report_progress, 1, 100)
+        _transfer_chunk = list()
+
+        def _count(batches: Iterable[List[Address]]) -> Iterator[List[Address]]:
+            nonlocal _num_server
+            counted = set()
+            for batch in batches:
+                counted.update(batch)
+                _num_server = len(counted)
+                yield batch
+
+        def _on_result(result: A2SQueryResult):
+            nonlocal _transfer_chunk
+            server_info = self._query_result_to_server_dict(result, self.update_players)
+            self._record_latency(result, server_info)
+            if server_info is None:
+                return
+
+            # -- Update server list
+            self.servers.append(server_info)
 
-        # -- Split server addresses into chunks for workers
-        address_chunks: List[list] = list()
-        while server_address_list:
-            chunks = list()
-            for i in range(min(update_chunk_size, len(server_address_list))):
-                chunks.append(server_address_list.pop())
-            address_chunks.append(chunks)
-
-        with concurrent.futures.ThreadPoolExecutor(max_workers=self.workers) as executor:
-            future_info = {executor.submit(self._get_server_info_worker, c,
-                                           self.timeout, self.update_players): c for c in address_chunks}
-            _transfer_chunk = list()
-
-            for future in concurrent.futures.as_completed(future_info):
-                address_chunk = future_info[future]
-                try:
-                    server_info_ls = future.result()
-                except Exception as exc:
-                    logging.error('Querying address chunk %s generated an exception: %s', address_chunk, exc)
-                else:
-                    if not server_info_ls:
-                        continue
-
-                    # -- Update server list
-                    self.servers += server_info_ls
-
-                    # -- Update transfer queue
-                    _transfer_chunk += server_info_ls
-                    if len(_transfer_chunk) > self.transfer_chunk_size:
-                        transfer_server_list_chunk(_transfer_chunk)
-                        _transfer_chunk = list()
-
-                    # -- Report progress
-                    self.report_progress(report_progress, len(self.servers), _num_server)
-                    logging.debug('Read x%s servers for address chunk %s', len(server_info_ls), address_chunk)
+            # -- Update transfer queue
+            _transfer_chunk.append(server_info)
+            if len(_transfer_chunk) > self.transfer_chunk_size:
+                transfer_server_list_chunk(_transfer_chunk)
+                _transfer_chunk = list()
+
+                # -- Report progress
+                self.report_progress(report_progress, len(self.servers), _num_server)
+
+        kinds = (QUERY_INFO, QUERY_PLAYERS) if self.update_players else (QUERY_INFO,)
+        engine = A2SQueryEngine(timeout=self.timeout)
+        engine.run_stream(_count(address_batches), kinds, on_result=_on_result)
+        logging.debug('Queried %s server addresses: %s answered, %s packets sent, %s received',
+                      _num_server, len(self.servers), engine.packets_sent, engine.packets_received)
+        if not _num_server and not self.only_favourites:
+            logging.error('Could not acquire server list from master server!')
 
         # -- Transfer remaining chunk
         if _transfer_chunk:
             transfer_server_list_chunk(_transfer_chunk)
-            self.report_progress(report_progress, len(self.servers), _num_server)
+        self.report_progress(report_progress, len(self.servers), _num_server)
+        self.latency_history.save()
 
-    def update_single(self, address: Tuple[str, int]) -> Optional[dict]:
-        server_info_ls = self._get_server_info_worker([address], self.timeout, full_update=True)
+    def address_batches(self) -> Iterator[List[Address]]:
+        """ Addresses of the favourite servers or of all rFactor 2 servers known to Steam """
+        if self.only_favourites:
+            yield self.favourite_addresses()
+        else:
+            yield from self.server_address_batches()
 
-        if server_info_ls:
-            return server_info_ls[0]
+    @staticmethod
+    def favourite_addresses() -> List[Address]:
+        server_address_list = list()
+        for favourite_id in AppSettings.server_favourites:
+            fav_ip, fav_port = favourite_id.split(':')
+            server_address_list.append((fav_ip, int(fav_port)))
+        return server_address_list
+
+    def update_single(self, address: Address) -> Optional[dict]:
+        results = A2SQueryEngine(timeout=self.timeout).run([address], (QUERY_INFO, QUERY_PLAYERS))
+        if results:
+            server_info = self._query_result_to_server_dict(results[0], full_update=True)
+            self._record_latency(results[0], server_info)
+            self.latency_history.save()
+            return server_info
+
+    def _record_latency(self, result: A2SQueryResult, server_info: Optional[dict]):
+        """ Add the round-trip time of the info query to the history and its averages to the server info """
+        server_id = f'{result.address[0]}:{result.address[1]}'
+        self.latency_history.record(server_id, result.ping if result.ok else None)
+        if server_info is not None:
+            server_info.update(self.latency_history.summary(server_id))
 
     @staticmethod
     def report_progress(report_progress: Optional[callable] = None, progress: int = 0, complete: int = 1):
@@ -141,34 +158,30 @@ class ServerList:
         return server_info_dict
 
     @classmethod
-    def _get_server_info_worker(cls, address_list, query_timeout: float = 1.0, full_update: bool = False) -> list:
-        server_info_ls: List[dict] = list()
-
-        for address in address_list:
-            try:
-                # -- Get Server info
-                info = a2s.info(address, query_timeout)
-                info.players = list()
-
-                # -- Get Player Info if requested
-                if info and full_update:
-                    try:
-                        players = a2s.players(address, query_timeout * 4)
-                        info.players = cls._serialize_player_info(players)
-                        info.player_count = len(info.players)
-                    except Exception as exc:
-                        logging.error('Error while querying for player info: %s', exc)
-
-                # -- Remove AI from player count
-                info.player_count = max(0, info.player_count - info.bot_count)
-
-                # -- Serialize data to JSON dict
-                if info:
-                    server_info_ls.append(cls._source_info_to_server_dict(info, address))
-            except Exception as exc:
-                logging.error('Error while querying for server info: %s', exc)
-
-        return server_info_ls
+    def _query_result_to_server_dict(cls, result: A2SQueryResult, full_update: bool = False) -> Optional[dict]:
+        if not result.ok:
+            logging.debug('Error while querying for server info %s: %s', result.address, result.errors)
+            return None
+
+        info = result.info
+        info.players = list()
+
+        # -- Get Player Info if requested
+        if full_update:
+            if result.players is not None:
+                info.players = cls._serialize_player_info(result.players)
+                info.player_count = len(info.players)
+            else:
+                logging.error('Error while querying for player info: %s', result.errors.get(QUERY_PLAYERS))
+
+        # -- Remove AI from player count
+        info.player_count = max(0, info.player_count - info.bot_count)
+
+        # -- Serialize data to JSON dict
+        try:
+            return cls._source_info_to_server_dict(info, result.address)
+        except Exception as exc:
+            logging.error('Error while reading server info: %s', exc)
 
     @classmethod
     def _serialize_player_info(cls, players: List[Player]):
@@ -185,9 +198,8 @@ class ServerList:
         return list(player_list)
 
     @staticmethod
-    def get_server_addresses(region='rest') -> list:
-        """Get server addresses from Steam WebAPI or fallback to Master Server."""
-        # Try Steam WebAPI first
+    def get_webapi_addresses() -> List[Address]:
+        """ Get server addresses from the Steam WebAPI """
         try:
             api_response = get_server_list(appid=RF2_APPID, limit=1000)
 
@@ -205,13 +217,23 @@ class ServerList:
                     return addresses
         except Exception as e:
             logging.warning(f'Steam WebAPI request failed: {e}')
+        return []
+
+    @classmethod
+    def server_address_batches(cls, regions: Sequence[str] = ('rest',)) -> Iterator[List[Address]]:
+        """ Yield server addresses from the Steam WebAPI or fallback to the Master Server.
+            The Master Server region 'rest' (0xFF) already covers every region, pass disjoint
+            regions to sweep them in parallel. Addresses are yielded page by page.
+        """
+        addresses = cls.get_webapi_addresses()
+        if addresses:
+            yield addresses
+            return
 
         # Fallback to Master Server
         logging.warning('Steam WebAPI failed, falling back to Master Server')
         try:
-            with master_server.MasterServerQuerier() as msq:
-                addresses = msq.find(region=region, appid=RF2_APPID)
-                return [a for a in addresses]
+            yield from MasterServerStream().batches(regions, appid=RF2_APPID)
         except NoResponseError:
             logging.error('Master Server request timed out.')
         except OSError as e:
@@ -222,5 +244,8 @@ class ServerList:
                 logging.error(f'Master Server request failed: {e}')
         except Exception as e:
             logging.error(f'Master Server request failed with unexpected error: {e}')
-        
-        return []
+
+    @classmethod
+    def get_server_addresses(cls, region='rest') -> list:
+        """Get server addresses from Steam WebAPI or fallback to Master Server."""
+        return [a for batch in cls.server_address_batches([region]) for a in batch]
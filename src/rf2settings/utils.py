@@ -10,12 +10,17 @@ from datetime import datetime
 from pathlib import Path, WindowsPath
 from typing import Tuple, Union, Optional, Dict, Any
 import ctypes
+import importlib.util
+import sys
+from types import ModuleType
 
 import eel
 import gevent
 import psutil
 
 from .globals import get_settings_dir, FROZEN
+# -- Shared with open_vr_mod, re-exported for the rf2settings modules
+from open_vr_mod.util.utils import atomic_write_text  # noqa: F401
 
 try:
     import winreg as registry
@@ -25,11 +30,30 @@ except ImportError:
     registry = None
     WINREG_AVAIL = False
 
-try:
-    import pygame
-    pygame_avail = 1
-except ImportError:
-    pygame_avail = 0
+
+def lazy_import(name: str) -> Optional[ModuleType]:
+    """ Return a module that is executed on first attribute access or None if it is not installed.
+        Keeps heavy modules of single sub systems out of the app start-up.
+    """
+    if name in sys.modules:
+        return sys.modules[name]
+    try:
+        spec = importlib.util.find_spec(name)
+    except (ImportError, ValueError):
+        spec = None
+    if spec is None or spec.loader is None:
+        return None
+
+    spec.loader = importlib.util.LazyLoader(spec.loader)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+# -- pygame is loaded once the controller greenlet starts, after the app window opened
+pygame = lazy_import('pygame')
+pygame_avail = int(pygame is not None)
 
 
 def create_file_safe_name(filename: str, allow_spaces: bool = False) -> str:
@@ -116,6 +140,10 @@ class AppExceptionHook:
         logging.critical(stacktrace_msg)
         logging.critical(exception_msg)
 
+        # -- Do not lose settings changes that are still waiting to be written
+        from .write_behind import flush_all
+        flush_all()
+
         # Write to exception log file
         exception_file_name = datetime.now().strftime('rf2-settings-widget_Exception_%Y-%m-%d_%H%M%S.log')
         exception_file = Path(get_settings_dir()) / exception_file_name
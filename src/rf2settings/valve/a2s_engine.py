@@ -0,0 +1,327 @@
+"""
+Query many A2S servers from one non-blocking UDP socket.
+
+Requests to all servers are sent from a single socket and replies are matched
+to their query by source address. Every address has at most one request in
+flight, so a challenge response always belongs to the last request sent to that
+address. Waiting for replies uses gevent so other greenlets keep running and
+results can be streamed to the frontend as they arrive. Addresses can be streamed
+in as well, eg. page by page from a master server sweep.
+"""
+import io
+import ipaddress
+import logging
+import socket
+import struct
+import time
+from collections import deque
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import gevent
+import gevent.queue
+import gevent.socket
+from a2s.a2s_fragment import decode_fragment
+from a2s.byteio import ByteReader
+from a2s.exceptions import BrokenMessageError
+from a2s.info import InfoProtocol
+from a2s.players import PlayersProtocol
+from a2s.rules import RulesProtocol
+
+HEADER_SIMPLE = b"\xFF\xFF\xFF\xFF"
+HEADER_MULTI = b"\xFE\xFF\xFF\xFF"
+FRAGMENT_HEADER = struct.Struct('<IBBH')    # message id, fragment count, fragment id, mtu
+A2S_CHALLENGE_RESPONSE = 0x41
+
+QUERY_INFO = 'info'
+QUERY_PLAYERS = 'players'
+QUERY_RULES = 'rules'
+
+PROTOCOLS = {QUERY_INFO: InfoProtocol, QUERY_PLAYERS: PlayersProtocol, QUERY_RULES: RulesProtocol}
+
+Address = Tuple[str, int]
+
+
+class A2SQueryResult:
+    def __init__(self, address: Address):
+        self.address = address
+        self.info = None
+        self.players: Optional[list] = None
+        self.rules: Optional[dict] = None
+        self.ping: Optional[float] = None    # Seconds until the first reply to the info query
+        self.errors: Dict[str, str] = dict()
+
+    @property
+    def ok(self) -> bool:
+        return self.info is not None
+
+
+class _AddressQuery:
+    """ State of the queries to one server address """
+    def __init__(self, address: Address, kinds: List[str]):
+        self.result = A2SQueryResult(address)
+        self.kinds = deque(kinds)
+        self.challenge = 0
+        self.challenges_received = 0
+        self.resends = 0
+        self.sent_at = 0.0
+        self.deadline = 0.0
+        self.fragments: Dict[int, list] = dict()  # {message id: [(fragment id, payload)]}
+
+    @property
+    def kind(self) -> str:
+        return self.kinds[0]
+
+
+class A2SQueryEngine:
+    timeout = 1.0           # Seconds to wait for a reply before re-sending or giving up
+    timeout_factors = {QUERY_PLAYERS: 4.0}  # Long, often split player lists get more time
+    resends = 1             # Re-send an unanswered request this many times
+    max_challenges = 5      # Give up if a server keeps sending challenges
+    max_in_flight = 256     # Addresses with an outstanding request
+    poll_interval = 0.05    # Max seconds to block waiting for replies
+    encoding = 'utf-8'
+
+    def __init__(self, timeout: Optional[float] = None, max_in_flight: Optional[int] = None):
+        self.timeout = timeout or self.timeout
+        self.max_in_flight = max_in_flight or self.max_in_flight
+
+        # -- Statistics of the last run
+        self.packets_sent = 0
+        self.packets_received = 0
+        self.unmatched_packets = 0
+
+    @staticmethod
+    def _resolve(address: Address) -> Address:
+        host, port = address
+        try:
+            ipaddress.ip_address(host)
+            return host, int(port)
+        except ValueError:
+            return socket.gethostbyname(host), int(port)
+
+    def run(self, addresses: Sequence[Address], kinds: Sequence[str] = (QUERY_INFO,),
+            on_result: Optional[Callable[[A2SQueryResult], None]] = None) -> List[A2SQueryResult]:
+        """ Query all addresses for the requested kinds of information, in order.
+
+            :param addresses: (host, port) server query addresses
+            :param kinds: any of QUERY_INFO, QUERY_PLAYERS, QUERY_RULES. Queries after a failed info query are skipped.
+            :param on_result: called with every A2SQueryResult as soon as all its queries finished
+            :returns: list of all results
+        """
+        return self.run_stream([addresses], kinds, on_result)
+
+    def run_stream(self, batches: Iterable[Sequence[Address]], kinds: Sequence[str] = (QUERY_INFO,),
+                   on_result: Optional[Callable[[A2SQueryResult], None]] = None) -> List[A2SQueryResult]:
+        """ Query addresses that arrive in batches, eg. the pages of a master server sweep.
+
+            Batches are read in a separate greenlet and their addresses are queried while
+            further batches are still produced. Addresses of earlier batches are skipped.
+            Arguments and result as in run.
+        """
+        self.packets_sent, self.packets_received, self.unmatched_packets = 0, 0, 0
+        results: List[A2SQueryResult] = list()
+        pending, queued = deque(), set()
+        feed = gevent.queue.Queue()
+        producer = gevent.spawn(self._produce, batches, feed)
+        streaming = True
+
+        sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        sock.setblocking(False)
+        in_flight: Dict[Address, _AddressQuery] = dict()
+
+        try:
+            while streaming or pending or in_flight:
+                # -- Take over arrived batches, wait for the next one if there is nothing else to do
+                while streaming:
+                    idle = not pending and not in_flight
+                    try:
+                        batch = feed.get(block=idle, timeout=self.poll_interval if idle else None)
+                    except gevent.queue.Empty:
+                        break
+                    if batch is None:
+                        streaming = False
+                        break
+                    self._queue(batch, kinds, pending, queued, results, on_result)
+
+                # -- Start queries for new addresses
+                while pending and len(in_flight) < self.max_in_flight:
+                    address, resolved = pending.popleft()
+                    query = _AddressQuery(address, list(kinds))
+                    in_flight[resolved] = query
+                    self._send(sock, resolved, query)
+
+                self._receive(sock, in_flight, results, on_result)
+                self._expire(sock, in_flight, results, on_result)
+        finally:
+            producer.kill()
+            sock.close()
+
+        return results
+
+    @staticmethod
+    def _produce(batches: Iterable[Sequence[Address]], feed: gevent.queue.Queue):
+        try:
+            for batch in batches:
+                feed.put(batch)
+        except Exception as e:
+            logging.error('Could not read server addresses: %s', e)
+        finally:
+            feed.put(None)
+
+    def _queue(self, addresses: Sequence[Address], kinds: Sequence[str], pending: deque, queued: set,
+               results: List[A2SQueryResult], on_result):
+        for address in addresses:
+            try:
+                resolved = self._resolve(address)
+                if resolved not in queued:
+                    queued.add(resolved)
+                    pending.append((address, resolved))
+            except OSError as e:
+                result = A2SQueryResult(address)
+                result.errors[kinds[0]] = f'Could not resolve address: {e}'
+                self._finish(result, results, on_result)
+
+    def _send(self, sock: socket.socket, address: Address, query: _AddressQuery):
+        packet = HEADER_SIMPLE + PROTOCOLS[query.kind].serialize_request(query.challenge)
+        while True:
+            try:
+                sock.sendto(packet, address)
+                break
+            except BlockingIOError:
+                gevent.socket.wait_write(sock.fileno(), timeout=self.timeout)
+            except OSError as e:
+                logging.debug('Could not send A2S request to %s: %s', address, e)
+                break
+        self.packets_sent += 1
+        query.sent_at = time.monotonic()
+        query.deadline = query.sent_at + self.timeout * self.timeout_factors.get(query.kind, 1.0)
+
+    def _receive(self, sock: socket.socket, in_flight: Dict[Address, _AddressQuery], results, on_result):
+        if not in_flight:
+            return
+        wait = min(q.deadline for q in in_flight.values()) - time.monotonic()
+        try:
+            gevent.socket.wait_read(sock.fileno(), timeout=max(0.0, min(wait, self.poll_interval)))
+        except socket.timeout:
+            return
+
+        # -- Drain everything that arrived
+        while True:
+            try:
+                packet, address = sock.recvfrom(65535)
+            except (BlockingIOError, InterruptedError):
+                return
+            except OSError as e:
+                # -- eg. ICMP port unreachable reported as ConnectionResetError on Windows
+                logging.debug('A2S socket error: %s', e)
+                continue
+
+            self.packets_received += 1
+            query = in_flight.get(address[:2])
+            if query is None:
+                self.unmatched_packets += 1
+                continue
+            self._handle_packet(sock, address[:2], query, packet, in_flight, results, on_result)
+
+    def _handle_packet(self, sock, address: Address, query: _AddressQuery, packet: bytes,
+                       in_flight: Dict[Address, _AddressQuery], results, on_result):
+        received_at = time.monotonic()
+        if query.result.ping is None and query.kind == QUERY_INFO:
+            query.result.ping = received_at - query.sent_at
+
+        try:
+            stream = self._reassemble(query, packet)
+            if stream is None:
+                # -- Waiting for more fragments
+                return
+            reader = ByteReader(stream, endian="<", encoding=self.encoding)
+            response_type = reader.read_uint8()
+
+            if response_type == A2S_CHALLENGE_RESPONSE:
+                query.challenges_received += 1
+                if query.challenges_received > self.max_challenges:
+                    raise BrokenMessageError('Server keeps sending challenge responses')
+                query.challenge = reader.read_uint32()
+                self._send(sock, address, query)
+                return
+
+            protocol = PROTOCOLS[query.kind]
+            if not protocol.validate_response_type(response_type):
+                raise BrokenMessageError(f'Invalid response type: {hex(response_type)}')
+            setattr(query.result, query.kind, protocol.deserialize_response(reader, response_type, query.result.ping))
+        except Exception as e:
+            query.result.errors[query.kind] = str(e)
+            if query.kind == QUERY_INFO:
+                query.kinds.clear()
+
+        self._next_kind(sock, address, query, in_flight, results, on_result)
+
+    @staticmethod
+    def _reassemble(query: _AddressQuery, packet: bytes) -> Optional[io.BytesIO]:
+        """ Stream positioned at the response, None while fragments are missing
+
+            Fragment payloads are kept as views of their packets and copied once when joined.
+        """
+        header = packet[:4]
+        if header == HEADER_SIMPLE:
+            stream = io.BytesIO(packet)
+            stream.seek(4)
+            return stream
+        if header != HEADER_MULTI:
+            raise BrokenMessageError(f'Invalid packet header: {header!r}')
+        if len(packet) < 4 + FRAGMENT_HEADER.size:
+            raise BrokenMessageError('Incomplete fragment header')
+
+        message_id, fragment_count, fragment_id, _ = FRAGMENT_HEADER.unpack_from(packet, 4)
+        if message_id & (1 << 15):
+            # -- Compressed fragments are rare, leave them to python-a2s
+            payload = decode_fragment(packet[4:]).payload
+        else:
+            payload = memoryview(packet)[4 + FRAGMENT_HEADER.size:]
+
+        fragments = query.fragments.setdefault(message_id, list())
+        fragments.append((fragment_id, payload))
+        if len(fragments) < fragment_count:
+            return None
+
+        query.fragments.pop(message_id)
+        fragments.sort(key=lambda f: f[0])
+        stream = io.BytesIO(b"".join(payload for _, payload in fragments))
+        # Sometimes there's an additional header present
+        if stream.getbuffer()[:4] == HEADER_SIMPLE:
+            stream.seek(4)
+        return stream
+
+    def _next_kind(self, sock, address: Address, query: _AddressQuery, in_flight, results, on_result):
+        if query.kinds:
+            query.kinds.popleft()
+        if query.kinds:
+            query.challenge, query.challenges_received, query.resends = 0, 0, 0
+            query.fragments.clear()
+            self._send(sock, address, query)
+            return
+
+        in_flight.pop(address)
+        self._finish(query.result, results, on_result)
+
+    def _expire(self, sock, in_flight: Dict[Address, _AddressQuery], results, on_result):
+        now = time.monotonic()
+        for address, query in list(in_flight.items()):
+            if now < query.deadline:
+                continue
+            if query.resends < self.resends:
+                query.resends += 1
+                query.fragments.clear()
+                self._send(sock, address, query)
+                continue
+
+            query.result.errors[query.kind] = 'Timed out waiting for response'
+            if query.kind == QUERY_INFO:
+                query.kinds.clear()
+            self._next_kind(sock, address, query, in_flight, results, on_result)
+
+    @staticmethod
+    def _finish(result: A2SQueryResult, results: list, on_result):
+        results.append(result)
+        if on_result is not None:
+            on_result(result)
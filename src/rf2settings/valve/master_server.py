@@ -21,6 +21,85 @@ REGION_REST = 0xFF
 MASTER_SERVER_ADDR = ("hl2master.steampowered.com", 27011)
 
 
+def map_region(region):
+    """Convert string to numeric region identifier
+
+    If given a non-string then a check is performed to ensure it is a
+    valid region identifier. If it's not, ValueError is raised.
+
+    Returns a list of numeric region identifiers.
+    """
+    if isinstance(region, str):
+        try:
+            regions = {
+                "na-east": [REGION_US_EAST_COAST],
+                "na-west": [REGION_US_WEST_COAST],
+                "na": [REGION_US_EAST_COAST, REGION_US_WEST_COAST],
+                "sa": [REGION_SOUTH_AMERICA],
+                "eu": [REGION_EUROPE],
+                "as": [REGION_ASIA, REGION_MIDDLE_EAST],
+                "oc": [REGION_AUSTRALIA],
+                "af": [REGION_AFRICA],
+                "rest": [REGION_REST],
+                "all": [REGION_US_EAST_COAST,
+                        REGION_US_WEST_COAST,
+                        REGION_SOUTH_AMERICA,
+                        REGION_EUROPE,
+                        REGION_ASIA,
+                        REGION_AUSTRALIA,
+                        REGION_MIDDLE_EAST,
+                        REGION_AFRICA,
+                        REGION_REST],
+            }[region.lower()]
+        except KeyError:
+            raise ValueError(
+                "Invalid region identifer {!r}".format(region))
+    else:
+        # Just assume it's an integer identifier, we'll validate below
+        regions = [region]
+    for reg in regions:
+        if reg not in {REGION_US_EAST_COAST,
+                       REGION_US_WEST_COAST,
+                       REGION_SOUTH_AMERICA,
+                       REGION_EUROPE,
+                       REGION_ASIA,
+                       REGION_AUSTRALIA,
+                       REGION_MIDDLE_EAST,
+                       REGION_AFRICA,
+                       REGION_REST}:
+            raise ValueError("Invalid region identifier {!r}".format(reg))
+    return regions
+
+
+def build_filter_string(**filters):
+    """Build the filter string of a master server request, see :meth:`MasterServerQuerier.find`"""
+    filter_ = {}
+    for key, value in filters.items():
+        if key in {"secure", "linux", "empty",
+                   "full", "proxy", "noplayers", "white"}:
+            value = int(bool(value))
+        elif key in {"gametype", "gamedata", "gamedataor"}:
+            value = [str(elt)
+                     for elt in value if str(elt)]
+            if not value:
+                continue
+            value = ",".join(value)
+        elif key == "napp":
+            value = int(value)
+        elif key == "type":
+            if not isinstance(value, util.ServerType):
+                value = util.ServerType(value).char
+            else:
+                value = value.char
+        filter_[key] = str(value)
+    # Order doesn't actually matter, but it makes testing easier
+    filter_ = sorted(filter_.items(), key=lambda pair: pair[0])
+    filter_string = "\\".join([part for pair in filter_ for part in pair])
+    if filter_string:
+        filter_string = "\\" + filter_string
+    return filter_string
+
+
 class Duplicates(enum.Enum):
     """Behaviour for duplicate addresses.
 
@@ -128,53 +207,8 @@ class MasterServerQuerier(rf2settings.valve.BaseQuerier):
                 seen.add(address)
 
     def _map_region(self, region):
-        """Convert string to numeric region identifier
-
-        If given a non-string then a check is performed to ensure it is a
-        valid region identifier. If it's not, ValueError is raised.
-
-        Returns a list of numeric region identifiers.
-        """
-        if isinstance(region, str):
-            try:
-                regions = {
-                    "na-east": [REGION_US_EAST_COAST],
-                    "na-west": [REGION_US_WEST_COAST],
-                    "na": [REGION_US_EAST_COAST, REGION_US_WEST_COAST],
-                    "sa": [REGION_SOUTH_AMERICA],
-                    "eu": [REGION_EUROPE],
-                    "as": [REGION_ASIA, REGION_MIDDLE_EAST],
-                    "oc": [REGION_AUSTRALIA],
-                    "af": [REGION_AFRICA],
-                    "rest": [REGION_REST],
-                    "all": [REGION_US_EAST_COAST,
-                            REGION_US_WEST_COAST,
-                            REGION_SOUTH_AMERICA,
-                            REGION_EUROPE,
-                            REGION_ASIA,
-                            REGION_AUSTRALIA,
-                            REGION_MIDDLE_EAST,
-                            REGION_AFRICA,
-                            REGION_REST],
-                }[region.lower()]
-            except KeyError:
-                raise ValueError(
-                    "Invalid region identifer {!r}".format(region))
-        else:
-            # Just assume it's an integer identifier, we'll validate below
-            regions = [region]
-        for reg in regions:
-            if reg not in {REGION_US_EAST_COAST,
-                           REGION_US_WEST_COAST,
-                           REGION_SOUTH_AMERICA,
-                           REGION_EUROPE,
-                           REGION_ASIA,
-                           REGION_AUSTRALIA,
-                           REGION_MIDDLE_EAST,
-                           REGION_AFRICA,
-                           REGION_REST}:
-                raise ValueError("Invalid region identifier {!r}".format(reg))
-        return regions
+        """Convert string to numeric region identifier, see :func:`map_region`"""
+        return map_region(region)
 
     def find(self, region="all", duplicates=Duplicates.SKIP, **filters):
         """Find servers for a particular region and set of filtering rules
@@ -288,30 +322,7 @@ class MasterServerQuerier(rf2settings.valve.BaseQuerier):
             regions = []
             for reg in region:
                 regions.extend(self._map_region(reg))
-        filter_ = {}
-        for key, value in filters.items():
-            if key in {"secure", "linux", "empty",
-                       "full", "proxy", "noplayers", "white"}:
-                value = int(bool(value))
-            elif key in {"gametype", "gamedata", "gamedataor"}:
-                value = [str(elt)
-                         for elt in value if str(elt)]
-                if not value:
-                    continue
-                value = ",".join(value)
-            elif key == "napp":
-                value = int(value)
-            elif key == "type":
-                if not isinstance(value, util.ServerType):
-                    value = util.ServerType(value).char
-                else:
-                    value = value.char
-            filter_[key] = str(value)
-        # Order doesn't actually matter, but it makes testing easier
-        filter_ = sorted(filter_.items(), key=lambda pair: pair[0])
-        filter_string = "\\".join([part for pair in filter_ for part in pair])
-        if filter_string:
-            filter_string = "\\" + filter_string
+        filter_string = build_filter_string(**filters)
         queries = []
         for region in regions:
             queries.append(self._query(region, filter_string))
@@ -0,0 +1,141 @@
+"""
+Stream server addresses from the Steam master server, sweeping regions in parallel.
+
+MasterServerQuerier walks one region after another, page by page, on a blocking
+socket. MasterServerStream sweeps every requested region in its own greenlet with
+its own socket and requests the next page as soon as one arrives, at most
+max_sweeps regions at a time. Pages are
+yielded as address batches while the sweeps continue, with addresses already
+yielded by another region removed, so the A2S query stage can start with the
+first page. A page that does not arrive in time is requested again, a region that
+keeps timing out ends its sweep without affecting the others.
+"""
+import logging
+import socket
+from typing import Iterable, Iterator, List, Optional, Set, Tuple, Union
+
+import gevent
+import gevent.lock
+import gevent.queue
+import gevent.socket
+
+from rf2settings.valve import messages, NoResponseError
+from rf2settings.valve.master_server import MASTER_SERVER_ADDR, build_filter_string, map_region
+
+Address = Tuple[str, int]
+NULL_ADDRESS = '0.0.0.0:0'
+RESPONSE_HEADER = b'\xFF\xFF\xFF\xFF\x66\x0A'
+
+
+class MasterServerStream:
+    timeout = 3.0   # Seconds to wait for a page before requesting it again
+    retries = 2     # Request a page this many more times before the region sweep is given up
+    max_sweeps = 2  # Regions swept at the same time, the others wait for a free slot
+
+    def __init__(self, address: Address = MASTER_SERVER_ADDR, timeout: Optional[float] = None):
+        self.host, self.port = address
+        self.timeout = timeout or self.timeout
+
+        # -- Statistics of the last sweep
+        self.pages = 0
+        self.addresses = 0
+        self.duplicates = 0
+        self.failed_regions: List[int] = list()
+
+    def batches(self, regions: Iterable[Union[str, int]] = ('all',), **filters) -> Iterator[List[Address]]:
+        """ Yield lists of new (host, port) addresses as the pages of all regions arrive
+
+            :param regions: region strings or REGION_ constants, see master_server.map_region
+            :param filters: master server filters, see MasterServerQuerier.find
+        """
+        region_codes = list()
+        for region in regions:
+            region_codes += [r for r in map_region(region) if r not in region_codes]
+
+        self.pages, self.addresses, self.duplicates, self.failed_regions = 0, 0, 0, list()
+        host = gevent.socket.gethostbyname(self.host)
+        filter_string = build_filter_string(**filters)
+        feed = gevent.queue.Queue()
+        slots = gevent.lock.BoundedSemaphore(self.max_sweeps)
+        sweeps = [gevent.spawn(self._sweep, (host, self.port), region, filter_string, feed, slots)
+                  for region in region_codes]
+
+        seen: Set[Address] = set()
+        running = len(sweeps)
+        try:
+            while running:
+                page = feed.get()
+                if page is None:
+                    running -= 1
+                    continue
+
+                batch = list()
+                for address in page:
+                    if address not in seen:
+                        seen.add(address)
+                        batch.append(address)
+                self.duplicates += len(page) - len(batch)
+                self.addresses += len(batch)
+                if batch:
+                    yield batch
+        finally:
+            gevent.killall(sweeps)
+
+        logging.debug('Master server sweep of %s regions: %s pages, %s addresses, %s duplicates, failed regions %s',
+                      len(region_codes), self.pages, self.addresses, self.duplicates, self.failed_regions)
+
+    def _sweep(self, address: Address, region: int, filter_string: str, feed: gevent.queue.Queue,
+               slots: gevent.lock.BoundedSemaphore):
+        slots.acquire()
+        sock = gevent.socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        sock.settimeout(self.timeout)
+        last_address = NULL_ADDRESS
+        try:
+            while True:
+                request = messages.MasterServerRequest(region=region, address=last_address, filter=filter_string)
+                response = messages.MasterServerResponse.decode(self._request(sock, address, request.encode()))
+                self.pages += 1
+
+                page, last_address = list(), NULL_ADDRESS
+                for entry in response['addresses']:
+                    last_address = f'{entry["host"]}:{entry["port"]}'
+                    if not entry.is_null:
+                        page.append((entry['host'], entry['port']))
+                if page:
+                    feed.put(page)
+                if last_address == NULL_ADDRESS:
+                    break
+        except NoResponseError as e:
+            logging.warning('Master server did not answer for region %s: %s', region, e)
+            self.failed_regions.append(region)
+        except (OSError, messages.BrokenMessageError) as e:
+            logging.error('Master server request for region %s failed: %s', region, e)
+            self.failed_regions.append(region)
+        finally:
+            sock.close()
+            slots.release()
+            feed.put(None)
+
+    def _request(self, sock: socket.socket, address: Address, request: bytes) -> bytes:
+        self._drain(sock)
+        for _ in range(self.retries + 1):
+            sock.sendto(request, address)
+            try:
+                while True:
+                    data, source = sock.recvfrom(65536)
+                    if source[:2] == address and data.startswith(RESPONSE_HEADER):
+                        return data
+            except socket.timeout:
+                continue
+        raise NoResponseError(f'No response after {self.retries + 1} requests')
+
+    def _drain(self, sock: socket.socket):
+        """ Discard late answers to a page that was requested again, they would be taken for the next page """
+        sock.settimeout(0.0)
+        try:
+            while True:
+                sock.recvfrom(65536)
+        except (BlockingIOError, socket.timeout):
+            pass
+        finally:
+            sock.settimeout(self.timeout)
@@ -3,6 +3,7 @@
 
 import collections
 import collections.abc
+import re
 import struct
 
 from rf2settings.valve import util
@@ -10,6 +11,11 @@ from rf2settings.valve import util
 NO_SPLIT = -1
 SPLIT = -2
 
+# memoryview has no find, the terminator of a string is searched with a pattern
+_STRING_TERMINATOR = re.compile(b"\x00")
+# Format characters that read single bytes, their byte order does not matter
+_BYTE_FORMATS = frozenset("xcbB?s0123456789")
+
 
 class BrokenMessageError(Exception):
     pass
@@ -37,9 +43,24 @@ def needs_buffer(func):
     return needs_buffer
 
 
+class LazyString(object):
+    """String field value that is decoded when first accessed through the message"""
+
+    __slots__ = ("data", "start", "end")
+
+    def __init__(self, data, start, end):
+        self.data = data
+        self.start = start
+        self.end = end
+
+    def decode(self):
+        return str(self.data[self.start:self.end], "utf8", "ignore")
+
+
 class MessageField(object):
 
     fmt = None
+    fixed_size = True   # Decoded by unpacking fmt, may be unpacked together with neighbouring fields
     validators = []
 
     def __init__(self, name, optional=False,
@@ -63,6 +84,8 @@ class MessageField(object):
                 self.format = "<" + self.fmt
             else:
                 self.format = self.fmt
+            if self.fixed_size:
+                self.struct = struct.Struct(self.format)
         self.name = name
         self.optional = optional
         self._value = default_value
@@ -113,16 +136,18 @@ class MessageField(object):
             how many player entries to attempt to decode.
         """
 
-        field_size = struct.calcsize(self.format)
+        field_size = self.struct.size
         if len(buffer) < field_size:
             raise BufferExhaustedError
-        field_data = buffer[:field_size]
-        left_overs = buffer[field_size:]
         try:
-            return (self.validate(
-                struct.unpack(self.format, field_data)[0]), left_overs)
+            value = self.convert(self.struct.unpack_from(buffer))
         except struct.error as exc:
             raise BrokenMessageError(exc)
+        return self.validate(value), buffer[field_size:]
+
+    def convert(self, values):
+        """Convert the unpacked values of the field to its value"""
+        return values[0]
 
 
 class ByteField(MessageField):
@@ -131,6 +156,7 @@ class ByteField(MessageField):
 
 class StringField(MessageField):
     fmt = "s"
+    fixed_size = False
 
     @use_default
     def encode(self, value, values={}):
@@ -138,13 +164,14 @@ class StringField(MessageField):
 
     @needs_buffer
     def decode(self, buffer, values={}):
-        terminator = buffer.find(b"\x00")
-        if terminator == -1:
+        terminator = _STRING_TERMINATOR.search(buffer)
+        if terminator is None:
             raise BufferExhaustedError("No string terminator")
-        field_size = terminator + 1
-        field_data = buffer[:field_size-1]
-        left_overs = buffer[field_size:]
-        return field_data.decode("utf8", "ignore"), left_overs
+        terminator = terminator.start()
+        value = LazyString(buffer, 0, terminator)
+        if self.validators:
+            value = self.validate(value.decode())
+        return value, buffer[terminator + 1:]
 
 
 class ShortField(MessageField):
@@ -161,20 +188,14 @@ class FloatField(MessageField):
 
 class PlatformField(ByteField):
 
-    @needs_buffer
-    def decode(self, buffer, values={}):
-        byte, remnant_buffer = super(PlatformField,
-                                     self).decode(buffer, values)
-        return util.Platform(byte), remnant_buffer
+    def convert(self, values):
+        return util.Platform(values[0])
 
 
 class ServerTypeField(ByteField):
 
-    @needs_buffer
-    def decode(self, buffer, values={}):
-        byte, remnant_buffer = super(ServerTypeField,
-                                     self).decode(buffer, values)
-        return util.ServerType(byte), remnant_buffer
+    def convert(self, values):
+        return util.ServerType(values[0])
 
 
 class MessageArrayField(MessageField):
@@ -315,6 +336,7 @@ class MessageArrayField(MessageField):
             return i[0]
 
         all_.minimum = -1
+        all_.unbounded = True
         return all_
 
     @staticmethod
@@ -330,6 +352,7 @@ class MessageArrayField(MessageField):
             return i[0]
 
         at_least.minimum = minimum
+        at_least.unbounded = True
         return at_least
 
 
@@ -364,6 +387,172 @@ class MessageDictField(MessageArrayField):
         return entries_dict, buffer
 
 
+class _DecodePlan(object):
+    """
+        Precompiled decoding steps of a message.
+
+        Runs of fixed size fields are unpacked with one struct, strings are
+        located with bytes.find and arrays decode their elements with the
+        element's plan. All steps read the packet at an offset, so neither
+        the packet nor the data left over is copied while decoding.
+
+        Strings of a lazy plan are kept as LazyString and decoded when
+        accessed through Message.__getitem__. Array elements are plentiful
+        and small, their strings are decoded right away.
+    """
+
+    STRUCT, STRING, ARRAY, DICT, STRING_DICT = range(5)
+
+    def __init__(self, steps, lazy):
+        self.steps = steps
+        self.lazy = lazy
+
+    @classmethod
+    def compile(cls, fields, lazy=True):
+        """Plan of fields or None if a field decodes itself"""
+        steps = []
+        run = []
+
+        def close_run():
+            if run:
+                steps.append((cls.STRUCT, _struct_run(run), [
+                    (f, slice(start, stop)) for f, start, stop in _run_slices(run)]))
+                del run[:]
+
+        for field in fields:
+            field_type = type(field)
+            if field.fixed_size and field.fmt is not None and field_type.decode is MessageField.decode:
+                order = _byte_order([field])
+                if order is not None and _byte_order(run) not in (None, order):
+                    close_run()
+                run.append(field)
+                continue
+
+            close_run()
+            if field_type.decode is StringField.decode:
+                steps.append((cls.STRING, field, None))
+            elif field_type.decode in (MessageArrayField.decode, MessageDictField.decode):
+                element_plan = field.element.plan(lazy=False)
+                if element_plan is None:
+                    return None
+                if field_type.decode is MessageArrayField.decode:
+                    kind = cls.ARRAY
+                elif all(k == cls.STRING and not f.validators for k, f, _ in element_plan.steps):
+                    kind = cls.STRING_DICT
+                else:
+                    kind = cls.DICT
+                steps.append((kind, field, element_plan))
+            else:
+                return None
+        close_run()
+        return cls(steps, lazy)
+
+    def decode(self, data, offset=0, values=None):
+        """Decode the fields from data, a bytes object, at offset. Returns the values and the end offset."""
+        if values is None:
+            values = {}
+        end = len(data)
+        for kind, field, detail in self.steps:
+            if kind == self.STRUCT:
+                if end - offset < field.size:
+                    raise BufferExhaustedError
+                raw = field.unpack_from(data, offset)
+                offset += field.size
+                for f, part in detail:
+                    values[f.name] = f.validate(f.convert(raw[part]))
+            elif kind == self.STRING:
+                terminator = data.find(b"\x00", offset)
+                if terminator == -1:
+                    raise BufferExhaustedError("No string terminator")
+                if self.lazy and not field.validators:
+                    values[field.name] = LazyString(data, offset, terminator)
+                else:
+                    values[field.name] = field.validate(str(data[offset:terminator], "utf8", "ignore"))
+                offset = terminator + 1
+            elif kind == self.STRING_DICT:
+                values[field.name], offset = self._decode_string_dict(field, data, offset, values)
+            else:
+                entries, offset = self._decode_array(field, detail, data, offset, values)
+                if kind == self.DICT:
+                    key, value = field.key_field.name, field.value_field.name
+                    entries = {e[key]: e[value] for e in entries}
+                values[field.name] = entries
+        return values, offset
+
+    @staticmethod
+    def _decode_array(field, element_plan, data, offset, values):
+        """Decode elements until count is reached, stops at an incomplete element like MessageArrayField.decode"""
+        count = field.count(values)
+        if getattr(field.count, "unbounded", False):
+            count = len(data)
+        element = field.element
+        entries = []
+        steps = element_plan.steps
+        if len(steps) == 1 and steps[0][0] == _DecodePlan.STRUCT:
+            # -- Fixed size elements, eg. master server addresses, are unpacked in one pass
+            _, layout, parts = steps[0]
+            available = min(count, (len(data) - offset) // layout.size)
+            end = offset + available * layout.size
+            try:
+                for raw in layout.iter_unpack(memoryview(data)[offset:end]):
+                    entries.append(element(None, **{f.name: f.validate(f.convert(raw[part])) for f, part in parts}))
+            except BrokenMessageError:
+                pass
+            offset += len(entries) * layout.size
+        else:
+            while len(entries) < count and offset < len(data):
+                try:
+                    entry_values, offset = element_plan.decode(data, offset)
+                except BrokenMessageError:
+                    break
+                entries.append(element(None, **entry_values))
+        if len(entries) < field.count.minimum:
+            raise BrokenMessageError(BufferExhaustedError())
+        return entries, offset
+
+    @staticmethod
+    def _decode_string_dict(field, data, offset, values):
+        """Decode key-value pairs of strings without creating element messages"""
+        count = field.count(values)
+        if getattr(field.count, "unbounded", False):
+            count = len(data)
+        entries = {}
+        decoded = 0
+        while decoded < count:
+            key_end = data.find(b"\x00", offset)
+            if key_end == -1:
+                break
+            value_end = data.find(b"\x00", key_end + 1)
+            if value_end == -1:
+                break
+            entries[str(data[offset:key_end], "utf8", "ignore")] = str(data[key_end + 1:value_end], "utf8", "ignore")
+            offset = value_end + 1
+            decoded += 1
+        if decoded < field.count.minimum:
+            raise BrokenMessageError(BufferExhaustedError())
+        return entries, offset
+
+
+def _byte_order(fields):
+    """Byte order character of fields, None if they only read single bytes"""
+    for field in fields:
+        if not set(field.format[1:]) <= _BYTE_FORMATS:
+            return field.format[0]
+    return None
+
+
+def _struct_run(fields):
+    return struct.Struct((_byte_order(fields) or "<") + "".join(f.format[1:] for f in fields))
+
+
+def _run_slices(fields):
+    start = 0
+    for field in fields:
+        stop = start + len(field.struct.unpack(bytes(field.struct.size)))
+        yield field, start, stop
+        start = stop
+
+
 class Message(collections.abc.Mapping):
 
     fields = ()
@@ -374,7 +563,10 @@ class Message(collections.abc.Mapping):
         self.values = field_values
 
     def __getitem__(self, key):
-        return self.values[key]
+        value = self.values[key]
+        if type(value) is LazyString:
+            value = self.values[key] = value.decode()
+        return value
 
     def __setitem__(self, key, value):
         self.values[key] = value
@@ -389,19 +581,42 @@ class Message(collections.abc.Mapping):
         return iter(self.values)
 
     def encode(self, **field_values):
-        values = dict(self.values, **field_values)
+        values = {key: self[key] for key in self.values}
+        values.update(field_values)
         buf = []
         for field in self.fields:
             buf.append(field.encode(values.get(field.name, None), values))
         return b"".join(buf)
 
     @classmethod
-    def decode(cls, packet):
-        buffer = packet
-        values = {}
-        for field in cls.fields:
-            values[field.name], buffer = field.decode(buffer, values)
-        return cls(buffer, **values)
+    def plan(cls, lazy=True):
+        """Precompiled decoding plan of the message or None if a field decodes itself"""
+        name = "_plan" if lazy else "_element_plan"
+        if name not in cls.__dict__:
+            setattr(cls, name, _DecodePlan.compile(cls.fields, lazy))
+        return cls.__dict__[name]
+
+    @classmethod
+    def decode(cls, packet, offset=0):
+        """
+            Decode packet, a bytes-like object, starting at offset.
+
+            The payload of the message is a memoryview of the data left
+            over. Array elements are decoded without a payload.
+        """
+        plan = cls.plan()
+        if plan is None:
+            buffer = memoryview(packet)[offset:]
+            values = {}
+            for field in cls.fields:
+                values[field.name], buffer = field.decode(buffer, values)
+            return cls(buffer, **values)
+
+        if type(packet) is not bytes:
+            packet = bytes(memoryview(packet)[offset:])
+            offset = 0
+        values, offset = plan.decode(packet, offset)
+        return cls(memoryview(packet)[offset:], **values)
 
 
 class Header(Message):
@@ -522,8 +737,8 @@ class RulesResponse(Message):
         #
         # Behaviour witnessed with TF2 server 94.23.226.200:2045
         # As of 2015-11-22, Quake Live servers on steam do not
-        if packet.startswith(b'\xff\xff\xff\xff'):
-            packet = packet[4:]
+        if packet[:4] == b'\xff\xff\xff\xff':
+            return super(cls, RulesResponse).decode(packet, 4)
         return super(cls, RulesResponse).decode(packet)
 
 
@@ -533,15 +748,10 @@ class MSAddressEntryPortField(MessageField):
 
 
 class MSAddressEntryIPField(MessageField):
+    fmt = "BBBB"
 
-    @needs_buffer
-    def decode(self, buffer, values={}):
-        if len(buffer) < 4:
-            raise BufferExhaustedError
-        field_data = buffer[:4]
-        left_overs = buffer[4:]
-        return (".".join(str(b) for b in
-                struct.unpack(b"<BBBB", field_data)), left_overs)
+    def convert(self, values):
+        return "%d.%d.%d.%d" % values
 
 
 class MasterServerRequest(Message):
@@ -6,8 +6,8 @@ import winreg as registry
 from pathlib import Path, WindowsPath
 from typing import Iterable, List, Optional, Tuple
 
-from . import acf
-from ..globals import KNOWN_APPS
+from open_vr_mod.valve.steam_catalog import SteamCatalog
+from ..globals import KNOWN_APPS, STEAM_CATALOG_FILE_NAME, get_settings_dir
 from ..utils import convert_unit, SizeUnit
 
 STEAM_LIBRARY_FOLDERS = 'LibraryFolders'
@@ -15,6 +15,15 @@ STEAM_LIBRARY_FILE = 'libraryfolders.vdf'
 STEAM_APPS_FOLDER = 'steamapps'
 STEAM_APPS_INSTALL_FOLDER = 'common'
 
+_steam_catalog: Optional[SteamCatalog] = None
+
+
+def get_steam_catalog() -> SteamCatalog:
+    global _steam_catalog
+    if _steam_catalog is None:
+        _steam_catalog = SteamCatalog(get_settings_dir() / STEAM_CATALOG_FILE_NAME)
+    return _steam_catalog
+
 
 class SteamApps:
     def __init__(self):
@@ -23,6 +32,7 @@ class SteamApps:
 
     def read_steam_library(self):
         self.steam_apps, self.known_apps = self.find_installed_steam_games()
+        self.steam_app_names = {m.get('name'): app_id for app_id, m in self.steam_apps.items() if isinstance(m, dict)}
 
     def find_game_location(self, app_id: int = 0, app_name: str = '') -> Optional[Path]:
         """ Shorthand method to search installed apps via either id or name """
@@ -58,34 +68,13 @@ class SteamApps:
     @classmethod
     def find_steam_libraries(cls) -> Optional[List[Path]]:
         """ Return Steam Library Path's as pathlib.Path objects """
-        steam_apps_dir = Path(cls.find_steam_location()) / STEAM_APPS_FOLDER
-        steam_lib_file = steam_apps_dir / STEAM_LIBRARY_FILE
-        if not steam_lib_file.exists():
-            return [steam_apps_dir]
+        steam_location = cls.find_steam_location()
+        if not steam_location:
+            return list()
 
-        lib_data, lib_folders = dict(), [steam_apps_dir]
-        try:
-            with open(steam_lib_file.as_posix(), 'r') as f:
-                lib_data = acf.load(f)
-        except Exception as e:
-            logging.error(f'Could not read Steam Library {steam_lib_file.name} file: {e}')
-
-        # "LibraryFolders" => "libraryfolders"
-        if STEAM_LIBRARY_FOLDERS.casefold() in lib_data:
-            lib_data[STEAM_LIBRARY_FOLDERS] = lib_data.get(STEAM_LIBRARY_FOLDERS.casefold())
-
-        for k, v in lib_data.get(STEAM_LIBRARY_FOLDERS, dict()).items():
-            if isinstance(k, str) and k.isdigit():
-                if isinstance(v, str):
-                    lib_dir = Path(v) / STEAM_APPS_FOLDER
-                    if lib_dir.exists():
-                        lib_folders.append(lib_dir)
-                elif isinstance(v, dict):
-                    lib_dir = Path(v.get('path')) / STEAM_APPS_FOLDER
-                    if lib_dir.exists():
-                        lib_folders.append(lib_dir)
-
-        return lib_folders
+        catalog = get_steam_catalog()
+        catalog.refresh(Path(steam_location))
+        return catalog.libraries
 
     @staticmethod
     def _add_path(manifest: dict, lib_folders):
@@ -117,41 +106,27 @@ class SteamApps:
         if not lib_folders:
             return steam_apps, _known_apps
 
-        for lib in lib_folders:
-            for manifest_file in lib.glob('appmanifest*.acf'):
-                try:
-                    with open(manifest_file.as_posix(), 'r', encoding='utf-8') as f:
-                        manifest = acf.load(f)
-                        if manifest is not None:
-                            manifest = manifest.get('AppState')
-
-                            # -- Skip invalid manifests
-                            if manifest is None:
-                                logging.warning('Skipping invalid App entry: %s', manifest_file.as_posix())
-                                continue
-
-                            # -- Add human readable size
-                            manifest['sizeGb'] = f"{convert_unit(manifest.get('SizeOnDisk', 0), SizeUnit.GB):.0f} GB"
-
-                            # -- Add Path information
-                            self._add_path(manifest, lib_folders)
-
-                            # -- Add known apps entries data
-                            app_id = manifest.get('appid')
-
-                            # -- Skip invalid IDs
-                            if app_id is None:
-                                logging.warning('Skipping App entry without id: %s', manifest_file.as_posix())
-                                continue
-
-                            if app_id in _known_apps:
-                                for k, v in _known_apps[app_id].items():
-                                    manifest[k] = v
-
-                            # -- Store Entry
-                            steam_apps[app_id] = manifest
-                except Exception as e:
-                    logging.error('Error reading Steam App manifest: %s %s', manifest_file, e)
+        for manifest_file, app_state in get_steam_catalog().apps():
+            try:
+                # -- Copy the cached manifest before adding local information
+                manifest = dict(app_state)
+
+                # -- Add human readable size
+                manifest['sizeGb'] = f"{convert_unit(manifest.get('SizeOnDisk', 0), SizeUnit.GB):.0f} GB"
+
+                # -- Add Path information
+                self._add_path(manifest, lib_folders)
+
+                # -- Add known apps entries data
+                app_id = manifest.get('appid')
+                if app_id in _known_apps:
+                    for k, v in _known_apps[app_id].items():
+                        manifest[k] = v
+
+                # -- Store Entry
+                steam_apps[app_id] = manifest
+            except Exception as e:
+                logging.error('Error reading Steam App manifest: %s %s', manifest_file, e)
 
         for app_id, entry_dict in _known_apps.items():
             if app_id in steam_apps:
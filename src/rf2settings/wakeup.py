@@ -0,0 +1,97 @@
+"""
+Let greenlet loops block until there is work for them instead of sleeping fixed intervals.
+
+A loop waits on its WakeUp. The WakeUp returns once one of its watched events is set,
+it is notified, or the timeout passes. Notifications that arrive while the loop is
+busy are coalesced into one wake-up. Threads, eg. the RfactorConnect request thread,
+use notify_threadsafe, which hands the notification to the gevent hub.
+
+Every WakeUp counts its wake-ups so idle and busy loops can be told apart in the log
+and in the frontend.
+"""
+import logging
+import time
+from typing import Dict, Optional
+
+import gevent
+import gevent.event
+
+
+class WakeUp:
+    instances: Dict[str, 'WakeUp'] = dict()
+
+    def __init__(self, name: str, *events: gevent.event.Event):
+        """ Wake-up source of a greenlet loop
+
+            :param name: name the counters are reported with
+            :param events: events that wake the loop while they are set, the loop needs to clear them
+        """
+        self.name = name
+        self.events = list(events)
+        self._notified = gevent.event.Event()
+        self._async = None
+        self.started = time.time()
+
+        self.wakeups = 0        # Loop iterations started by an event or notification
+        self.timeouts = 0       # Loop iterations started by the timeout
+        self.notifications = 0  # Calls to notify
+        self.coalesced = 0      # Notifications that arrived while a wake-up was already pending
+
+        WakeUp.instances[name] = self
+
+    def watch(self, *events: gevent.event.Event):
+        self.events.extend(events)
+
+    def notify(self):
+        """ Wake the loop, must be called from the thread running the gevent hub """
+        self.notifications += 1
+        if self._notified.is_set():
+            self.coalesced += 1
+        self._notified.set()
+
+    def notify_threadsafe(self):
+        """ Wake the loop from another thread """
+        watcher = self._async
+        if watcher is not None:
+            watcher.send()
+
+    def _prepare_async(self):
+        if self._async is None:
+            # -- Created in the hub thread, does not keep the hub alive on its own
+            self._async = gevent.get_hub().loop.async_(ref=False)
+            self._async.start(self.notify)
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """ Block until an event is set, a notification arrives or timeout seconds passed.
+            Returns False if the timeout passed.
+        """
+        self._prepare_async()
+        ready = gevent.wait([self._notified] + self.events, timeout=timeout, count=1)
+        self._notified.clear()
+
+        if not ready:
+            self.timeouts += 1
+            return False
+        self.wakeups += 1
+        return True
+
+    def stats(self) -> dict:
+        seconds = max(0.001, time.time() - self.started)
+        return {'wakeups': self.wakeups, 'timeouts': self.timeouts, 'notifications': self.notifications,
+                'coalesced': self.coalesced, 'per_second': (self.wakeups + self.timeouts) / seconds}
+
+    def close(self):
+        if self._async is not None:
+            self._async.close()
+            self._async = None
+
+
+def wakeup_stats() -> Dict[str, dict]:
+    return {name: w.stats() for name, w in WakeUp.instances.items()}
+
+
+def log_wakeup_stats():
+    for name, stats in wakeup_stats().items():
+        logging.info('%s loop woke %s times by events, %s times by timeout, %.2f/s, '
+                     'notifications %s, coalesced %s', name, stats['wakeups'], stats['timeouts'],
+                     stats['per_second'], stats['notifications'], stats['coalesced'])
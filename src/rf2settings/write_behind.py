@@ -0,0 +1,162 @@
+"""
+Coalesce bursts of settings saves into single file writes.
+
+Saving only marks a section of a WriteBehind dirty. The section is serialized and
+written once no further save arrived for delay seconds, but no later than max_delay
+seconds after the first unsaved change. Sections are serialized at write time, so a
+burst of changes, eg. editing the benchmark queue or dragging a slider in the UI, ends
+up in one write of the latest state. Content equal to the last written content is
+not written again.
+
+Files are replaced atomically. Pending changes are flushed at exit and by the
+exception hook, the counters are logged when flushing at exit.
+"""
+import atexit
+import logging
+import time
+from pathlib import Path
+from typing import Callable, Dict, Optional, Set
+
+import gevent
+
+from .utils import atomic_write_text
+
+
+class _Section:
+    def __init__(self, file: Callable[[], Path], serialize: Callable[[], str],
+                 written: Optional[Callable[[], None]] = None):
+        self.file = file
+        self.serialize = serialize
+        self.written = written
+        self.last_text: Optional[str] = None
+
+
+class WriteBehind:
+    instances: Dict[str, 'WriteBehind'] = dict()
+    _atexit_registered = False
+
+    def __init__(self, name: str, delay: float = 0.5, max_delay: float = 5.0):
+        """ Debounced writer of one or more settings files
+
+            :param name: name the counters are reported with
+            :param delay: write after this many seconds without further changes
+            :param max_delay: write at the latest this many seconds after the first unsaved change
+        """
+        self.name = name
+        self.delay = delay
+        self.max_delay = max_delay
+        self.sections: Dict[str, _Section] = dict()
+        self.dirty: Set[str] = set()
+        self._first_dirty = 0.0
+        self._deadline = 0.0
+        self._greenlet: Optional[gevent.Greenlet] = None
+
+        self.requests = 0
+        self.coalesced = 0
+        self.writes = 0
+        self.unchanged = 0
+        self.errors = 0
+        self.write_seconds = 0.0
+        self.max_write_seconds = 0.0
+
+        WriteBehind.instances[name] = self
+        if not WriteBehind._atexit_registered:
+            atexit.register(flush_all, log_stats=True)
+            WriteBehind._atexit_registered = True
+
+    def add_section(self, name: str, file: Callable[[], Path], serialize: Callable[[], str],
+                    written: Optional[Callable[[], None]] = None):
+        """ Register a file
+
+            :param name: section name used with mark_dirty
+            :param file: returns the path of the file
+            :param serialize: returns the file content
+            :param written: called after the content was written
+        """
+        self.sections[name] = _Section(file, serialize, written)
+
+    def mark_dirty(self, *sections: str):
+        """ Schedule a write of sections """
+        now = time.monotonic()
+        self.requests += 1
+        if self.dirty:
+            self.coalesced += 1
+        else:
+            self._first_dirty = now
+        self.dirty.update(sections)
+        self._deadline = min(now + self.delay, self._first_dirty + self.max_delay)
+
+        if self._greenlet is None:
+            self._greenlet = gevent.spawn(self._flush_later)
+
+    def _flush_later(self):
+        try:
+            while self.dirty:
+                while self.dirty and time.monotonic() < self._deadline:
+                    gevent.sleep(self._deadline - time.monotonic())
+                if self.flush():
+                    break
+                # -- Retry failed writes after max_delay, further saves do not move the retry earlier
+                self._first_dirty = time.monotonic()
+                self._deadline = self._first_dirty + self.max_delay
+        finally:
+            self._greenlet = None
+
+    @property
+    def pending(self) -> bool:
+        return bool(self.dirty)
+
+    def flush(self) -> bool:
+        """ Write all dirty sections now, returns False if a write failed. Failed sections stay dirty. """
+        result = True
+        for name in sorted(self.dirty):
+            self.dirty.discard(name)
+            if not self._write(name, self.sections[name]):
+                self.dirty.add(name)
+                result = False
+        return result
+
+    def _write(self, name: str, section: _Section) -> bool:
+        start = time.perf_counter()
+        try:
+            text = section.serialize()
+            if text == section.last_text:
+                self.unchanged += 1
+                return True
+
+            atomic_write_text(Path(section.file()), text)
+        except Exception as e:
+            logging.error('Could not save %s %s! %s', self.name, name, e)
+            self.errors += 1
+            return False
+
+        section.last_text = text
+        elapsed = time.perf_counter() - start
+        self.writes += 1
+        self.write_seconds += elapsed
+        self.max_write_seconds = max(self.max_write_seconds, elapsed)
+
+        if section.written is not None:
+            section.written()
+        return True
+
+    def stats(self) -> dict:
+        return {'requests': self.requests, 'coalesced': self.coalesced, 'writes': self.writes,
+                'unchanged': self.unchanged, 'errors': self.errors, 'pending': sorted(self.dirty),
+                'avg_write_ms': round(self.write_seconds / max(1, self.writes) * 1000, 2),
+                'max_write_ms': round(self.max_write_seconds * 1000, 2)}
+
+
+def flush_all(log_stats: bool = False):
+    """ Write pending changes of every WriteBehind, called at exit and from the exception hook """
+    for writer in list(WriteBehind.instances.values()):
+        try:
+            writer.flush()
+        except Exception as e:
+            logging.error('Could not flush %s: %s', writer.name, e)
+        if log_stats:
+            logging.info('Write behind %s: %s', writer.name, writer.stats())
+
+
+def write_behind_stats() -> Dict[str, dict]:
+    return {name: writer.stats() for name, writer in WriteBehind.instances.items()}
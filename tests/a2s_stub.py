@@ -0,0 +1,143 @@
+""" Local UDP stand-ins of rFactor 2 dedicated servers answering A2S queries, for tests and benchmarks """
+import selectors
+import socket
+import struct
+import threading
+from typing import List, Optional, Tuple
+
+HEADER_SIMPLE = b"\xFF\xFF\xFF\xFF"
+HEADER_MULTI = b"\xFE\xFF\xFF\xFF"
+
+
+def _cstring(value: str) -> bytes:
+    return value.encode('utf-8') + b'\x00'
+
+
+class StubServer:
+    """ One emulated rF2 dedicated server """
+    def __init__(self, name: str, map_name: str = 'Loch Drummond', players: Optional[List[str]] = None,
+                 bots: int = 0, max_players: int = 30, password: bool = False, rules: Optional[dict] = None,
+                 challenge: Optional[int] = 0x1234abcd, split_size: int = 0, drop_first: int = 0):
+        """
+            :param challenge: challenge number required for every query, None disables challenges
+            :param split_size: answer with split packets of this payload size, 0 never splits
+            :param drop_first: ignore this many requests before answering, to test re-sends
+        """
+        self.name = name
+        self.map_name = map_name
+        self.players = players or list()
+        self.bots = bots
+        self.max_players = max_players
+        self.password = password
+        self.rules = rules or {'rF2Version': '1.1140'}
+        self.challenge = challenge
+        self.split_size = split_size
+        self.drop_first = drop_first
+        self.requests = 0
+        self.address: Tuple[str, int] = ('127.0.0.1', 0)
+
+    def info_response(self) -> bytes:
+        data = b'\x49' + struct.pack('<B', 17)
+        data += _cstring(self.name) + _cstring(self.map_name) + _cstring('rFactor 2') + _cstring('rFactor 2')
+        data += struct.pack('<HBBBccBB', 365960 & 0xFFFF, len(self.players) + self.bots, self.max_players,
+                            self.bots, b'd', b'w', int(self.password), 0)
+        data += _cstring('1.1140')
+        # -- Extra data: game port and steam id
+        data += struct.pack('<BHQ', 0x80 | 0x10, self.address[1], 90000000000000001)
+        return data
+
+    def players_response(self) -> bytes:
+        data = b'\x44' + struct.pack('<B', len(self.players))
+        for idx, player in enumerate(self.players):
+            data += struct.pack('<B', idx) + _cstring(player) + struct.pack('<lf', 0, 120.0)
+        return data
+
+    def rules_response(self) -> bytes:
+        data = b'\x45' + struct.pack('<h', len(self.rules))
+        for key, value in self.rules.items():
+            data += _cstring(key) + _cstring(value)
+        return data
+
+    def _challenge_ok(self, challenge_bytes: bytes) -> bool:
+        if self.challenge is None:
+            return True
+        if len(challenge_bytes) < 4:
+            return False
+        return struct.unpack('<l', challenge_bytes[:4])[0] == self.challenge
+
+    def handle(self, packet: bytes) -> List[bytes]:
+        """ Return the reply packets for a request """
+        self.requests += 1
+        if self.requests <= self.drop_first or not packet.startswith(HEADER_SIMPLE):
+            return list()
+
+        request_type, payload = packet[4], packet[5:]
+        if request_type == 0x54:
+            challenge_bytes = payload[len(b'Source Engine Query\x00'):]
+            response = self.info_response
+        elif request_type == 0x55:
+            challenge_bytes = payload
+            response = self.players_response
+        elif request_type == 0x56:
+            challenge_bytes = payload
+            response = self.rules_response
+        else:
+            return list()
+
+        if not self._challenge_ok(challenge_bytes):
+            return [HEADER_SIMPLE + b'\x41' + struct.pack('<l', self.challenge)]
+        return self._packets(response())
+
+    def _packets(self, data: bytes) -> List[bytes]:
+        if not self.split_size or len(data) <= self.split_size:
+            return [HEADER_SIMPLE + data]
+
+        data = HEADER_SIMPLE + data
+        chunks = [data[i:i + self.split_size] for i in range(0, len(data), self.split_size)]
+        message_id = (self.requests * 7919) & 0x7FFFFFFF
+        return [HEADER_MULTI + struct.pack('<lBBH', message_id, len(chunks), idx, 1248) + chunk
+                for idx, chunk in enumerate(chunks)]
+
+
+class StubServerFarm:
+    """ Serve any number of StubServers, each on its own local UDP port, from one thread """
+    def __init__(self, servers: List[StubServer]):
+        self.servers = servers
+        self._selector = selectors.DefaultSelector()
+        self._sockets = list()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._serve, daemon=True)
+
+        for server in servers:
+            sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+            sock.bind(('127.0.0.1', 0))
+            sock.setblocking(False)
+            server.address = sock.getsockname()
+            self._selector.register(sock, selectors.EVENT_READ, server)
+            self._sockets.append(sock)
+
+    @property
+    def addresses(self) -> List[Tuple[str, int]]:
+        return [s.address for s in self.servers]
+
+    def _serve(self):
+        while not self._stop.is_set():
+            for key, _ in self._selector.select(timeout=0.05):
+                try:
+                    packet, address = key.fileobj.recvfrom(65535)
+                except OSError:
+                    continue
+                for reply in key.data.handle(packet):
+                    key.fileobj.sendto(reply, address)
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self._stop.set()
+        self._thread.join(timeout=2.0)
+        for sock in self._sockets:
+            self._selector.unregister(sock)
+            sock.close()
+        self._selector.close()
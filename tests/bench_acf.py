@@ -0,0 +1,93 @@
+""" Micro-benchmark of parsing Steam app manifests and libraryfolders.vdf
+
+    Generates a Steam library of app manifests shaped like real ones, with a few
+    apps owning hundreds of DLC depots, and times parsing the corpus and a cold
+    refresh of the SteamCatalog. Run from the repository root:
+
+        python tests/bench_acf.py --manifests 400
+"""
+import argparse
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path[:0] = [str(Path(__file__).parents[1] / 'src')]
+
+from open_vr_mod.valve import acf  # noqa: E402
+from open_vr_mod.valve.steam_catalog import SteamCatalog  # noqa: E402
+
+
+def manifest(app_id: int, depots: int) -> str:
+    depot_lines = ''.join(f'\t\t"{app_id + i + 1}"\n\t\t{{\n\t\t\t"manifest"\t\t"{random.getrandbits(62)}"\n'
+                          f'\t\t\t"size"\t\t"{random.randint(1, 10 ** 10)}"\n'
+                          + (f'\t\t\t"dlcappid"\t\t"{app_id + i + 1}"\n' if i else '') + '\t\t}\n'
+                          for i in range(depots))
+    return (f'"AppState"\n{{\n\t"appid"\t\t"{app_id}"\n\t"universe"\t\t"1"\n'
+            f'\t"LauncherPath"\t\t"C:\\\\Program Files (x86)\\\\Steam\\\\steam.exe"\n\t"name"\t\t"Game {app_id}"\n'
+            f'\t"StateFlags"\t\t"4"\n\t"installdir"\t\t"Game {app_id}"\n\t"LastUpdated"\t\t"1700000000"\n'
+            f'\t"LastPlayed"\t\t"1700000000"\n\t"SizeOnDisk"\t\t"{random.randint(1, 10 ** 11)}"\n'
+            f'\t"StagingSize"\t\t"0"\n\t"buildid"\t\t"{random.randint(1, 10 ** 7)}"\n\t"LastOwner"\t\t"76561190000000000"\n'
+            f'\t"UpdateResult"\t\t"0"\n\t"BytesToDownload"\t\t"0"\n\t"BytesDownloaded"\t\t"0"\n'
+            f'\t"AutoUpdateBehavior"\t\t"0"\n\t"AllowOtherDownloadsWhileRunning"\t\t"0"\n\t"ScheduledAutoUpdate"\t\t"0"\n'
+            f'\t"InstalledDepots"\n\t{{\n{depot_lines}\t}}\n'
+            f'\t"SharedDepots"\n\t{{\n\t\t"228988"\t\t"228980"\n\t\t"228990"\t\t"228980"\n\t}}\n'
+            f'\t"UserConfig"\n\t{{\n\t\t"language"\t\t"english"\n\t}}\n'
+            f'\t"MountedConfig"\n\t{{\n\t\t"language"\t\t"english"\n\t}}\n}}\n')
+
+
+def library_folders(path: str, app_ids) -> str:
+    apps = ''.join(f'\t\t\t"{a}"\t\t"{random.randint(1, 10 ** 10)}"\n' for a in app_ids)
+    return (f'"libraryfolders"\n{{\n\t"0"\n\t{{\n\t\t"path"\t\t"{path}"\n\t\t"label"\t\t""\n'
+            f'\t\t"contentid"\t\t"1234567890"\n\t\t"totalsize"\t\t"0"\n\t\t"apps"\n\t\t{{\n{apps}\t\t}}\n\t}}\n}}\n')
+
+
+def write_corpus(steam_dir: Path, count: int):
+    random.seed(365960)
+    apps_dir = steam_dir / 'steamapps'
+    apps_dir.mkdir(parents=True)
+    app_ids = [1000 + i * 1000 for i in range(count)]
+    for app_id in app_ids:
+        # -- Most apps have a single depot, some hundreds of DLC depots like rFactor 2
+        depots = random.choice([1] * 12 + [2, 3, 5, 20, 120, 400])
+        (apps_dir / f'appmanifest_{app_id}.acf').write_text(manifest(app_id, depots), encoding='utf-8')
+    (apps_dir / 'libraryfolders.vdf').write_text(library_folders(steam_dir.as_posix(), app_ids), encoding='utf-8')
+
+
+def best_of(fn, repeat: int = 5) -> float:
+    timings = list()
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Parse a generated corpus of Steam app manifests')
+    parser.add_argument('--manifests', type=int, default=400, help='Number of app manifests to generate')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        steam_dir = Path(tmp_dir) / 'Steam'
+        write_corpus(steam_dir, args.manifests)
+        files = sorted((steam_dir / 'steamapps').iterdir())
+        texts = [f.read_text(encoding='utf-8') for f in files]
+        size = sum(len(t) for t in texts)
+        print(f'{len(files)} files, {size / 1024:.0f} KiB')
+
+        cases = {
+            'acf.loads': lambda: [acf.loads(t) for t in texts],
+            'acf.loads manifest keys': lambda: [acf.loads(t, keys=SteamCatalog.manifest_keys) for t in texts],
+            'SteamCatalog cold refresh': lambda: SteamCatalog().refresh(steam_dir),
+        }
+        for name, case in cases.items():
+            try:
+                print(f'{name:<30} {best_of(case) * 1000:>9.2f} ms')
+            except (TypeError, AttributeError) as e:
+                print(f'{name:<30} n/a ({e})')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,77 @@
+""" Micro-benchmark of decoding A2S and master server responses
+
+    Decodes response packets produced by the A2S and master server stand-ins and
+    prints the time per message. Run from the repository root:
+
+        python tests/bench_messages.py --number 2000
+"""
+import argparse
+import sys
+import timeit
+from pathlib import Path
+
+sys.path[:0] = [str(Path(__file__).parent), str(Path(__file__).parents[1] / 'src')]
+
+from a2s_stub import StubServer  # noqa: E402
+from master_stub import RESPONSE_HEADER, _entry  # noqa: E402
+from rf2settings.valve import messages  # noqa: E402
+from rf2settings.valve.a2s_engine import A2SQueryEngine, _AddressQuery, QUERY_RULES  # noqa: E402
+
+
+def recorded_packets() -> dict:
+    server = StubServer('rFactor 2 Test Server | Endurance', players=[f'Driver Number {i}' for i in range(40)],
+                        rules={f'rule_key_{i}': 'value ' * 8 for i in range(60)}, split_size=1200)
+    server.address = ('127.0.0.1', 64297)
+    addresses = [(f'10.{i // 65536}.{i // 256 % 256}.{i % 256}', 27015 + i % 100) for i in range(231)]
+
+    return {
+        'info': server.info_response(),
+        'players': server.players_response(),
+        'rules': server.rules_response(),
+        'rules_split': server._packets(server.rules_response()),
+        'master_page': RESPONSE_HEADER + b''.join(_entry(a) for a in addresses),
+    }
+
+
+def decode_split(packets) -> messages.RulesResponse:
+    """ Reassemble split packets as valve.a2s.ServerQuerier.get_response does """
+    fragments = dict()
+    for packet in packets:
+        fragment = messages.Fragment.decode(messages.Header.decode(packet).payload)
+        fragments[fragment['fragment_id']] = fragment
+    return messages.RulesResponse.decode(b''.join(fragments[i].payload for i in sorted(fragments)))
+
+
+def engine_split(packets):
+    """ Reassemble split packets as the A2SQueryEngine does """
+    query = _AddressQuery(('127.0.0.1', 64297), [QUERY_RULES])
+    for packet in packets:
+        data = A2SQueryEngine._reassemble(query, packet)
+    return data
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Decode recorded A2S and master server responses')
+    parser.add_argument('--number', type=int, default=2000, help='Decodes per measurement')
+    args = parser.parse_args()
+
+    packets = recorded_packets()
+    cases = {
+        'InfoResponse': lambda: messages.InfoResponse.decode(packets['info'])['server_name'],
+        'PlayersResponse (40 players)': lambda: [p['name'] for p in
+                                                 messages.PlayersResponse.decode(packets['players'])['players']],
+        'RulesResponse (60 rules)': lambda: messages.RulesResponse.decode(packets['rules'])['rules'],
+        'RulesResponse split ({} packets)'.format(len(packets['rules_split'])):
+            lambda: decode_split(packets['rules_split'])['rules'],
+        'A2SQueryEngine reassemble': lambda: engine_split(packets['rules_split']),
+        'MasterServerResponse (231 addresses)': lambda: [
+            (a['host'], a['port']) for a in messages.MasterServerResponse.decode(packets['master_page'])['addresses']],
+    }
+
+    for name, case in cases.items():
+        best = min(timeit.repeat(case, number=args.number, repeat=5))
+        print(f'{name:<40} {best / args.number * 1e6:>9.2f} us')
+
+
+if __name__ == '__main__':
+    main()
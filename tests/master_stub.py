@@ -0,0 +1,83 @@
+""" Local UDP stand-in of the Steam master server, for tests and benchmarks """
+import socket
+import struct
+import threading
+import time
+from typing import Dict, List, Tuple
+
+RESPONSE_HEADER = b'\xFF\xFF\xFF\xFF\x66\x0A'
+NULL_ADDRESS = ('0.0.0.0', 0)
+
+
+def _entry(address: Tuple[str, int]) -> bytes:
+    return socket.inet_aton(address[0]) + struct.pack('!H', address[1])
+
+
+class StubMasterServer:
+    """ Answer master server requests with pages of the addresses listed per region code """
+    def __init__(self, regions: Dict[int, List[Tuple[str, int]]], page_size: int = 231, page_delay: float = 0.0,
+                 drop_first: int = 0):
+        """
+            :param page_delay: seconds to wait before answering a request
+            :param drop_first: ignore this many requests of every region before answering, to test re-sends
+        """
+        self.regions = regions
+        self.page_size = page_size
+        self.page_delay = page_delay
+        self.drop_first = drop_first
+        self.requests: Dict[int, int] = dict()
+        self.request_order: List[int] = list()
+        self.filters = set()
+        self.last_page_sent = 0.0
+
+        self._socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self._socket.bind(('127.0.0.1', 0))
+        self._socket.settimeout(0.05)
+        self.address: Tuple[str, int] = self._socket.getsockname()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._serve, daemon=True)
+
+    def handle(self, packet: bytes) -> List[bytes]:
+        if packet[:1] != b'\x31':
+            return list()
+        region = packet[1]
+        seed, filter_string = packet[2:].split(b'\x00')[:2]
+        self.filters.add(filter_string.decode())
+
+        self.requests[region] = self.requests.get(region, 0) + 1
+        self.request_order.append(region)
+        if self.requests[region] <= self.drop_first:
+            return list()
+
+        addresses = self.regions.get(region, list())
+        start = 0
+        if seed != b'0.0.0.0:0':
+            host, port = seed.decode().split(':')
+            start = addresses.index((host, int(port))) + 1
+
+        page = addresses[start:start + self.page_size]
+        if start + self.page_size >= len(addresses):
+            page = page + [NULL_ADDRESS]
+        return [RESPONSE_HEADER + b''.join(_entry(a) for a in page)]
+
+    def _serve(self):
+        while not self._stop.is_set():
+            try:
+                packet, address = self._socket.recvfrom(1400)
+            except socket.timeout:
+                continue
+            except OSError:
+                return
+            time.sleep(self.page_delay)
+            for reply in self.handle(packet):
+                self._socket.sendto(reply, address)
+                self.last_page_sent = time.perf_counter()
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self._stop.set()
+        self._thread.join(timeout=2.0)
+        self._socket.close()
@@ -0,0 +1,70 @@
+import socket
+
+from a2s_stub import StubServer, StubServerFarm
+from rf2settings.valve.a2s_engine import A2SQueryEngine, _AddressQuery, QUERY_INFO, QUERY_PLAYERS, QUERY_RULES
+
+
+def _unused_udp_address():
+    sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    sock.bind(('127.0.0.1', 0))
+    address = sock.getsockname()
+    sock.close()
+    return address
+
+
+def test_query_many_servers():
+    servers = [StubServer(f'Server {i}', players=[f'Driver {i}'] * (i % 4), bots=i % 3) for i in range(300)]
+    received = list()
+
+    with StubServerFarm(servers) as farm:
+        engine = A2SQueryEngine(timeout=2.0, max_in_flight=64)
+        results = engine.run(farm.addresses, (QUERY_INFO, QUERY_PLAYERS), on_result=received.append)
+
+    assert len(results) == len(received) == 300
+    assert all(r.ok and not r.errors for r in results)
+    by_address = {r.address: r for r in results}
+    for server in servers:
+        result = by_address[server.address]
+        assert result.info.server_name == server.name
+        assert result.info.port == server.address[1]
+        assert result.info.bot_count == server.bots
+        assert [p.name for p in result.players] == server.players
+
+
+def test_split_packets_and_resend():
+    rules = {f'key_{i}': 'x' * 40 for i in range(40)}
+    servers = [StubServer('Split', rules=rules, split_size=300),
+               StubServer('Lossy', challenge=None, drop_first=1)]
+
+    with StubServerFarm(servers) as farm:
+        results = A2SQueryEngine(timeout=0.3).run(farm.addresses, (QUERY_INFO, QUERY_RULES))
+
+    split, lossy = results if results[0].info.server_name == 'Split' else reversed(results)
+    assert split.rules == rules
+    assert lossy.ok and lossy.rules == {'rF2Version': '1.1140'}
+
+
+def test_unanswered_address_times_out():
+    with StubServerFarm([StubServer('Alive')]) as farm:
+        dead = _unused_udp_address()
+        results = A2SQueryEngine(timeout=0.2).run(farm.addresses + [dead], (QUERY_INFO, QUERY_PLAYERS))
+
+    by_address = {r.address: r for r in results}
+    assert by_address[farm.addresses[0]].ok
+    assert not by_address[dead].ok
+    assert QUERY_INFO in by_address[dead].errors
+    assert QUERY_PLAYERS not in by_address[dead].errors
+
+
+def test_players_query_waits_longer():
+    engine = A2SQueryEngine(timeout=0.5)
+    dead = _unused_udp_address()
+    sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    sock.setblocking(False)
+    try:
+        for kind, timeout in ((QUERY_INFO, 0.5), (QUERY_PLAYERS, 2.0), (QUERY_RULES, 0.5)):
+            query = _AddressQuery(dead, [kind])
+            engine._send(sock, dead, query)
+            assert abs(query.deadline - query.sent_at - timeout) < 1e-6
+    finally:
+        sock.close()
@@ -0,0 +1,42 @@
+from open_vr_mod.valve import acf
+
+MANIFEST = '''"AppState"
+{
+	"appid"		"365960"
+	"name"		"rFactor 2"
+	"InstalledDepots"
+	{
+		"365961"
+		{
+			"manifest"		"4203284629410287331"
+			"size"		"18459484815"
+		}
+	}
+	"installdir"		"rFactor 2"
+	"UserConfig"
+	{
+		"language"		""
+	}
+}
+'''
+
+
+def test_acf_loads():
+    app = acf.loads(MANIFEST)['AppState']
+    assert app['appid'] == '365960' and app['name'] == 'rFactor 2'
+    assert app['InstalledDepots'] == {'365961': {'manifest': '4203284629410287331', 'size': '18459484815'}}
+    # -- Values following a section belong to the enclosing section
+    assert app['installdir'] == 'rFactor 2'
+    assert app['UserConfig'] == {'language': ''}
+    assert acf.loads(acf.dumps(acf.loads(MANIFEST))) == acf.loads(MANIFEST)
+
+    # -- Comments, escaped quotes and unquoted strings are tokenized
+    vdf = '// Library\n"libraryfolders" {\n\t"0" { "path" "C:\\\\Steam" label "a \\"b\\"" }\n\t"1"\t"D:\\\\Lib" // x "y"\n}\n'
+    assert acf.loads(vdf) == {'libraryfolders': {'0': {'path': 'C:\\\\Steam', 'label': 'a \\"b\\"'},
+                                                 '1': 'D:\\\\Lib'}}
+    assert acf.loads('"a" { b "c" }') == {'a': {'b': 'c'}}
+
+    # -- Partial reads stop after the requested keys
+    partial = acf.loads(MANIFEST, keys=('appid', 'installdir'))['AppState']
+    assert partial['installdir'] == 'rFactor 2' and 'UserConfig' not in partial
+    assert acf.loads(MANIFEST, keys=('appid',)) == {'AppState': {'appid': '365960'}}
@@ -0,0 +1,42 @@
+import os
+
+from open_vr_mod.globals import OPEN_VR_DLL, EXE_NAME
+from open_vr_mod.util.dir_walker import DirWalker
+
+
+def test_walk_matches_glob_and_reuses_unchanged_dirs(tmp_path, monkeypatch):
+    monkeypatch.setattr(DirWalker, '_store_file', classmethod(lambda cls: tmp_path / 'dir_walk.json'))
+    monkeypatch.setattr(DirWalker, '_trees', dict())
+    monkeypatch.setattr(DirWalker, '_loaded', True)
+
+    app = tmp_path / 'app'
+    for i in range(20):
+        assets = app / 'Content' / f'Pak{i}'
+        assets.mkdir(parents=True)
+        for j in range(20):
+            (assets / f'asset_{j}.uasset').touch()
+    binaries = app / 'Engine' / 'Binaries' / 'ThirdParty' / 'OpenVR' / 'Win64'
+    binaries.mkdir(parents=True)
+    (binaries / OPEN_VR_DLL).touch()
+    (app / 'Game.exe').touch()
+    (app / '.git').mkdir()
+    (app / '.git' / 'hook.exe').touch()
+
+    found = DirWalker.find(app)
+    assert found[OPEN_VR_DLL] == [binaries / OPEN_VR_DLL]
+    assert found[EXE_NAME] == [app / 'Game.exe']
+    assert DirWalker.stats[app.as_posix()].dirs_pruned == 1
+
+    # -- Unchanged tree is served from the store without listing any directory
+    DirWalker._loaded = False
+    DirWalker._trees = dict()
+    assert DirWalker.find(app) == found
+    stats = DirWalker.stats[app.as_posix()]
+    assert stats.dirs_listed == 0 and stats.dirs_reused == 27
+
+    # -- Only the changed directory is listed again
+    (binaries / 'Launcher.exe').touch()
+    os.utime(binaries, ns=(0, 1))
+    found = DirWalker.find(app)
+    assert found[EXE_NAME] == [app / 'Game.exe', binaries / 'Launcher.exe']
+    assert DirWalker.stats[app.as_posix()].dirs_listed == 1
@@ -0,0 +1,57 @@
+import hashlib
+import os
+
+import pytest
+
+from open_vr_mod.util.utils import FileHashCache, get_file_hash
+
+
+@pytest.fixture
+def hash_cache(tmp_path, monkeypatch):
+    store_file = tmp_path / 'file_hashes.json'
+    hashed = list()
+    hash_file = FileHashCache.hash_file.__func__
+
+    def _hash_file(cls, file):
+        hashed.append(file)
+        return hash_file(cls, file)
+
+    monkeypatch.setattr(FileHashCache, '_store_file', classmethod(lambda cls: store_file))
+    monkeypatch.setattr(FileHashCache, 'hash_file', classmethod(_hash_file))
+    monkeypatch.setattr(FileHashCache, 'chunk_size', 1000)
+    monkeypatch.setattr(FileHashCache, '_digests', dict())
+    monkeypatch.setattr(FileHashCache, '_loaded', False)
+    monkeypatch.setattr(FileHashCache, '_modified', False)
+    return hashed, store_file
+
+
+def test_file_hash_cache(tmp_path, hash_cache):
+    hashed, store_file = hash_cache
+    file = tmp_path / 'openvr_api.dll'
+    data = os.urandom(4567)
+    file.write_bytes(data)
+
+    # -- Chunked digest matches the whole file digest
+    assert get_file_hash(file) == hashlib.md5(data).hexdigest()
+    assert len(hashed) == 1 and store_file.exists()
+
+    # -- Unchanged file is served from memory
+    assert get_file_hash(file) == hashlib.md5(data).hexdigest()
+    assert len(hashed) == 1
+
+    # -- Changed size or modification time is hashed again
+    data = os.urandom(4000)
+    file.write_bytes(data)
+    assert get_file_hash(file) == hashlib.md5(data).hexdigest()
+    stat = file.stat()
+    data = data[:-1] + bytes([data[-1] ^ 1])
+    file.write_bytes(data)
+    os.utime(file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 2_000_000_000))
+    assert get_file_hash(file) == hashlib.md5(data).hexdigest()
+    assert len(hashed) == 3
+
+    # -- Digests are persisted and reloaded in the next session
+    FileHashCache._digests, FileHashCache._loaded = dict(), False
+    assert get_file_hash(file) == hashlib.md5(data).hexdigest()
+    assert len(hashed) == 3
+    assert not list(tmp_path.glob('*.tmp'))
@@ -0,0 +1,78 @@
+from rf2settings.rf2sharedmem import rF2data
+from rf2settings.rf2sharedmem.recorder import FrameRecorder, RecordingPlayer, RecordingReader, used_size, \
+    KIND_TELEMETRY, KIND_SCORING
+from rf2settings.rf2sharedmem.snapshot import SimSnapshot
+
+
+class FakeSimInfo:
+    def __init__(self, num_vehicles: int = 20):
+        self.Rf2Tele = rF2data.rF2Telemetry()
+        self.Rf2Scor = rF2data.rF2Scoring()
+        self.Rf2Ext = rF2data.rF2Extended()
+        self.Rf2Tele.mNumVehicles = num_vehicles
+        self.Rf2Scor.mScoringInfo.mNumVehicles = num_vehicles
+
+    def write_frame(self, step: int):
+        for buffer in (self.Rf2Tele, self.Rf2Scor):
+            buffer.mVersionUpdateBegin += 1
+        for idx in range(self.Rf2Tele.mNumVehicles):
+            self.Rf2Tele.mVehicles[idx].mGear = (step + idx) % 6
+            self.Rf2Tele.mVehicles[idx].mHeadlights = step % 2
+        self.Rf2Scor.mScoringInfo.mCurrentET = step * 0.1
+        for buffer in (self.Rf2Tele, self.Rf2Scor):
+            buffer.mVersionUpdateEnd = buffer.mVersionUpdateBegin
+
+
+def test_record_save_and_replay(tmp_path):
+    sim = FakeSimInfo()
+    snapshot = SimSnapshot(sim)
+    recorder = FrameRecorder()
+
+    gears = list()
+    for step in range(120):
+        sim.write_frame(step)
+        snapshot.update()
+        recorder.record(snapshot)
+        gears.append(snapshot.telemetry.mVehicles[3].mGear)
+
+    # -- Extended is recorded once, Telemetry and Scoring every frame
+    assert len(recorder) == 241
+    file = tmp_path / 'session.rf2rec'
+    written = recorder.save(file)
+    assert written < sum(len(f.data) for f in recorder.frames()) / 20
+
+    frames = list(RecordingReader(file))
+    assert [f.kind for f in frames] == [f.kind for f in recorder.frames()]
+    assert len(frames[0].data) == used_size(KIND_TELEMETRY, sim.Rf2Tele)
+
+    player = RecordingPlayer(file, speed=0)
+    replay_snapshot = SimSnapshot(player)
+    replayed_gears = list()
+
+    def on_frame(frame):
+        if frame.kind == KIND_SCORING:
+            replay_snapshot.update()
+            replayed_gears.append(replay_snapshot.telemetry.mVehicles[3].mGear)
+
+    assert player.play(on_frame) == 241
+    assert replayed_gears == gears
+    assert replay_snapshot.scoring.mScoringInfo.mCurrentET == sim.Rf2Scor.mScoringInfo.mCurrentET
+
+
+def test_ring_buffer_keeps_newest_frames():
+    sim = FakeSimInfo(num_vehicles=2)
+    snapshot = SimSnapshot(sim)
+    frame_size = used_size(KIND_TELEMETRY, sim.Rf2Tele) + used_size(KIND_SCORING, sim.Rf2Scor)
+    recorder = FrameRecorder(capacity=frame_size * 10 + 100)
+
+    for step in range(50):
+        sim.write_frame(step)
+        snapshot.update()
+        recorder.record(snapshot)
+
+    frames = list(recorder.frames())
+    assert recorder.evicted == recorder.recorded - len(frames)
+    assert frames[-1].data.tobytes() == bytes(sim.Rf2Scor)[:len(frames[-1].data)]
+    offsets = sorted(recorder._records)
+    for (offset, size, _, _), (next_offset, _, _, _) in zip(offsets, offsets[1:]):
+        assert offset + size <= next_offset
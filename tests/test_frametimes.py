@@ -0,0 +1,54 @@
+from array import array
+
+import pytest
+
+from rf2settings.benchmark import frametimes
+
+CAPTURE = '''// PresentMon capture
+Application,ProcessID,TimeInSeconds,msBetweenPresents,Dropped
+rFactor2.exe,1234,0.000,0.000,0
+rFactor2.exe,1234,0.011,11.100,0
+rFactor2.exe,1234,0.022,10.900,0
+rFactor2.exe,1234,0.022,-1.000,1
+rFactor2.exe,1234,0.055,33.300,0
+rFactor2.exe,1234,0.066,11.000,0
+rFactor2.exe,1234,0.077,10.700,0
+rFactor2.exe,1234,0.077,0.000,1
+rFactor2.exe,1234,0.089,12.400,0
+'''
+
+
+def test_numpy_and_python_statistics_match(tmp_path, monkeypatch):
+    capture = tmp_path / 'capture.csv'
+    capture.write_text(CAPTURE)
+
+    column = frametimes.read_columns(capture, ('msBetweenPresents', 'Unknown'))['msBetweenPresents']
+    python_stats = frametimes.frame_time_statistics(frame_times=array('d', column))
+    # -- Frame times of zero or less are not counted as frames
+    assert python_stats['frames'] == 6
+    assert python_stats['fps002'] == pytest.approx(1000.0 / 33.3)
+    assert python_stats['stutters'] == 1
+
+    if frametimes.NUMPY_AVAIL:
+        numpy_stats = frametimes.frame_time_statistics(frame_times=column)
+        assert numpy_stats.keys() == python_stats.keys()
+        for key, value in python_stats.items():
+            assert numpy_stats[key] == pytest.approx(value), key
+
+    monkeypatch.setattr(frametimes, 'NUMPY_AVAIL', False)
+    python_column = frametimes.read_columns(capture, ('msBetweenPresents',))['msBetweenPresents']
+    assert isinstance(python_column, array) and list(python_column) == list(column)
+    assert frametimes.frame_time_statistics(frame_times=python_column) == python_stats
+
+
+def test_detail_columns_keep_their_length(tmp_path):
+    from rf2settings.benchmark.result import read_results
+
+    capture = tmp_path / 'capture.csv'
+    capture.write_text(CAPTURE)
+    data = read_results(capture, details=True)
+
+    # -- Chart points are read from every column by the same index
+    assert len(data['fps']) == len(data['msBetweenPresents']) == len(data['TimeInSeconds']) == 9
+    assert data['fps'][3] == data['fps'][7] == 0.0 and data['fps'][4] == pytest.approx(1000.0 / 33.3)
+    assert data['frames'] == 6
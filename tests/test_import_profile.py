@@ -0,0 +1,29 @@
+import json
+import sys
+
+from rf2settings.import_profile import ImportProfiler, IMPORT_PROFILE_FILE_NAME
+
+
+def test_import_profiler_reports_nested_imports(tmp_path, monkeypatch):
+    package = tmp_path / 'profiled_pkg'
+    package.mkdir()
+    (package / '__init__.py').write_text('import time\ntime.sleep(0.02)\nfrom . import heavy\n')
+    (package / 'heavy.py').write_text('import time\ntime.sleep(0.05)\n')
+    monkeypatch.syspath_prepend(str(tmp_path))
+
+    profiler = ImportProfiler().start()
+    try:
+        import profiled_pkg  # noqa: F401
+    finally:
+        profiler.stop()
+        sys.modules.pop('profiled_pkg.heavy', None)
+        sys.modules.pop('profiled_pkg', None)
+
+    cumulative, self_time, loaded = profiler.modules['profiled_pkg']
+    assert cumulative >= 0.07 and loaded == 2
+    assert 0.02 <= self_time < 0.05
+
+    (tmp_path / IMPORT_PROFILE_FILE_NAME).write_text(json.dumps({'total_ms': 1.0}))
+    report = profiler.save(tmp_path)
+    assert report['previous_total_ms'] == 1.0
+    assert json.loads((tmp_path / IMPORT_PROFILE_FILE_NAME).read_text())['modules'][0]['name'] == 'profiled_pkg'
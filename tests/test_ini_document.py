@@ -0,0 +1,33 @@
+import shutil
+from pathlib import Path
+
+from rf2settings.ini_document import IniDocument
+
+DX_CONFIG = Path(__file__).parent / 'data' / 'input' / 'FakeRf2' / 'UserData' / 'Config_DX11.ini'
+
+
+def test_ini_document_rewrites_only_changed_keys(tmp_path):
+    ini_file = tmp_path / DX_CONFIG.name
+    shutil.copy(DX_CONFIG, ini_file)
+    original = ini_file.read_bytes()
+
+    doc = IniDocument.read(ini_file)
+    assert doc.get('COMPONENTS', 'MSAA') == '4'
+    assert doc.get('COMPONENTS', 'ViewParams') == '(0.540, 0.340, 0.600, 15.000, 0.037)'
+    assert doc.set('COMPONENTS', 'MSAA', '4') is False
+    assert doc.write(ini_file).written is False
+
+    assert doc.set('COMPONENTS', 'MSAA', '2') is True
+    assert doc.set('COMPONENTS', 'VSyncMode', '0') is True
+    assert doc.changes() == [('MSAA', '4', '2'), ('VSyncMode', '2', '0')]
+    result = doc.write(ini_file)
+    assert result.written and result.keys_changed == 2 and result.bytes_changed == len('MSAA=2\n') + len('VSyncMode=0\n')
+
+    # -- Header comment, order, sections and missing trailing new line are kept
+    expected = original.replace(b'\nMSAA=4\n', b'\nMSAA=2\n').replace(b'\nVSyncMode=2\n', b'\nVSyncMode=0\n')
+    assert ini_file.read_bytes() == expected
+    assert not list(tmp_path.glob('*.tmp'))
+
+    doc = IniDocument('//header\r\n[A]\r\nKey = 1 // comment\r\n')
+    doc.set('A', 'Key', '20')
+    assert doc.text == '//header\r\n[A]\r\nKey = 20 // comment\r\n'
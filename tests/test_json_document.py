@@ -0,0 +1,49 @@
+import json
+import shutil
+from pathlib import Path
+
+from rf2settings.json_document import JsonDocument
+
+PLAYER_JSON = Path(__file__).parent / 'data' / 'input' / 'FakeRf2' / 'UserData' / 'player' / 'player.JSON'
+
+
+def test_json_document_patches_changed_values(tmp_path):
+    file = tmp_path / PLAYER_JSON.name
+    shutil.copy(PLAYER_JSON, file)
+    original = file.read_bytes()
+
+    doc = JsonDocument.load(file, 'utf-8')
+    assert doc.data == json.loads(original)
+    assert JsonDocument.load(file) is doc
+
+    assert doc.set('Graphic Options', 'Allow HUD in cockpit', True) is False
+    assert doc.write(file).written is False
+    assert file.read_bytes() == original
+
+    assert doc.set('Graphic Options', 'Allow HUD in cockpit', False) is True
+    assert doc.set('Graphic Options', 'New Setting', 1.5) is True
+    result = doc.write(file)
+    assert result.written and result.values_changed == 2
+
+    expected = json.loads(original)
+    expected['Graphic Options']['Allow HUD in cockpit'] = False
+    expected['Graphic Options']['New Setting'] = 1.5
+    assert json.loads(file.read_bytes()) == expected
+    assert file.read_bytes().replace(b'"Allow HUD in cockpit": false', b'"Allow HUD in cockpit": true').replace(
+        b',\n    "New Setting": 1.5', b'') == original
+    assert not list(tmp_path.glob('*.tmp'))
+
+    # -- The written document is cached and indexed again
+    assert JsonDocument.load(file) is doc
+    assert doc.set('Graphic Options', 'New Setting', 2) is True
+    doc.write(file)
+    assert json.loads(file.read_bytes())['Graphic Options']['New Setting'] == 2
+
+    # -- Value positions are moved after writes without a new index
+    for i, value in enumerate(('a longer value than before', 0, None)):
+        doc.set('Graphic Options', 'Allow Letterboxing', value)
+        doc.set('Graphic Options', 'Any Camera HUD', i)
+        doc.write(file)
+        expected['Graphic Options'].update({'Allow Letterboxing': value, 'Any Camera HUD': i, 'New Setting': 2})
+        assert json.loads(file.read_bytes()) == expected
+        assert JsonDocument(file.read_text())._spans == doc._spans
@@ -0,0 +1,35 @@
+from rf2settings.latency_history import LatencyHistory, LOST
+from rf2settings.write_behind import WriteBehind
+
+
+def test_latency_history_smooths_samples_and_persists(tmp_path):
+    history = LatencyHistory()
+    for _ in range(40):
+        history.record('10.0.0.1:64297', 0.040)
+    history.record('10.0.0.1:64297', 0.900)
+    history.record('10.0.0.1:64297', None)
+
+    entry = history.get('10.0.0.1:64297')
+    assert entry.sent == 42 and entry.lost == 1 and list(entry.samples[-2:]) == [900, LOST]
+    # -- A single slow reply does not make the server look as bad as its last sample
+    assert 40 < history.summary('10.0.0.1:64297')['ping_avg'] < 250
+    assert history.summary('10.0.0.1:64297') == {'ping_avg': 212, 'jitter': 54, 'loss': 20}
+    assert len(entry.samples) == LatencyHistory.max_samples
+
+    # -- Retention
+    history.record('10.0.0.2:64297', 0.030, now=1.0)
+    history.prune()
+    assert history.get('10.0.0.2:64297') is None
+
+    file = tmp_path / 'latency_history.json'
+    persisted = LatencyHistory(file)
+    try:
+        persisted.servers = history.servers
+        persisted.save()
+        persisted.writer.flush()
+        loaded = LatencyHistory(file)
+        loaded.load()
+        assert loaded.summary('10.0.0.1:64297') == history.summary('10.0.0.1:64297')
+        assert loaded.get('10.0.0.1:64297').samples == entry.samples
+    finally:
+        WriteBehind.instances.pop('latency_history')
@@ -0,0 +1,43 @@
+import logging
+import time
+
+from rf2settings.log import LogPipeline, RateLimitFilter
+
+
+class _ListHandler(logging.Handler):
+    def __init__(self):
+        super().__init__()
+        self.messages = list()
+
+    def emit(self, record):
+        self.messages.append(record.getMessage())
+
+
+def test_queue_pipeline_rate_limits_hot_loops(monkeypatch):
+    logger = logging.getLogger('test_log_pipeline')
+    logger.propagate = False
+    logger.setLevel(logging.DEBUG)
+    handler = _ListHandler()
+    logger.addHandler(handler)
+    monkeypatch.setattr(RateLimitFilter, 'limits', {'test_log_pipeline': (1.0, 5)})
+
+    def hot_loop(i):
+        logger.debug('Iteration %s', i)
+
+    LogPipeline.start(['test_log_pipeline'])
+    try:
+        assert logger.handlers == [LogPipeline.handler]
+        for i in range(100):
+            hot_loop(i)
+        logger.warning('Never limited')
+        time.sleep(1.1)
+        hot_loop(100)
+    finally:
+        LogPipeline.stop()
+        logger.handlers.clear()
+
+    assert handler.messages[:5] == [f'Iteration {i}' for i in range(5)]
+    assert handler.messages[5] == 'Never limited'
+    assert handler.messages[6] == 'Iteration 100 [95 similar records suppressed]'
+    assert LogPipeline.stats()['rate_limited'] == 95
+    assert LogPipeline.stats()['dropped'] == 0
@@ -0,0 +1,50 @@
+import time
+
+from a2s_stub import StubServer, StubServerFarm
+from master_stub import StubMasterServer
+from rf2settings.valve.a2s_engine import A2SQueryEngine
+from rf2settings.valve.master_server import REGION_ASIA, REGION_EUROPE, REGION_REST
+from rf2settings.valve.master_stream import MasterServerStream
+
+
+def test_region_sweeps_stream_into_a2s_queries():
+    servers = [StubServer(f'Server {i}') for i in range(200)]
+    first_results = list()
+
+    with StubServerFarm(servers) as farm:
+        regions = {REGION_EUROPE: farm.addresses[:150], REGION_REST: farm.addresses}
+        with StubMasterServer(regions, page_size=40, page_delay=0.02, drop_first=1) as master:
+            stream = MasterServerStream(master.address, timeout=0.2)
+            engine = A2SQueryEngine(timeout=1.0)
+            results = engine.run_stream(stream.batches(['eu', 'rest'], appid=365960),
+                                        on_result=lambda r: first_results.append(time.perf_counter()))
+
+    assert sorted(r.address for r in results) == sorted(farm.addresses)
+    assert all(r.ok for r in results)
+    # -- Duplicates of the overlapping regions are skipped, lost first pages requested again
+    assert stream.addresses == 200 and stream.duplicates == 150 and not stream.failed_regions
+    assert master.requests == {REGION_EUROPE: 5, REGION_REST: 6}
+    assert master.filters == {'\\appid\\365960'}
+    # -- Servers are queried while the master server is still sending pages
+    assert min(first_results) < master.last_page_sent
+
+
+def test_unanswered_region_sweep_is_given_up():
+    with StubMasterServer({REGION_REST: [('10.0.0.1', 64297)]}, drop_first=10) as master:
+        stream = MasterServerStream(master.address, timeout=0.1)
+        stream.retries = 1
+        assert list(stream.batches(['rest'])) == []
+        assert stream.failed_regions == [REGION_REST]
+
+
+def test_region_sweeps_are_capped():
+    regions = {r: [(f'10.0.{r}.{i}', 64297) for i in range(30)] for r in (REGION_EUROPE, REGION_ASIA, REGION_REST)}
+    with StubMasterServer(regions, page_size=10, page_delay=0.01) as master:
+        stream = MasterServerStream(master.address, timeout=0.5)
+        stream.max_sweeps = 1
+        addresses = [a for batch in stream.batches(['eu', 'as', 'rest']) for a in batch]
+
+    assert sorted(addresses) == sorted(a for r in regions.values() for a in r)
+    # -- One region after another, every sweep requests all its pages before the next one starts
+    order = master.request_order
+    assert order == sorted(order, key=order.index) and master.requests[REGION_EUROPE] == 3
@@ -0,0 +1,89 @@
+import shutil
+from pathlib import Path
+
+import pytest
+
+from rf2settings.preset.preset import GraphicsPreset, PresetType, SessionPreset
+from rf2settings.preset.preset_base import PresetStore, create_preset, matches_fingerprint, preset_fingerprint
+from rf2settings.rfactor import RfactorLocation, RfactorPlayer, RfactorPlayerCache
+
+FAKE_RF2 = Path(__file__).parent / 'data' / 'input' / 'FakeRf2'
+
+
+@pytest.fixture
+def current_preset(tmp_path, monkeypatch):
+    rf2_dir = tmp_path / 'rFactor 2'
+    shutil.copytree(FAKE_RF2, rf2_dir)
+    (rf2_dir / 'Bin64').mkdir()
+    monkeypatch.setattr(RfactorPlayerCache, 'entries', dict())
+    RfactorLocation.overwrite_location(rf2_dir)
+
+    current = GraphicsPreset()
+    current.update(RfactorPlayer())
+    yield current
+    RfactorLocation.overwrite_location(None)
+
+
+def _save(preset_obj, file: Path) -> Path:
+    assert preset_obj._save_to_file(file)
+    return file
+
+
+def test_preset_store_refreshes_changed_files(tmp_path):
+    preset_dir = tmp_path / 'presets'
+    preset_dir.mkdir()
+    _save(GraphicsPreset('Low'), preset_dir / 'gfx_Low.json')
+    _save(GraphicsPreset('High'), preset_dir / 'gfx_High.json')
+    _save(SessionPreset('Race'), preset_dir / 'ses_Race.json')
+    (preset_dir / 'broken.json').write_text('{"no": "preset"}')
+
+    store = PresetStore(preset_dir)
+    store.refresh()
+    assert store.parsed == 4
+    assert sorted(store.names(PresetType.graphics)) == ['High', 'Low'] and store.names(PresetType.session) == ['Race']
+    assert store.get(PresetType.graphics, 'Low') is not store.get(PresetType.graphics, 'Low')
+
+    store.refresh()
+    assert store.parsed == 0
+
+    # -- Added, renamed and deleted preset files
+    _save(GraphicsPreset('Medium'), preset_dir / 'gfx_Medium.json')
+    (preset_dir / 'gfx_High.json').rename(preset_dir / 'gfx_Ultra.json')
+    (preset_dir / 'ses_Race.json').unlink()
+    store.refresh()
+    assert store.parsed == 2
+    assert sorted(store.names(PresetType.graphics)) == ['High', 'Low', 'Medium']
+    assert store.names(PresetType.session) == [] and store.get(PresetType.session, 'Race') is None
+    assert [p.name for p in store.presets(PresetType.graphics)] == ['Low', 'Medium', 'High']
+
+    # -- A preset renamed inside its file
+    renamed = store.get(PresetType.graphics, 'High')
+    renamed.name = 'Ultra'
+    _save(renamed, preset_dir / 'gfx_Ultra.json')
+    store.refresh()
+    assert store.parsed == 1 and sorted(store.names(PresetType.graphics)) == ['Low', 'Medium', 'Ultra']
+    assert store.fingerprint(PresetType.graphics, 'Ultra') == preset_fingerprint(renamed)
+
+
+def _set(app_key: str, key: str, value):
+    def _update(preset_obj):
+        getattr(preset_obj, app_key).get_option(key).value = value
+    return _update
+
+
+@pytest.mark.parametrize('change, equal', [
+    (lambda p: None, True),
+    (_set('graphic_view_options', 'Head Physics', 0.4500001), True),
+    (_set('graphic_view_options', 'Head Physics', 0.5), False),
+    (_set('graphic_options', 'Track Detail', 0), False),
+    (_set('graphic_options', 'Track Detail', None), True),
+    # -- Not present in the Config_DX11.ini, ignored by the comparison
+    (_set('video_settings', 'VrSettings', 1), True),
+    (_set('video_settings', 'MSAA', 2), False),
+])
+def test_fingerprint_matches_preset_comparison(current_preset, change, equal):
+    saved = create_preset(current_preset.to_js(export=True), PresetType.graphics)
+    change(saved)
+
+    assert (not saved != current_preset) is equal
+    assert matches_fingerprint(current_preset, preset_fingerprint(saved)) is equal
@@ -0,0 +1,52 @@
+import os
+from datetime import datetime
+
+from rf2settings.rf2replays import ReplayIndex
+
+BASE_TIME = datetime(2024, 5, 1, 13, 10).timestamp()
+
+
+def _touch(file, m_time: float, data: bytes = b''):
+    file.write_bytes(data)
+    os.utime(file, (m_time, m_time))
+
+
+def test_replay_index_pages_and_rematches_results(tmp_path):
+    replay_dir, result_dir, index_file = tmp_path / 'Replays', tmp_path / 'Results', tmp_path / 'replay_index.json'
+    replay_dir.mkdir()
+    result_dir.mkdir()
+    names = ['Spa R1 Race', 'Spa Q1 Qualy', 'Monza P1 Practice', 'Monza HOT LAP', 'Sebring WU 1']
+    for idx, name in enumerate(names):
+        _touch(replay_dir / f'{name}.Vcr', BASE_TIME + idx * 1200, b'x' * (idx + 1) * 1024)
+    (replay_dir / 'notes.txt').write_text('not a replay')
+
+    index = ReplayIndex(replay_dir, result_dir, index_file)
+    assert index.update() and index.indexed == 5
+    assert not index.update() and index.indexed == 0
+
+    # -- Pages of the sorted replays, ids continue across pages
+    page, total = index.replays(offset=0, limit=2)
+    assert total == 5 and [r['name'] for r in page] == ['Sebring WU 1', 'Monza HOT LAP']
+    page, total = index.replays(offset=4, limit=2)
+    assert total == 5 and [(r['id'], r['name']) for r in page] == [(4, 'Spa R1 Race')]
+    page, _ = index.replays(sort_key='name', descending=False)
+    assert [r['name'] for r in page] == sorted(names)
+    page, _ = index.replays(sort_key='size', descending=True, limit=1)
+    assert page[0]['name'] == 'Sebring WU 1' and page[0]['size'] == '0.00MB'
+    assert [r['type'] for r in index.replays(sort_key='type', descending=False)[0]] == [1, 2, 3, 4, 5]
+
+    # -- A result file written after the replays is matched without classifying the replays again
+    result_file = result_dir / 'Spa Race.xml'
+    _touch(result_file, BASE_TIME + 30)
+    os.utime(result_dir, (BASE_TIME + 7200, BASE_TIME + 7200))
+    assert index.update() and index.indexed == 0
+    matched = {r['name']: r['result_file'] for r in index.replays()[0]}
+    assert matched['Spa R1 Race'] == result_file.as_posix()
+    assert matched['Spa Q1 Qualy'] == ''
+
+    # -- Removed replays are dropped, the saved index is reloaded
+    (replay_dir / 'Sebring WU 1.Vcr').unlink()
+    assert index.update()
+    reloaded = ReplayIndex(replay_dir, result_dir, index_file)
+    assert not reloaded.update() and reloaded.indexed == 0
+    assert reloaded.replays() == index.replays() and reloaded.replays()[1] == 4
@@ -0,0 +1,150 @@
+import http.client
+import socket
+import threading
+
+import bottle
+import pytest
+from gevent.pywsgi import WSGIServer
+
+from rf2settings import requests
+
+
+def _create_web_ui_app() -> bottle.Bottle:
+    """ Minimal stand-in of the rFactor 2 WebUi endpoints used by RfactorConnect """
+    app = bottle.Bottle()
+    app.session_settings = dict()
+
+    @app.get('/navigation/state')
+    def navigation_state():
+        return {'loadingStatus': {'loading': False}}
+
+    @app.post('/rest/sessions/settings')
+    def session_settings():
+        setting = bottle.request.json
+        app.session_settings[setting['sessionSetting']] = setting['value']
+        return setting
+
+    @app.get('/rest/missing')
+    def missing():
+        bottle.abort(404, 'Not found')
+
+    return app
+
+
+@pytest.fixture
+def web_ui():
+    app = _create_web_ui_app()
+    started = threading.Event()
+    servers = list()
+
+    def _serve():
+        # -- gevent server needs to be created in the thread running its hub
+        server = WSGIServer(('127.0.0.1', 0), app, log=None)
+        server.start()
+        servers.append(server)
+        started.set()
+        server.serve_forever()
+
+    threading.Thread(target=_serve, daemon=True).start()
+    started.wait(5.0)
+    yield app, f'http://127.0.0.1:{servers[0].server_port}'
+
+
+def test_pooled_session_reuses_connections(web_ui):
+    app, base_url = web_ui
+    session = requests.PooledSession(max_connections_per_host=2)
+
+    for _ in range(20):
+        r = session.get(f'{base_url}/navigation/state', timeout=2.0)
+        assert r.status_code == 200
+        assert r.json()['loadingStatus']['loading'] is False
+
+    for step in range(5):
+        r = session.post(f'{base_url}/rest/sessions/settings', json={'sessionSetting': 'ai', 'value': step})
+        assert r.status_code == 200
+
+    stats = session.stats()[base_url.removeprefix('http://')]
+    assert app.session_settings['ai'] == 4
+    assert stats['requests'] == 25
+    assert stats['connections_opened'] == 1
+    assert stats['connections_reused'] == 24
+    session.close()
+
+
+def test_pooled_session_error_response(web_ui):
+    _, base_url = web_ui
+    session = requests.PooledSession()
+
+    r = session.get(f'{base_url}/rest/missing', timeout=2.0)
+    assert r.status_code == 404
+    session.close()
+
+
+def test_pooled_session_retries_stale_connection(web_ui):
+    _, base_url = web_ui
+    session = requests.PooledSession()
+    assert session.get(f'{base_url}/navigation/state').status_code == 200
+
+    # -- Close the kept-alive socket as if the server dropped the idle connection
+    pool = session._get_pool('127.0.0.1', int(base_url.rsplit(':', 1)[1]))
+    for conn, _ in pool._idle:
+        conn.sock.shutdown(socket.SHUT_RDWR)
+
+    assert session.get(f'{base_url}/navigation/state').status_code == 200
+    assert session.stats()[base_url.removeprefix('http://')]['retries'] == 1
+    session.close()
+
+
+class _DropPostServer:
+    """ Keep-alive HTTP server answering GET requests that reads POST requests and closes without answering """
+    def __init__(self):
+        self.posts = 0
+        self._socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self._socket.bind(('127.0.0.1', 0))
+        self._socket.listen()
+        self.base_url = 'http://{}:{}'.format(*self._socket.getsockname())
+        threading.Thread(target=self._serve, daemon=True).start()
+
+    def _serve(self):
+        while True:
+            try:
+                conn, _ = self._socket.accept()
+            except OSError:
+                return
+            threading.Thread(target=self._handle, args=(conn,), daemon=True).start()
+
+    def _handle(self, conn):
+        with conn, conn.makefile('rb') as f:
+            while True:
+                request_line = f.readline()
+                if not request_line:
+                    return
+                length = 0
+                for line in iter(f.readline, b'\r\n'):
+                    name, _, value = line.decode().partition(':')
+                    if name.lower() == 'content-length':
+                        length = int(value)
+                f.read(length)
+                if request_line.startswith(b'POST'):
+                    self.posts += 1
+                    return
+                conn.sendall(b'HTTP/1.1 200 OK\r\nContent-Type: application/json\r\n'
+                             b'Content-Length: 2\r\nConnection: keep-alive\r\n\r\n{}')
+
+    def close(self):
+        self._socket.close()
+
+
+def test_pooled_session_does_not_resend_post():
+    server = _DropPostServer()
+    session = requests.PooledSession()
+    assert session.get(f'{server.base_url}/navigation/state').status_code == 200
+
+    # -- The server got the request on the kept-alive connection but never answered
+    with pytest.raises((OSError, http.client.HTTPException)):
+        session.post(f'{server.base_url}/rest/sessions/settings', json={'sessionSetting': 'ai', 'value': 1})
+    assert server.posts == 1
+    stats = session.stats()[server.base_url.removeprefix('http://')]
+    assert stats['retries'] == 0 and stats['errors'] == 1
+    session.close()
+    server.close()
@@ -0,0 +1,57 @@
+import json
+import os
+from pathlib import Path
+
+from rf2settings.benchmark.result_index import BenchmarkResultIndex
+
+
+def _write_capture(file: Path, frame_times):
+    rows = ''.join(f'rFactor2.exe,1234,{i * 0.011:.3f},{t:.3f}\n' for i, t in enumerate(frame_times))
+    file.write_text('Application,ProcessID,TimeInSeconds,msBetweenPresents\n' + rows)
+    # -- Make sure the change is visible on file systems with coarse time stamps
+    stat = file.stat()
+    os.utime(file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 2_000_000_000))
+
+
+def test_result_index_analyses_only_changed_results(tmp_path):
+    result_dir, index_file = tmp_path / 'results', tmp_path / 'benchmark_index.json'
+    result_dir.mkdir()
+    _write_capture(result_dir / '2024-01-01_a.csv', [10.0] * 50)
+    _write_capture(result_dir / '2024-01-02_b.csv', [20.0] * 50)
+    _write_capture(result_dir / 'Frametimes#Raw#2024-01-02.csv', [5.0] * 50)
+    (result_dir / '2024-01-02_b_settings.json').write_text(json.dumps({'preset': 'Low'}))
+
+    index = BenchmarkResultIndex(result_dir, index_file, skip_prefixes=('Frametimes#Raw#',))
+    assert index.update() and index.analysed == 2
+    results = index.results()
+    assert [r['name'] for r in results] == ['2024-01-02_b.csv', '2024-01-01_a.csv']
+    assert results[0]['data']['fpsmean'] == 50.0 and results[0]['settings'] == {'preset': 'Low'}
+
+    # -- Nothing changed
+    assert not index.update() and index.analysed == 0
+
+    # -- Changed capture is analysed again, a settings change only re-reads the settings
+    _write_capture(result_dir / '2024-01-01_a.csv', [5.0] * 50)
+    settings_file = result_dir / '2024-01-02_b_settings.json'
+    settings_file.write_text(json.dumps({'preset': 'Ultra'}))
+    stat = settings_file.stat()
+    os.utime(settings_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 2_000_000_000))
+    assert index.update() and index.analysed == 1
+    entries = {r['name']: r for r in index.results()}
+    assert entries['2024-01-01_a.csv']['data']['fpsmean'] == 200.0
+    assert entries['2024-01-02_b.csv']['settings'] == {'preset': 'Ultra'}
+
+    # -- Removed results are dropped
+    (result_dir / '2024-01-01_a.csv').unlink()
+    assert index.update() and [r['name'] for r in index.results()] == ['2024-01-02_b.csv']
+
+    # -- The saved index is loaded by the next session without analysing anything
+    reloaded = BenchmarkResultIndex(result_dir, index_file, skip_prefixes=('Frametimes#Raw#',))
+    assert not reloaded.update() and reloaded.analysed == 0
+    assert reloaded.results() == index.results()
+
+    # -- A capture added since the last update is indexed on lookup
+    _write_capture(result_dir / '2024-01-03_c.csv', [10.0] * 50)
+    assert reloaded.find('2024-01-03_c.csv') == result_dir / '2024-01-03_c.csv'
+    assert reloaded.analysed == 1 and '2024-01-03_c.csv' in reloaded.entries
+    assert reloaded.find('missing.csv') is None
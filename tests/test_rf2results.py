@@ -0,0 +1,83 @@
+import os
+
+from lxml import etree
+
+from rf2settings.rf2results import RfactorResults, ResultsDriverEntry, ResultStreamEntry, get_text_from_element
+
+PIT_LAP = ' pit="1"'
+
+
+def _driver(name: str, position: int, laps, finish_time: float) -> str:
+    lap_rows = ''.join(f'<Lap num="{i + 1}" p="{position}" et="{10.0 + i * 90.5:.3f}" s1="{t / 3:.3f}" '
+                       f's2="{t / 3 + 0.1:.3f}" s3="{t / 3 - 0.1:.3f}" topspeed="280.1"'
+                       f'{PIT_LAP if i == 2 else ""} fcompound="0,Medium" rcompound="0,Medium">'
+                       f'{t if t else "--.----"}</Lap>'
+                       for i, t in enumerate(laps))
+    return (f'<Driver><Name>{name}</Name><CarType>GT3</CarType><CarClass>GT3</CarClass><CarNumber>{position}</CarNumber>'
+            f'<GridPos>{position}</GridPos><Position>{position}</Position><ClassGridPos>{position}</ClassGridPos>'
+            f'<ClassPosition>{position}</ClassPosition>{lap_rows}<Laps>{len(laps)}</Laps>'
+            f'<FinishTime>{finish_time}</FinishTime></Driver>')
+
+
+RESULT_XML = ('<?xml version="1.0" encoding="utf-8"?>\n<rFactorXML version="1.0">\n<RaceResults>'
+              '<RaceLaps>5</RaceLaps><RaceTime>0</RaceTime>'
+              '<Qualify><Stream><Incident et="5.0">Slow Driver(2) reported contact (0.10) with another vehicle '
+              'Fast Driver(1)</Incident></Stream>'
+              + _driver('Fast Driver', 1, [90.1], 0.0) + '</Qualify>'
+              '<Race><Stream><Score et="1.0">Fast Driver(1) lap=1</Score>'
+              + ''.join(f'<Incident et="{20.0 + i}">Slow Driver(2) reported contact ({i / 10:.2f}) with another '
+                        f'vehicle Fast Driver(1)</Incident><Sector et="{21.0 + i}">x</Sector>' for i in range(20))
+              + '</Stream>'
+              + _driver('Fast Driver', 1, [91.2, 90.4, 95.0, 0.0, 90.3], 470.5)
+              + _driver('Slow Driver', 2, [92.2, 91.4, 0.0, 92.0], 475.2)
+              + '</Race></RaceResults>\n</rFactorXML>\n')
+
+
+def _full_tree_results(file) -> RfactorResults:
+    """ Results read from the whole element tree, as before the results were streamed """
+    results = RfactorResults()
+    results.file_name = file.name
+    with open(file, 'r') as f:
+        et = etree.parse(f)
+    results.racelaps = int(get_text_from_element(et, 'RaceResults/RaceLaps', '0'))
+    results.racetime = int(get_text_from_element(et, 'RaceResults/RaceTime', '0'))
+    results.drivers = [ResultsDriverEntry(e) for e in et.iterfind('.//Driver')]
+    results._create_global_data()
+    stream = et.find('RaceResults/Race/Stream')
+    results.entries = [ResultStreamEntry(e) for e in (stream if stream is not None else [])
+                       if e.tag in ResultStreamEntry.SUPPORTED_TYPES]
+    return results
+
+
+def test_streamed_results_match_full_tree(tmp_path, monkeypatch):
+    file = tmp_path / 'Race.xml'
+    file.write_text(RESULT_XML)
+    monkeypatch.setattr(RfactorResults, 'read_chunk_size', 37)
+
+    streamed, expected = RfactorResults(file), _full_tree_results(file)
+    assert streamed.to_js_object() == expected.to_js_object()
+    assert len(streamed.drivers) == 3 and len(streamed.entries) == 20 and streamed.racelaps == 5
+
+
+def test_cached_results_are_invalidated_by_changes(tmp_path, monkeypatch):
+    monkeypatch.setattr(RfactorResults, '_cache', dict())
+    monkeypatch.setattr(RfactorResults, 'cache_size', 2)
+    file = tmp_path / 'Race.xml'
+    file.write_text(RESULT_XML)
+
+    results = RfactorResults.from_file(file)
+    assert RfactorResults.from_file(file) is results
+
+    stat = file.stat()
+    file.write_text(RESULT_XML.replace('<RaceLaps>5</RaceLaps>', '<RaceLaps>6</RaceLaps>'))
+    os.utime(file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 2_000_000_000))
+    changed = RfactorResults.from_file(file)
+    assert changed is not results and changed.racelaps == 6
+
+    # -- Least recently used results are dropped
+    others = [tmp_path / f'Race{i}.xml' for i in range(2)]
+    for other in others:
+        other.write_text(RESULT_XML)
+        RfactorResults.from_file(other)
+    assert list(RfactorResults._cache) == [str(f) for f in others]
+    assert RfactorResults.from_file(file) is not changed
@@ -0,0 +1,116 @@
+import os
+import shutil
+from pathlib import Path
+
+import pytest
+
+from rf2settings.preset import settings_model
+from rf2settings.preset.preset import BasePreset, PresetType
+from rf2settings.preset.settings_model import OptionsTarget
+from rf2settings.rfactor import RfactorLocation, RfactorPlayer, RfactorPlayerCache
+
+FAKE_RF2 = Path(__file__).parent / 'data' / 'input' / 'FakeRf2'
+
+
+class FilesPreset(BasePreset):
+    """ Graphics preset of the player.JSON, Controller.JSON and Config_DX11.ini options, without mods """
+    preset_type = PresetType.graphics
+    option_class_keys = {settings_model.GraphicOptions.app_key, settings_model.VideoSettings.app_key,
+                         settings_model.FreelookOptions.app_key}
+
+
+@pytest.fixture
+def rf2_dir(tmp_path, monkeypatch):
+    rf2_dir = tmp_path / 'rFactor 2'
+    shutil.copytree(FAKE_RF2, rf2_dir)
+    (rf2_dir / 'Bin64').mkdir()
+    shutil.copy(rf2_dir / 'UserData' / 'Config_DX11.ini', rf2_dir / 'UserData' / 'Config_DX11_VR.ini')
+
+    monkeypatch.setattr(RfactorPlayerCache, 'entries', dict())
+    monkeypatch.setattr(RfactorPlayerCache, 'hits', 0)
+    monkeypatch.setattr(RfactorPlayerCache, 'misses', 0)
+    RfactorLocation.overwrite_location(rf2_dir)
+    yield rf2_dir
+    RfactorLocation.overwrite_location(None)
+
+
+def _edit(file: Path, old: str, new: str):
+    """ Change a file like the game would, with a modification time the cache can not miss """
+    stat = file.stat()
+    file.write_text(file.read_text(encoding='latin-1').replace(old, new, 1), encoding='latin-1')
+    os.utime(file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 2_000_000_000))
+
+
+def _value(rf: RfactorPlayer, app_key: str, key: str):
+    return getattr(rf.options, app_key).get_option(key).value
+
+
+def _stats(rf2_dir: Path) -> dict:
+    files = [rf2_dir / 'UserData' / n for n in ('player/player.JSON', 'player/Controller.JSON',
+                                                 'Config_DX11.ini', 'Config_DX11_VR.ini')]
+    return {f.name: (f.stat().st_mtime_ns, f.read_bytes()) for f in files}
+
+
+def test_unchanged_files_are_served_from_cache(rf2_dir):
+    rf = RfactorPlayer()
+    assert rf.is_valid and RfactorPlayerCache.hits == 0
+    targets = len(RfactorPlayerCache.entries)
+
+    cached = RfactorPlayer()
+    assert cached.is_valid
+    assert RfactorPlayerCache.hits == targets and RfactorPlayerCache.misses == targets
+    assert _value(cached, 'graphic_options', 'Track Detail') == 2
+    assert _value(cached, 'video_settings', 'MSAA') == 4
+    assert cached.ini_text == rf.ini_text
+
+
+@pytest.mark.parametrize('file, old, new, target, app_key, key, value', [
+    ('player/player.JSON', '"Track Detail": 2', '"Track Detail": 1',
+     OptionsTarget.player_json, 'graphic_options', 'Track Detail', 1),
+    ('player/Controller.JSON', '"Freelook Keyboard Pitch Accel": 0.02', '"Freelook Keyboard Pitch Accel": 0.05',
+     OptionsTarget.controller_json, 'freelook_settings', 'Freelook Keyboard Pitch Accel', 0.05),
+    ('Config_DX11.ini', 'MSAA=4', 'MSAA=2', OptionsTarget.dx_config, 'video_settings', 'MSAA', 2),
+])
+def test_external_edit_invalidates_target(rf2_dir, file, old, new, target, app_key, key, value):
+    RfactorPlayer()
+    _edit(rf2_dir / 'UserData' / file, old, new)
+    misses = RfactorPlayerCache.misses
+
+    rf = RfactorPlayer()
+    assert _value(rf, app_key, key) == value
+    # -- Only the edited target is read again
+    assert RfactorPlayerCache.misses == misses + 1
+    assert RfactorPlayerCache.entries[target]['values'][app_key]
+
+
+def test_external_edit_of_vr_ini_is_detected(rf2_dir):
+    rf = RfactorPlayer()
+    preset = FilesPreset()
+    preset.update(rf)
+    assert not rf.is_target_modified(OptionsTarget.dx_config, preset)
+
+    _edit(rf2_dir / 'UserData' / 'Config_DX11_VR.ini', 'MSAA=4', 'MSAA=2')
+    rf = RfactorPlayer()
+    assert _value(rf, 'video_settings', 'MSAA') == 4
+    assert rf.is_target_modified(OptionsTarget.dx_config, preset)
+
+
+def test_unchanged_settings_are_not_written(rf2_dir):
+    rf = RfactorPlayer()
+    preset = FilesPreset()
+    preset.update(rf)
+    before = _stats(rf2_dir)
+
+    for target in (OptionsTarget.player_json, OptionsTarget.controller_json, OptionsTarget.dx_config):
+        assert not rf.is_target_modified(target, preset)
+    assert rf.write_settings(preset)
+    assert _stats(rf2_dir) == before
+
+    # -- A changed video setting is written to both ini files and read back
+    preset.video_settings.get_option('MSAA').value = 2
+    assert rf.is_target_modified(OptionsTarget.dx_config, preset)
+    rf.write_settings(preset)
+    after = _stats(rf2_dir)
+    assert after['player.JSON'] == before['player.JSON'] and after['Controller.JSON'] == before['Controller.JSON']
+    assert b'MSAA=2' in after['Config_DX11.ini'][1] and b'MSAA=2' in after['Config_DX11_VR.ini'][1]
+    assert _value(RfactorPlayer(), 'video_settings', 'MSAA') == 2
@@ -0,0 +1,49 @@
+from a2s_stub import StubServer, StubServerFarm
+from rf2settings import latency_history
+from rf2settings.app_settings import AppSettings
+from rf2settings.server_cache import ServerListCache
+from rf2settings.serverlist import ServerList
+
+
+def test_server_list_cache_serves_stale_list_and_refreshes(monkeypatch):
+    for attr in ('servers', 'updated', 'changed', 'last_refresh', 'refresh_greenlets'):
+        monkeypatch.setattr(ServerListCache, attr, dict())
+    monkeypatch.setattr(latency_history, '_latency_history', latency_history.LatencyHistory())
+    servers = [StubServer(f'Server {i}', players=['Driver'] * (i % 3)) for i in range(6)]
+
+    with StubServerFarm(servers) as farm:
+        monkeypatch.setattr(ServerList, 'get_webapi_addresses', staticmethod(lambda: list(farm.addresses)))
+        favourite = f'{farm.addresses[5][0]}:{farm.addresses[5][1]}'
+        monkeypatch.setattr(AppSettings, 'server_favourites', [favourite])
+        chunks = list()
+
+        # -- Empty cache waits for the query
+        result = ServerListCache.get(False, chunks.extend)
+        assert len(result) == len(chunks) == 6 and all(s['age'] == 0 for s in result)
+
+        # -- Fresh cache is served without querying again
+        chunks.clear()
+        assert len(ServerListCache.get(False, chunks.extend)) == 6
+        assert len(chunks) == 6 and not ServerListCache.refreshing(False)
+
+        # -- Stale cache is served immediately and refreshed in the background
+        servers[0].map_name = 'Portland'
+        ServerListCache.last_refresh[False] = 0.0
+        chunks.clear()
+        ServerListCache.get(False, chunks.extend)
+        assert len(chunks) == 6 and ServerListCache.refreshing(False)
+
+        # -- A favourites request does not wait for or skip behind the running full refresh
+        favourite_chunks = list()
+        assert [s['id'] for s in ServerListCache.get(True, favourite_chunks.extend)] == [favourite]
+        assert ServerListCache.refreshing(True)
+        ServerListCache.refresh_greenlets[True].join()
+        ServerListCache.refresh_greenlets[False].join()
+        assert len(chunks) == 12
+        changed_id = f'{farm.addresses[0][0]}:{farm.addresses[0][1]}'
+        assert list(ServerListCache.changed) == [changed_id]
+
+        # -- Favourites, recently changed and populated servers are queried first
+        order = [f'{a[0]}:{a[1]}' for a in ServerListCache.prioritize(farm.addresses)]
+        assert order[:2] == [favourite, changed_id]
+        assert [ServerListCache.servers[i]['player_count'] for i in order[2:]] == [2, 1, 1, 0]
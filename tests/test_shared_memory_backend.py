@@ -0,0 +1,31 @@
+from rf2settings.rf2sharedmem.backend import FileMmapBackend
+from rf2settings.rf2sharedmem.sharedMemoryAPI import SimInfoAPI
+from rf2settings.rf2sharedmem.writer import SharedMemoryWriter, benchmark_reads
+
+
+def test_file_backed_buffers_are_shared(tmp_path):
+    backend = FileMmapBackend(tmp_path)
+    writer = SharedMemoryWriter(backend, num_vehicles=128)
+    info = SimInfoAPI(backend)
+
+    assert info.isSharedMemoryAvailable()
+    assert info.isOnTrack()
+    assert info.driverName() == 'Driver 1'
+
+    for _ in range(writer.scoring_interval):
+        writer.write_frame()
+    snapshot = info.snapshot()
+    assert not snapshot.stale
+    assert snapshot.num_vehicles == 128
+    assert snapshot.telemetry.mVehicles[127].mElapsedTime == writer.elapsed_time
+    assert snapshot.scoring.mScoringInfo.mCurrentET == writer.elapsed_time
+    assert info.recorder is None
+
+    info.close()
+    writer.close()
+
+
+def test_benchmark_reads(tmp_path):
+    result = benchmark_reads(FileMmapBackend(tmp_path), frames=50, num_vehicles=16, concurrent_seconds=0.2)
+    assert result['vehicles'] == 16
+    assert result['concurrent_updates_per_s'] > 0
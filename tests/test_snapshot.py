@@ -0,0 +1,79 @@
+import ctypes
+
+import pytest
+
+from rf2settings.rf2sharedmem import snapshot as snapshot_module
+from rf2settings.rf2sharedmem.backend import FileMmapBackend
+from rf2settings.rf2sharedmem.snapshot import SimSnapshot
+from rf2settings.rf2sharedmem.writer import SharedMemoryWriter
+
+
+@pytest.fixture
+def writer(tmp_path, monkeypatch):
+    monkeypatch.setattr(snapshot_module.gevent, 'sleep', lambda seconds: None)
+    writer = SharedMemoryWriter(FileMmapBackend(tmp_path), num_vehicles=4)
+    writer.write_frame()
+    yield writer
+    writer.close()
+
+
+@pytest.fixture
+def snapshot(writer):
+    snapshot = SimSnapshot(writer.info)
+    assert snapshot.update() and not snapshot.stale
+    return snapshot
+
+
+def test_busy_writer_keeps_previous_copy(writer, snapshot):
+    elapsed_time, versions = writer.elapsed_time, snapshot.versions
+    tele = writer.info.Rf2Tele
+
+    # -- Writer started but did not finish the next frame
+    tele.mVersionUpdateBegin += 1
+    tele.mVehicles[0].mElapsedTime = -1.0
+    assert tele.mVersionUpdateBegin != tele.mVersionUpdateEnd
+
+    assert not snapshot._telemetry.read()
+    assert not snapshot.update()
+    assert snapshot.stale
+    assert snapshot.torn_reads == 0
+    assert snapshot.versions == versions
+    assert snapshot.telemetry.mVehicles[0].mElapsedTime == elapsed_time
+
+    # -- Writer finished, the next update picks up the new frame
+    tele.mVersionUpdateEnd = tele.mVersionUpdateBegin
+    assert snapshot.update() and not snapshot.stale
+    assert snapshot.telemetry.mVehicles[0].mElapsedTime == -1.0
+
+
+def test_torn_copy_is_never_published(writer, snapshot, monkeypatch):
+    elapsed_time, versions = writer.elapsed_time, snapshot.versions
+    tele = writer.info.Rf2Tele
+    memmove = ctypes.memmove
+
+    def torn_memmove(dst, src, count):
+        # -- Writer starts the next frame while the buffer is being copied
+        if src == ctypes.addressof(tele):
+            tele.mVersionUpdateBegin += 1
+            tele.mVehicles[0].mElapsedTime = -1.0
+            memmove(dst, src, count)
+            tele.mVersionUpdateEnd = tele.mVersionUpdateBegin
+            return dst
+        return memmove(dst, src, count)
+
+    writer.write_frame()
+    monkeypatch.setattr(snapshot_module.ctypes, 'memmove', torn_memmove)
+
+    assert not snapshot.update()
+    assert snapshot.stale
+    assert snapshot.torn_reads == SimSnapshot.max_retries
+    assert snapshot.versions == versions
+    assert snapshot.telemetry.mVehicles[0].mElapsedTime == elapsed_time
+    assert snapshot._telemetry.copies == 1
+
+    # -- The next untorn copy is published
+    monkeypatch.setattr(snapshot_module.ctypes, 'memmove', memmove)
+    assert snapshot.update() and not snapshot.stale
+    assert snapshot.torn_reads == SimSnapshot.max_retries
+    assert snapshot.versions[0] == tele.mVersionUpdateEnd
+    assert snapshot.telemetry.mVehicles[0].mElapsedTime == -1.0
@@ -0,0 +1,45 @@
+import os
+
+from open_vr_mod.valve.steam_catalog import SteamCatalog
+
+
+def _write_manifest(lib_dir, app_id: str, name: str):
+    file = lib_dir / f'appmanifest_{app_id}.acf'
+    file.write_text(f'"AppState"\n{{\n\t"appid"\t\t"{app_id}"\n\t"name"\t\t"{name}"\n'
+                    f'\t"installdir"\t\t"{name}"\n\t"SizeOnDisk"\t\t"1024"\n}}\n', encoding='utf-8')
+    return file
+
+
+def test_catalog_revalidates_changed_manifests(tmp_path):
+    steam_dir, second_lib = tmp_path / 'Steam', tmp_path / 'Library'
+    (steam_dir / 'steamapps').mkdir(parents=True)
+    (second_lib / 'steamapps').mkdir(parents=True)
+    (steam_dir / 'steamapps' / 'libraryfolders.vdf').write_text(
+        f'"libraryfolders"\n{{\n\t"1"\n\t{{\n\t\t"path"\t\t"{second_lib.as_posix()}"\n\t}}\n}}\n')
+
+    for i in range(50):
+        _write_manifest(steam_dir / 'steamapps', str(1000 + i), f'Game {i}')
+    changed = _write_manifest(second_lib / 'steamapps', '365960', 'rFactor 2')
+
+    catalog_file = tmp_path / 'steam_catalog.json'
+    catalog = SteamCatalog(catalog_file)
+    assert catalog.refresh(steam_dir)
+    assert catalog.parsed == 52
+    assert [p.parent.name for p in catalog.libraries] == ['Steam', 'Library']
+    assert catalog.app('365960')['name'] == 'rFactor 2'
+    assert catalog.app_by_installdir('game 7')['appid'] == '1007'
+
+    # -- A new instance loads the persisted catalog and parses nothing
+    catalog = SteamCatalog(catalog_file)
+    assert not catalog.refresh(steam_dir)
+    assert catalog.parsed == 0
+    assert catalog.app(1049)['name'] == 'Game 49'
+
+    # -- Only the changed manifest is parsed again, removed ones are dropped
+    _write_manifest(second_lib / 'steamapps', '365960', 'rFactor 2 Updated')
+    os.utime(changed, ns=(0, 1))
+    (steam_dir / 'steamapps' / 'appmanifest_1000.acf').unlink()
+    assert catalog.refresh(steam_dir, force=True)
+    assert catalog.parsed == 1
+    assert catalog.app('365960')['name'] == 'rFactor 2 Updated'
+    assert catalog.app('1000') is None
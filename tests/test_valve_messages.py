@@ -0,0 +1,52 @@
+import pytest
+
+from a2s_stub import StubServer
+from master_stub import RESPONSE_HEADER, _entry
+from rf2settings.valve import messages
+from rf2settings.valve.a2s_engine import A2SQueryEngine, _AddressQuery, QUERY_RULES
+
+
+def _decode_by_field(message_cls, packet):
+    """ Decode field by field, without the precompiled plan """
+    buffer, values = memoryview(packet), dict()
+    for field in message_cls.fields:
+        values[field.name], buffer = field.decode(buffer, values)
+    return message_cls(buffer, **values)
+
+
+def test_planned_decode_matches_field_decode():
+    server = StubServer('Test Server', players=[f'Driver {i}' for i in range(12)],
+                        rules={f'key_{i}': f'value {i}' for i in range(20)}, split_size=200)
+    addresses = [(f'10.0.{i // 256}.{i % 256}', 27015 + i) for i in range(40)] + [('0.0.0.0', 0)]
+    packets = {messages.InfoResponse: server.info_response(),
+               messages.PlayersResponse: server.players_response(),
+               messages.RulesResponse: server.rules_response(),
+               messages.MasterServerResponse: RESPONSE_HEADER + b''.join(_entry(a) for a in addresses)}
+
+    for message_cls, packet in packets.items():
+        planned, by_field = message_cls.decode(packet), _decode_by_field(message_cls, packet)
+        assert message_cls.plan() is not None
+        assert bytes(planned.payload) == bytes(by_field.payload)
+        for key in by_field:
+            if key in ('players', 'addresses'):
+                assert [dict(e) for e in planned[key]] == [dict(e) for e in by_field[key]]
+            else:
+                assert planned[key] == by_field[key]
+
+    assert messages.InfoResponse.decode(packets[messages.InfoResponse])['server_name'] == 'Test Server'
+    assert messages.RulesResponse.decode(b'\xff\xff\xff\xff' + server.rules_response())['rules'] == server.rules
+    response = messages.MasterServerResponse.decode(packets[messages.MasterServerResponse])
+    assert [(a['host'], a['port']) for a in response['addresses']] == addresses
+    assert response['addresses'][-1].is_null
+
+    # -- Truncated packets still fail where the count is known
+    with pytest.raises(messages.BrokenMessageError):
+        messages.RulesResponse.decode(server.rules_response()[:-20])
+
+    # -- Split packets arriving out of order are reassembled
+    query = _AddressQuery(('127.0.0.1', 64297), [QUERY_RULES])
+    split = server._packets(server.rules_response())
+    assert len(split) > 1
+    streams = [A2SQueryEngine._reassemble(query, p) for p in reversed(split)]
+    assert streams[:-1] == [None] * (len(split) - 1) and not query.fragments
+    assert streams[-1].read() == server.rules_response()
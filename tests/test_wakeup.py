@@ -0,0 +1,38 @@
+import threading
+import time
+
+import gevent
+import gevent.event
+
+from rf2settings.wakeup import WakeUp
+
+
+def test_wakeup_events_notifications_and_threads():
+    event = gevent.event.Event()
+    wakeup = WakeUp('test', event)
+
+    assert wakeup.wait(0.01) is False
+    assert wakeup.timeouts == 1
+
+    # -- Notifications while the loop is busy result in a single wake-up
+    wakeup.notify()
+    wakeup.notify()
+    assert wakeup.wait(1.0) is True
+    assert wakeup.coalesced == 1
+    assert wakeup.wait(0.01) is False
+
+    gevent.spawn_later(0.01, event.set)
+    assert wakeup.wait(1.0) is True
+    event.clear()
+
+    # -- Notification from a thread wakes the hub before the timeout
+    thread = threading.Thread(target=lambda: (time.sleep(0.05), wakeup.notify_threadsafe()))
+    thread.start()
+    start = time.perf_counter()
+    assert wakeup.wait(5.0) is True
+    assert time.perf_counter() - start < 2.0
+    thread.join()
+
+    assert wakeup.stats()['wakeups'] == 3
+    wakeup.close()
+    WakeUp.instances.pop('test')
@@ -0,0 +1,40 @@
+import json
+
+import gevent
+
+from rf2settings.write_behind import WriteBehind, flush_all
+
+
+def test_write_behind_coalesces_saves(tmp_path):
+    settings = {'value': 0}
+    file = tmp_path / 'settings.json'
+    writer = WriteBehind('test', delay=0.05, max_delay=1.0)
+    writer.add_section('settings', lambda: file, lambda: json.dumps(settings))
+
+    try:
+        for i in range(20):
+            settings['value'] = i
+            writer.mark_dirty('settings')
+        assert not file.exists()
+
+        gevent.sleep(0.2)
+        assert json.loads(file.read_text()) == {'value': 19}
+        assert writer.stats()['writes'] == 1 and writer.stats()['coalesced'] == 19
+
+        # -- Unchanged content is not written again, pending changes are written by flush_all
+        writer.mark_dirty('settings')
+        assert writer.flush() and writer.stats()['unchanged'] == 1
+        settings['value'] = 20
+        writer.mark_dirty('settings')
+        flush_all()
+        assert not writer.pending and json.loads(file.read_text()) == {'value': 20}
+        assert not list(tmp_path.glob('*.tmp'))
+
+        # -- Failed writes stay pending
+        file, settings['value'] = tmp_path / 'missing' / 'settings.json', 21
+        writer.mark_dirty('settings')
+        assert not writer.flush() and writer.pending and writer.stats()['errors'] == 1
+        file.parent.mkdir()
+        assert writer.flush() and not writer.pending and json.loads(file.read_text()) == {'value': 21}
+    finally:
+        WriteBehind.instances.pop('test')